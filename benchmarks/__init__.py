@@ -0,0 +1 @@
+"""This package contains the performance benchmarks."""
@@ -0,0 +1,164 @@
+"""This module contains the path creation benchmark.
+
+The benchmark computes the steps of generated paths of growing lengths and reports
+the time per step, which stays flat when the path creation scales linearly. It also
+reports the time to classify the moves between the poses of a long path.
+
+Usage::
+
+    $ python benchmarks/path_creation.py --steps 1000 10000 100000 --max-movement-ms 1000
+"""
+import argparse
+import statistics
+import sys
+import time
+from collections import namedtuple
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.path_creation import determine_robot_movement, path_steps  # noqa: E402
+from src.planner_state import robot_box  # noqa: E402
+
+ScalingReport = namedtuple("ScalingReport", ["steps", "total_ms", "us_per_step"])
+
+
+def generated_path(steps: int, seed: int = 0) -> Tuple[np.ndarray, ...]:
+    """Generate a random walk of moves and rotations like the planner saves.
+
+    Parameters
+    ----------
+    steps : int
+        the number of waypoints
+    seed : int, optional
+        the random generator seed, by default 0
+
+    Returns
+    -------
+    Tuple[np.ndarray, ...]
+        the create_path arguments
+    """
+    generator = np.random.default_rng(seed)
+    rotate: np.ndarray = generator.random(steps) < 0.3
+    rotate[0] = False
+    angles: np.ndarray = np.cumsum(np.where(rotate, generator.choice([-15, 15], steps), 0))
+    corners: np.ndarray = np.cumsum(
+        np.where(rotate[:, None], 0, generator.integers(-20, 21, (steps, 2))), axis=0
+    )
+    # the box of a (0, 0) corner at every angle, moved to every corner
+    boxes: np.ndarray = np.stack([robot_box((0, 0), 100, 60, angle) for angle in range(360)])
+    return (
+        boxes[np.mod(angles, 360)] + corners[:, None, :],
+        angles,
+        np.zeros(steps, dtype=int),
+        np.zeros(steps, dtype=int),
+        np.full(steps, "S"),
+        np.full(steps, 500),
+    )
+
+
+def measure_scaling(steps: Sequence[int], repeat: int = 3) -> List[ScalingReport]:
+    """Measure the path steps computation of paths of several lengths.
+
+    Parameters
+    ----------
+    steps : Sequence[int]
+        the path lengths
+    repeat : int, optional
+        runs per path length, the median is reported, by default 3
+
+    Returns
+    -------
+    List[ScalingReport]
+        the path length, its median time in ms and the time per step in us
+    """
+    reports: List[ScalingReport] = []
+    for count in steps:
+        arguments: Tuple[np.ndarray, ...] = generated_path(count)
+        times: List[float] = []
+        for _ in range(repeat):
+            start: float = time.perf_counter()
+            path_steps(*arguments)
+            times.append(time.perf_counter() - start)
+        total_ms: float = statistics.median(times) * 1000
+        reports.append(ScalingReport(count, total_ms, total_ms * 1000 / count))
+    return reports
+
+
+def measure_movement(poses: int, repeat: int = 3) -> float:
+    """Measure classifying the moves between the poses of a long straight path.
+
+    Parameters
+    ----------
+    poses : int
+        the number of poses
+    repeat : int, optional
+        runs, the median is reported, by default 3
+
+    Returns
+    -------
+    float
+        the median time in ms
+    """
+    boxes: np.ndarray = np.tile(robot_box((0, 0), 100, 60, 30), (poses, 1, 1))
+    boxes += np.arange(poses)[:, None, None]
+    angles: np.ndarray = np.zeros(poses, dtype=int)
+    times: List[float] = []
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        determine_robot_movement(boxes, angles)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the benchmark from the command line.
+
+    Parameters
+    ----------
+    argv : Optional[Sequence[str]], optional
+        the command line arguments, by default ``sys.argv``
+
+    Returns
+    -------
+    int
+        the exit code, 1 when the time per step grows more than the allowed ratio or
+        the moves classification is over its budget
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", nargs="*", type=int, default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per path length")
+    parser.add_argument(
+        "--max-growth", type=float, help="maximum time per step ratio of the longest path"
+    )
+    parser.add_argument("--poses", type=int, default=1_000_000, help="poses classified")
+    parser.add_argument(
+        "--max-movement-ms", type=float, help="maximum time to classify the moves of the poses"
+    )
+    args = parser.parse_args(argv)
+
+    reports: List[ScalingReport] = measure_scaling(args.steps, args.repeat)
+    for report in reports:
+        print(
+            f"{report.steps:>10} steps: {report.total_ms:10.1f} ms, "
+            f"{report.us_per_step:8.3f} us per step"
+        )
+    growth: float = reports[-1].us_per_step / reports[0].us_per_step
+    print(f"time per step growth: {growth:.2f}")
+    movement_ms: float = measure_movement(args.poses, args.repeat)
+    print(f"{args.poses:>10} poses moves classified: {movement_ms:10.1f} ms")
+    code: int = 0
+    if args.max_growth is not None and growth > args.max_growth:
+        print(f"    over the {args.max_growth:.2f} growth budget")
+        code = 1
+    if args.max_movement_ms is not None and movement_ms > args.max_movement_ms:
+        print(f"    over the {args.max_movement_ms:.1f} ms budget")
+        code = 1
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
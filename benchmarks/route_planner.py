@@ -0,0 +1,99 @@
+"""This module contains the route planning benchmark.
+
+The benchmark plans a route across a competition size mat with walls from the top
+and from the bottom in turns, and reports the planning time of a new planner, which
+includes building its occupancy grid.
+
+Usage::
+
+    $ python benchmarks/route_planner.py --budget-ms 100
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.collision import ObstacleMask  # noqa: E402
+from src.route_planner import RoutePlanner  # noqa: E402
+
+# the competition mat size in pixels, and the route between its opposite corners
+MAT_SIZE: Tuple[int, int] = (1143, 2362)
+START: Tuple[int, int] = (100, 100)
+GOAL: Tuple[int, int] = (2250, 1050)
+CLEARANCE: float = 120
+CELL_SIZE: int = 40
+
+
+def competition_mat() -> ObstacleMask:
+    """Build the obstacles of a competition size mat, walls from the top and the bottom.
+
+    Returns
+    -------
+    ObstacleMask
+        the obstacles
+    """
+    mask: np.ndarray = np.zeros(MAT_SIZE, dtype=np.uint8)
+    # walls from the top and from the bottom in turns
+    for wall, left in enumerate(range(300, 2100, 500)):
+        top: int = 443 * (wall % 2)
+        mask[top : top + 700, left : left + 50] = 1
+    return ObstacleMask(MAT_SIZE, mask)
+
+
+def measure_planning(repeat: int = 5) -> float:
+    """Measure planning the route across the competition mat with a new planner.
+
+    Parameters
+    ----------
+    repeat : int, optional
+        runs, the median is reported, by default 5
+
+    Returns
+    -------
+    float
+        the median time in ms
+    """
+    obstacles: ObstacleMask = competition_mat()
+    times: List[float] = []
+    for _ in range(repeat):
+        planner = RoutePlanner(obstacles)
+        start: float = time.perf_counter()
+        planner.plan(START, GOAL, CLEARANCE, CELL_SIZE)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the benchmark from the command line.
+
+    Parameters
+    ----------
+    argv : Optional[Sequence[str]], optional
+        the command line arguments, by default ``sys.argv``
+
+    Returns
+    -------
+    int
+        the exit code, 1 when the planning time is over the budget
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="runs of the planning")
+    parser.add_argument("--budget-ms", type=float, help="maximum planning time")
+    args = parser.parse_args(argv)
+
+    total_ms: float = measure_planning(args.repeat)
+    print(f"route across the competition mat: {total_ms:.1f} ms")
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"    over the {args.budget_ms:.1f} ms budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""This module contains the runtime estimator benchmark.
+
+The benchmark estimates the execution time of a long path of moves and turns, as it
+is estimated again on every saved waypoint, and reports how long the estimate takes.
+
+Usage::
+
+    $ python benchmarks/runtime_estimator.py --steps 10000 --budget-ms 50
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.path_creation import PATH_DTYPE  # noqa: E402
+from src.runtime_estimator import (  # noqa: E402
+    DEFAULT_ROBOT_MODEL,
+    estimate_path_runtime,
+)
+
+
+def moves_and_turns(steps: int) -> np.ndarray:
+    """Create a path of moves of 300 degrees and turns of 45 degrees in turns.
+
+    Parameters
+    ----------
+    steps : int
+        the number of waypoints
+
+    Returns
+    -------
+    np.ndarray
+        the path, see path_creation.create_path_array
+    """
+    path: np.ndarray = np.zeros(steps, dtype=PATH_DTYPE)
+    path["distance_degrees"][::2] = 300
+    path["angles_difference"][1::2] = 45
+    path["speed"] = 400
+    path["additional_motors_mode"] = "S"
+    return path
+
+
+def measure_estimate(steps: int, repeat: int = 5) -> float:
+    """Measure estimating the runtime of a path of moves and turns.
+
+    Parameters
+    ----------
+    steps : int
+        the number of waypoints
+    repeat : int, optional
+        runs, the median is reported, by default 5
+
+    Returns
+    -------
+    float
+        the median time in ms
+    """
+    path: np.ndarray = moves_and_turns(steps)
+    times: List[float] = []
+    for _ in range(repeat):
+        start: float = time.perf_counter()
+        estimate_path_runtime(path, DEFAULT_ROBOT_MODEL)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the benchmark from the command line.
+
+    Parameters
+    ----------
+    argv : Optional[Sequence[str]], optional
+        the command line arguments, by default ``sys.argv``
+
+    Returns
+    -------
+    int
+        the exit code, 1 when the estimate time is over the budget
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=10_000, help="waypoints of the path")
+    parser.add_argument("--repeat", type=int, default=5, help="runs of the estimate")
+    parser.add_argument("--budget-ms", type=float, help="maximum estimate time")
+    args = parser.parse_args(argv)
+
+    total_ms: float = measure_estimate(args.steps, args.repeat)
+    print(f"{args.steps:>10} steps estimated: {total_ms:.1f} ms")
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"    over the {args.budget_ms:.1f} ms budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
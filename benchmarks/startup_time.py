@@ -0,0 +1,143 @@
+"""This module contains the startup time benchmark.
+
+The benchmark imports a module in a fresh interpreter with ``-X importtime`` and
+reports the cumulative import time together with the slowest imported packages.
+
+Usage::
+
+    $ python benchmarks/startup_time.py src.GUIs.main_screen --budget-ms 400 --forbid scipy pydantic
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import namedtuple
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+PROJECT_ROOT: str = str(Path(__file__).parent.parent)
+
+ImportTime = namedtuple("ImportTime", ["module", "self_us", "cumulative_us", "depth"])
+StartupReport = namedtuple("StartupReport", ["module", "total_ms", "imports"])
+
+
+def parse_importtime(stderr: str) -> List[ImportTime]:
+    """Parse the ``-X importtime`` output.
+
+    Parameters
+    ----------
+    stderr : str
+        the standard error of an interpreter started with ``-X importtime``
+
+    Returns
+    -------
+    List[ImportTime]
+        one record per imported module, in import completion order
+    """
+    imports: List[ImportTime] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        depth: int = (len(name) - len(name.lstrip())) // 2
+        imports.append(ImportTime(name.strip(), int(self_us), int(cumulative_us), depth))
+    return imports
+
+
+def measure_import_time(module: str, python: str = sys.executable) -> StartupReport:
+    """Import a module in a fresh interpreter and measure the import time.
+
+    Parameters
+    ----------
+    module : str
+        the dotted module name to import
+    python : str, optional
+        the interpreter to run, by default the running interpreter
+
+    Returns
+    -------
+    StartupReport
+        the module name, its cumulative import time in ms and every imported module
+
+    Raises
+    ------
+    RuntimeError
+        If the module can not be imported.
+    """
+    process = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        env={**os.environ, "PYTHONPATH": PROJECT_ROOT},
+        capture_output=True,
+        text=True,
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"unable to import {module}:\n{process.stderr}")
+    imports: List[ImportTime] = parse_importtime(process.stderr)
+    total_us: int = sum(record.cumulative_us for record in imports if record.depth == 0)
+    return StartupReport(module, total_us / 1000, imports)
+
+
+def imported_packages(report: StartupReport) -> Dict[str, int]:
+    """Group the import time of a report by top level package.
+
+    Parameters
+    ----------
+    report : StartupReport
+        the startup report
+
+    Returns
+    -------
+    Dict[str, int]
+        the self import time in us of each top level package
+    """
+    packages: Dict[str, int] = {}
+    for record in report.imports:
+        package: str = record.module.split(".")[0]
+        packages[package] = packages.get(package, 0) + record.self_us
+    return packages
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the benchmark from the command line.
+
+    Parameters
+    ----------
+    argv : Optional[Sequence[str]], optional
+        the command line arguments, by default ``sys.argv``
+
+    Returns
+    -------
+    int
+        the exit code, 1 when the budget is exceeded or a forbidden package is imported
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=["src.GUIs.main_screen", "src.main"])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per module")
+    parser.add_argument("--top", type=int, default=10, help="slowest packages to show")
+    parser.add_argument("--budget-ms", type=float, help="maximum median import time")
+    parser.add_argument("--forbid", nargs="*", default=[], help="packages not to import")
+    args = parser.parse_args(argv)
+
+    exit_code: int = 0
+    for module in args.modules:
+        reports: List[StartupReport] = [measure_import_time(module) for _ in range(args.repeat)]
+        median_ms: float = statistics.median(report.total_ms for report in reports)
+        packages: Dict[str, int] = imported_packages(reports[-1])
+        print(f"{module}: median {median_ms:.1f} ms over {args.repeat} runs")
+        for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[: args.top]:
+            print(f"    {package:<30} {self_us / 1000:8.1f} ms")
+
+        forbidden: List[str] = [package for package in args.forbid if package in packages]
+        if forbidden:
+            print(f"    forbidden packages imported: {', '.join(forbidden)}")
+            exit_code = 1
+        if args.budget_ms is not None and median_ms > args.budget_ms:
+            print(f"    over the {args.budget_ms:.1f} ms budget")
+            exit_code = 1
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,258 @@
+"""This module contains the incremental renderer of the Tk planner window."""
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.GUIs.overlay import (
+    ANGLE_COLOR,
+    BOX_COLOR,
+    FRONT_COLOR,
+    LABEL_COLOR,
+    LABEL_LINE_HEIGHT,
+    SELECTED_COLOR,
+)
+
+# the polygon, front point, angle label and other labels items of a pose
+PoseItems = Tuple[int, int, int, int]
+
+FRONT_RADIUS: int = 5
+LINE_WIDTH: int = 2
+LABEL_FONT: Tuple[str, int] = ("Helvetica", 9)
+
+
+def tk_color(color: Tuple[int, int, int]) -> str:
+    """Convert an OpenCV BGR color to a Tk color.
+
+    Parameters
+    ----------
+    color : Tuple[int, int, int]
+        the blue, green and red values
+
+    Returns
+    -------
+    str
+        the #rrggbb color
+    """
+    blue, green, red = color
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+
+class CanvasRenderer:
+    """Incremental renderer of the saved waypoints and the live robot on a Tk canvas.
+
+    The mat image is drawn once by the window, every pose, connector and label is a
+    canvas item that is created, moved, recolored or deleted on its own. Setting the
+    waypoints compares them with the drawn ones and only touches the items of the
+    changed waypoints, so the redraw cost depends on the change and not on the path
+    length.
+    """
+
+    def __init__(self, canvas, scale: float = 1.0):
+        """Class Constructor.
+
+        Parameters
+        ----------
+        canvas : tk.Canvas
+            the canvas showing the mat image
+        scale : float, optional
+            the canvas pixels per mat image pixel, by default 1.0
+        """
+        self.canvas = canvas
+        self.scale = scale
+        self.boxes: np.ndarray = np.zeros((0, 4, 2))
+        self.labels: List[List[str]] = []
+        self.selected: Optional[int] = None
+        self.large_motors_positive_direction: bool = True
+        self._poses: List[PoseItems] = []
+        # the connector from the previous waypoint, None for the first waypoint
+        self._connectors: List[Optional[int]] = []
+        self._live: Optional[PoseItems] = None
+
+    def _front(self, box: np.ndarray) -> Tuple[float, float]:
+        first, second = (0, 1) if self.large_motors_positive_direction else (2, 3)
+        return tuple((box[first] + box[second]) * self.scale / 2)
+
+    def _create_pose(self, box: np.ndarray, labels: Sequence[str], color: str) -> PoseItems:
+        polygon: int = self.canvas.create_polygon(
+            *(box * self.scale).ravel(), outline=color, fill="", width=LINE_WIDTH
+        )
+        front: int = self.canvas.create_oval(0, 0, 0, 0, fill=tk_color(FRONT_COLOR), outline="")
+        angle: int = self.canvas.create_text(
+            0, 0, anchor="sw", font=LABEL_FONT, fill=tk_color(ANGLE_COLOR)
+        )
+        others: int = self.canvas.create_text(
+            0, 0, anchor="nw", font=LABEL_FONT, fill=tk_color(LABEL_COLOR)
+        )
+        items: PoseItems = (polygon, front, angle, others)
+        self._move_pose(items, box, labels)
+        return items
+
+    def _move_pose(self, items: PoseItems, box: np.ndarray, labels: Sequence[str]) -> None:
+        polygon, front, angle, others = items
+        self.canvas.coords(polygon, *(box * self.scale).ravel())
+        x, y = self._front(box)
+        self.canvas.coords(
+            front, x - FRONT_RADIUS, y - FRONT_RADIUS, x + FRONT_RADIUS, y + FRONT_RADIUS
+        )
+        corner_x, corner_y = box[0] * self.scale
+        self.canvas.coords(angle, corner_x, corner_y)
+        self.canvas.itemconfigure(angle, text=labels[0] if labels else "")
+        # the other labels start one line under the angle like in the OpenCV window
+        self.canvas.coords(others, corner_x, corner_y + LABEL_LINE_HEIGHT / 2)
+        self.canvas.itemconfigure(others, text="\n".join(labels[1:]))
+
+    def _delete_pose(self, index: int) -> None:
+        for item in self._poses.pop(index):
+            self.canvas.delete(item)
+        connector: Optional[int] = self._connectors.pop(index)
+        if connector is not None:
+            self.canvas.delete(connector)
+
+    def _box_color(self, index: int) -> str:
+        return tk_color(SELECTED_COLOR if index == self.selected else BOX_COLOR)
+
+    def _draw_connector(self, index: int) -> None:
+        """Create, move or delete the connector from the previous waypoint."""
+        connector: Optional[int] = self._connectors[index]
+        if index == 0:
+            if connector is not None:
+                self.canvas.delete(connector)
+                self._connectors[index] = None
+            return
+        points = (*self._front(self.boxes[index - 1]), *self._front(self.boxes[index]))
+        if connector is None:
+            self._connectors[index] = self.canvas.create_line(
+                *points, fill=tk_color(FRONT_COLOR), width=LINE_WIDTH
+            )
+        else:
+            self.canvas.coords(connector, *points)
+
+    def _select(self, selected: Optional[int]) -> None:
+        previous: Optional[int] = self.selected
+        self.selected = selected
+        for index in {previous, selected} - {None}:
+            if index < len(self._poses):
+                self.canvas.itemconfigure(self._poses[index][0], outline=self._box_color(index))
+
+    def _same(
+        self, boxes: np.ndarray, labels: List[List[str]], start: int, old_start: int, count: int
+    ) -> np.ndarray:
+        """Compare count new waypoints from start with the drawn ones from old_start."""
+        same: np.ndarray = (
+            boxes[start : start + count] == self.boxes[old_start : old_start + count]
+        ).all(axis=(1, 2))
+        for offset in np.flatnonzero(same):
+            same[offset] = labels[start + offset] == self.labels[old_start + offset]
+        return same
+
+    def _changed_range(self, boxes: np.ndarray, labels: List[List[str]]) -> Tuple[int, int]:
+        """Get the lengths of the unchanged start and end of the path."""
+        common: int = min(len(boxes), len(self.boxes))
+        same: np.ndarray = self._same(boxes, labels, 0, 0, common)
+        prefix: int = common if same.all() else int(np.argmin(same))
+        tail: int = common - prefix
+        same = self._same(boxes, labels, len(boxes) - tail, len(self.boxes) - tail, tail)
+        suffix: int = tail if same.all() else tail - 1 - int(np.flatnonzero(~same)[-1])
+        return prefix, suffix
+
+    def set_waypoints(
+        self,
+        boxes: Sequence[np.ndarray],
+        labels: Sequence[Sequence[str]],
+        selected: Optional[int] = None,
+    ) -> None:
+        """Draw the saved waypoints, only the changed ones are redrawn.
+
+        Parameters
+        ----------
+        boxes : Sequence[np.ndarray]
+            the waypoints boxes in the mat image pixels
+        labels : Sequence[Sequence[str]]
+            the waypoints labels
+        selected : Optional[int], optional
+            the index of the selected waypoint, by default None
+        """
+        boxes = np.array(boxes, dtype=float).reshape(-1, 4, 2)
+        labels = [list(waypoint_labels) for waypoint_labels in labels]
+        prefix, suffix = self._changed_range(boxes, labels)
+        old_end: int = len(self.boxes) - suffix
+        new_end: int = len(boxes) - suffix
+        self._select(None)
+        for index in range(old_end - 1, new_end - 1, -1):
+            self._delete_pose(index)
+        self.boxes, self.labels = boxes, labels
+        for index in range(prefix, new_end):
+            if index < old_end:
+                self._move_pose(self._poses[index], boxes[index], labels[index])
+            else:
+                self._poses.insert(index, self._create_pose(boxes[index], labels[index], ""))
+                self._connectors.insert(index, None)
+        # the connectors into the changed waypoints and into the first unchanged one
+        for index in range(prefix, min(new_end + 1, len(boxes))):
+            self._draw_connector(index)
+        for index in range(prefix, new_end):
+            self.canvas.itemconfigure(self._poses[index][0], outline=self._box_color(index))
+        self._select(selected)
+
+    def add_waypoint(self, box: np.ndarray, labels: Sequence[str]) -> None:
+        """Draw a waypoint saved at the end of the path.
+
+        Parameters
+        ----------
+        box : np.ndarray
+            the waypoint box in the mat image pixels
+        labels : Sequence[str]
+            the waypoint labels
+        """
+        self.boxes = np.concatenate([self.boxes, np.asarray(box, dtype=float)[None]])
+        self.labels.append(list(labels))
+        self._poses.append(
+            self._create_pose(self.boxes[-1], labels, self._box_color(len(self.boxes) - 1))
+        )
+        self._connectors.append(None)
+        self._draw_connector(len(self.boxes) - 1)
+
+    def set_large_motors_positive_direction(self, large_motors_positive_direction: bool) -> None:
+        """Move the front points of every drawn pose after the direction changed.
+
+        Parameters
+        ----------
+        large_motors_positive_direction : bool
+            if the LARGE motors positive movement is forward
+        """
+        if large_motors_positive_direction == self.large_motors_positive_direction:
+            return
+        self.large_motors_positive_direction = large_motors_positive_direction
+        for index, items in enumerate(self._poses):
+            self._move_pose(items, self.boxes[index], self.labels[index])
+            self._draw_connector(index)
+
+    def render(
+        self,
+        live_box: np.ndarray,
+        live_labels: Sequence[str],
+        large_motors_positive_direction: bool,
+        live_color: Tuple[int, int, int] = BOX_COLOR,
+    ) -> None:
+        """Move the live robot items.
+
+        Parameters
+        ----------
+        live_box : np.ndarray
+            the live robot box in the mat image pixels
+        live_labels : Sequence[str]
+            the live robot labels
+        large_motors_positive_direction : bool
+            if the LARGE motors positive movement is forward
+        live_color : Tuple[int, int, int], optional
+            the live robot box color, by default green
+        """
+        self.set_large_motors_positive_direction(large_motors_positive_direction)
+        live_box = np.asarray(live_box, dtype=float)
+        if self._live is None:
+            self._live = self._create_pose(live_box, live_labels, tk_color(live_color))
+        else:
+            self._move_pose(self._live, live_box, live_labels)
+            self.canvas.itemconfigure(self._live[0], outline=tk_color(live_color))
+        for item in self._live:
+            self.canvas.tag_raise(item)
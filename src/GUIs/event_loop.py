@@ -0,0 +1,150 @@
+"""This module contains the frame scheduling of the planner window."""
+import logging
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+DEFAULT_MAX_FPS: float = 60.0
+# the longest wait for a key, the window still picks up the changed configurations
+DEFAULT_IDLE_TIMEOUT: float = 0.1
+NO_KEY: int = -1
+
+
+class FrameScheduler:
+    """Decide when the planner window redraws and how long it waits for a key.
+
+    A frame is drawn only after a state change and at most ``max_fps`` times per
+    second, between frames the loop blocks in the key wait.
+    """
+
+    def __init__(
+        self,
+        max_fps: float = DEFAULT_MAX_FPS,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        """Class Constructor.
+
+        Parameters
+        ----------
+        max_fps : float, optional
+            the maximum frames per second, by default 60
+        idle_timeout : float, optional
+            the longest key wait in seconds when nothing has to be drawn, by default 0.1
+        clock : Callable[[], float], optional
+            the monotonic clock in seconds, by default time.perf_counter
+        """
+        if max_fps <= 0:
+            raise ValueError(f"max_fps must be positive, got {max_fps}")
+        self.frame_interval: float = 1 / max_fps
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+        self.dirty: bool = True
+        self.last_frame: float = -np.inf
+        self.frames: int = 0
+
+    def request_redraw(self) -> None:
+        """Mark the window as changed."""
+        self.dirty = True
+
+    def should_render(self) -> bool:
+        """Check if a frame is due.
+
+        Returns
+        -------
+        bool
+            True when the window changed and the frame interval has passed
+        """
+        return self.dirty and self.clock() - self.last_frame >= self.frame_interval
+
+    def rendered(self) -> None:
+        """Record that a frame was drawn."""
+        self.dirty = False
+        self.last_frame = self.clock()
+        self.frames += 1
+
+    def wait_time_ms(self) -> int:
+        """Get the key wait of the next iteration.
+
+        Returns
+        -------
+        int
+            the wait in milliseconds, until the next frame is due when the window
+            changed, otherwise the idle timeout
+        """
+        if not self.dirty:
+            return max(1, round(self.idle_timeout * 1000))
+        remaining: float = self.last_frame + self.frame_interval - self.clock()
+        return max(1, int(np.ceil(remaining * 1000)))
+
+
+class LoopMeasurement:
+    """Measure the idle CPU usage and the input to display latency of the window loop."""
+
+    def __init__(self):
+        """Class Constructor."""
+        self.started_wall: float = time.perf_counter()
+        self.started_cpu: float = time.process_time()
+        self.idle_wall: float = 0.0
+        self.idle_cpu: float = 0.0
+        self.latencies: List[float] = []
+        self._pending_input: Optional[float] = None
+        self._wait_wall: float = 0.0
+        self._wait_cpu: float = 0.0
+
+    def wait_started(self) -> None:
+        """Record the start of a key wait."""
+        self._wait_wall = time.perf_counter()
+        self._wait_cpu = time.process_time()
+
+    def wait_ended(self, key: int) -> None:
+        """Record the end of a key wait.
+
+        Parameters
+        ----------
+        key : int
+            the pressed key, -1 when the wait timed out
+        """
+        now: float = time.perf_counter()
+        if key == NO_KEY:
+            self.idle_wall += now - self._wait_wall
+            self.idle_cpu += time.process_time() - self._wait_cpu
+        elif self._pending_input is None:
+            self._pending_input = now
+
+    def displayed(self) -> None:
+        """Record that a frame was shown."""
+        if self._pending_input is not None:
+            self.latencies.append(time.perf_counter() - self._pending_input)
+            self._pending_input = None
+
+    def report(self) -> Dict[str, float]:
+        """Summarize the measurements.
+
+        Returns
+        -------
+        Dict[str, float]
+            the whole and idle CPU usage in percent of one core, and the input to
+            display latency percentiles in milliseconds
+        """
+        wall: float = time.perf_counter() - self.started_wall
+        cpu: float = time.process_time() - self.started_cpu
+        report: Dict[str, float] = {
+            "cpu_percent": 100 * cpu / wall if wall else 0.0,
+            "idle_cpu_percent": 100 * self.idle_cpu / self.idle_wall if self.idle_wall else 0.0,
+            "inputs": len(self.latencies),
+        }
+        if self.latencies:
+            latencies_ms = np.array(self.latencies) * 1000
+            report["latency_p50_ms"] = float(np.percentile(latencies_ms, 50))
+            report["latency_p95_ms"] = float(np.percentile(latencies_ms, 95))
+            report["latency_max_ms"] = float(latencies_ms.max())
+        return report
+
+    def log_report(self) -> None:
+        """Log the measurements summary."""
+        report: Dict[str, float] = self.report()
+        logging.info(
+            "planner loop: " + ", ".join(f"{name}={value:.2f}" for name, value in report.items())
+        )
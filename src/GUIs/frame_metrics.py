@@ -0,0 +1,142 @@
+"""This module contains the frame timings of the planner window."""
+import json
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# the phases of a planner frame, the key handling since the previous frame comes first
+PHASES: Tuple[str, ...] = ("keys", "image", "waypoints", "robot", "imshow")
+PERCENTILES: Tuple[int, ...] = (50, 95, 99)
+DEFAULT_CAPACITY: int = 1024
+DEFAULT_BIN_MS: float = 1.0
+
+
+class FrameMetrics:
+    """Per phase timings of the last planner frames.
+
+    The timings are kept in a fixed size ring buffer, one row per frame and one
+    column per phase, so recording a frame never allocates. The planner skips every
+    call when the metrics are disabled.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """Class Constructor.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            the number of frames kept, by default 1024
+        """
+        self.capacity = capacity
+        self.samples: np.ndarray = np.zeros((capacity, len(PHASES)))
+        self.frames: int = 0
+        self._phase_index: Dict[str, int] = {phase: index for index, phase in enumerate(PHASES)}
+        self._row: np.ndarray = np.zeros(len(PHASES))
+        self._last: float = time.perf_counter()
+
+    def start(self) -> None:
+        """Start timing the next phase."""
+        self._last = time.perf_counter()
+
+    def lap(self, phase: str) -> None:
+        """Add the time since the previous lap to a phase of the current frame.
+
+        Parameters
+        ----------
+        phase : str
+            the phase name, one of PHASES
+        """
+        now: float = time.perf_counter()
+        self._row[self._phase_index[phase]] += now - self._last
+        self._last = now
+
+    def commit(self) -> None:
+        """Store the current frame timings in the ring buffer."""
+        self.samples[self.frames % self.capacity] = self._row
+        self._row[:] = 0
+        self.frames += 1
+
+    def recorded(self) -> np.ndarray:
+        """Get the stored frames timings.
+
+        Returns
+        -------
+        np.ndarray
+            the timings in milliseconds, with shape (frames, phases + 1), the last
+            column is the whole frame
+        """
+        samples: np.ndarray = self.samples[: min(self.frames, self.capacity)] * 1000
+        return np.column_stack([samples, samples.sum(axis=1)])
+
+    def percentiles(self) -> Dict[str, List[float]]:
+        """Get the timings percentiles.
+
+        Returns
+        -------
+        Dict[str, List[float]]
+            the p50, p95 and p99 in milliseconds of every phase and of the whole frame
+        """
+        samples: np.ndarray = self.recorded()
+        names: Tuple[str, ...] = PHASES + ("frame",)
+        if not len(samples):
+            return {name: [0.0] * len(PERCENTILES) for name in names}
+        values: np.ndarray = np.percentile(samples, PERCENTILES, axis=0)
+        return {name: values[:, index].tolist() for index, name in enumerate(names)}
+
+    def hud_lines(self) -> List[str]:
+        """Get the on screen summary.
+
+        Returns
+        -------
+        List[str]
+            one line per phase with its p50, p95 and p99 in milliseconds
+        """
+        lines: List[str] = ["ms       p50   p95   p99"]
+        for name, values in self.percentiles().items():
+            lines.append(f"{name:<8}" + "".join(f"{value:6.1f}" for value in values))
+        return lines
+
+    def histogram(self, bin_ms: float = DEFAULT_BIN_MS) -> Dict[str, dict]:
+        """Get the timings histogram.
+
+        Parameters
+        ----------
+        bin_ms : float, optional
+            the bins width in milliseconds, by default 1
+
+        Returns
+        -------
+        Dict[str, dict]
+            the frames count, the bins edges and the counts of every phase and of the
+            whole frame
+        """
+        samples: np.ndarray = self.recorded()
+        top: float = float(samples.max()) if len(samples) else 0.0
+        edges: np.ndarray = np.arange(0, top + bin_ms, bin_ms)
+        if len(edges) < 2:
+            edges = np.array([0.0, bin_ms])
+        counts: Dict[str, List[int]] = {
+            name: np.histogram(samples[:, index], bins=edges)[0].tolist()
+            for index, name in enumerate(PHASES + ("frame",))
+        }
+        return {
+            "frames": len(samples),
+            "bin_edges_ms": edges.tolist(),
+            "counts": counts,
+            "percentiles": list(PERCENTILES),
+            "percentiles_ms": self.percentiles(),
+        }
+
+    def dump(self, path: str, bin_ms: float = DEFAULT_BIN_MS) -> None:
+        """Write the timings histogram to a JSON file.
+
+        Parameters
+        ----------
+        path : str
+            the JSON file path
+        bin_ms : float, optional
+            the bins width in milliseconds, by default 1
+        """
+        with open(path, "w") as metrics_file:
+            json.dump(self.histogram(bin_ms), metrics_file, indent=2)
@@ -4,9 +4,8 @@ import os
 import tkinter as tk
 from tkinter import filedialog
 
-import cv2
-
 from src.GUIs.main_screen import run
+from src.image_reader import image_validation
 
 logging.basicConfig(
     level=logging.INFO,
@@ -47,7 +46,7 @@ class IntroScreen(tk.Frame):
                 filetypes=(("png image", "*.png"), ("jpg image", "*.jpg"), ("all files", "*.*")),
             )
             try:
-                self.img = cv2.imread(path_file)
+                self.img = image_validation(path_file)
                 if self.img is not None:
                     self.select_image_text.configure(
                         text="Image selected successfully",
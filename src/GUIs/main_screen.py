@@ -1,14 +1,34 @@
 """This module contains the main window GUI."""
 import logging
 import os
-from typing import Optional
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 import cv2
 import numpy as np
 
+from src.collision import get_obstacle_mask, obstacle_brush_radius, obstacle_mask_path
+from src.config_watcher import ConfigWatcher
 from src.configs import get_config
-from src.converters import stud_to_pixel
+from src.GUIs.event_loop import DEFAULT_MAX_FPS, NO_KEY, FrameScheduler, LoopMeasurement
+from src.GUIs.frame_metrics import FrameMetrics
+from src.GUIs.mouse_editor import MouseEditor
+from src.GUIs.overlay import BOX_COLOR, COLLISION_COLOR
+from src.GUIs.renderer import PlannerRenderer
+from src.GUIs.viewport import ImagePyramid, Viewport
+from src.image_reader import image_validation, read_image_size
 from src.motors_extraction import motors_extraction
+from src.planner_state import (
+    EDIT_KEYS,
+    SAVE_KEY,
+    SELECT_KEYS,
+    PlannerSettings,
+    PlannerState,
+    additional_motors_names,
+    key_codes,
+    load_planner_settings,
+)
+from src.session_journal import SessionJournal, get_session_journal
 
 logging.basicConfig(
     level=logging.INFO,
@@ -17,341 +37,471 @@ logging.basicConfig(
     filemode="a",
 )
 
-robot_length: int = int(get_config("robot_dimensions.length_x"))
-robot_width: int = int(get_config("robot_dimensions.width_y"))
-logging.info(f"defined robot length: {robot_length} studs and robot width: {robot_width} studs")
-if not robot_length or not robot_width:
-    raise ValueError("Robot length or width is not defined in the config file.")
-
-mat_length: int = int(get_config("mat_dimensions.length_x"))
-mat_width: int = int(get_config("mat_dimensions.width_y"))
-logging.info(f"defined mat length (x-axis): {mat_length} mm and mat width (y-axis): {mat_width} mm")
-if not mat_length or not mat_width:
-    raise ValueError("Mat length or width is not defined in the config file.")
-
-detla_theta: int = int(get_config("steps.delta_theta"))
-delta_pixels: int = int(get_config("steps.delta_pixels"))
-additional_motors_steps: int = int(get_config("steps.additional_motors_steps"))
-logging.info(
-    f"defined delta theta: {detla_theta} degrees, delta pixels: {delta_pixels} pixels and additional motors steps: {additional_motors_steps} steps"
-)
-if not detla_theta or not delta_pixels or not additional_motors_steps:
-    raise ValueError("Steps are not defined in the config file.")
 
-large_motors_positive_direction: str = get_config(
-    "robot_movement_configurations.large_motor_positive_direction"
-)
-gyro_positive_direction: str = get_config("robot_movement_configurations.gyro_positive_direction")
+DEFAULT_WINDOW_SIZE: Tuple[int, int] = (1280, 800)
+DEFAULT_FRAME_METRICS_FILE: str = "frame_metrics.json"
+PLANNER_BACKENDS: Tuple[str, str] = ("opencv", "tk")
 
-logging.info(
-    f"defined large motors positive direction: {large_motors_positive_direction} and gyro positive direction: {gyro_positive_direction}"
+# keys that zoom and pan the window over the mat image
+VIEW_KEYS: Dict[int, Callable[[Viewport], None]] = {
+    ord("+"): Viewport.zoom_in,
+    ord("="): Viewport.zoom_in,
+    ord("-"): Viewport.zoom_out,
+    ord("i"): partial(Viewport.pan, dx=0, dy=-1),
+    ord("k"): partial(Viewport.pan, dx=0, dy=1),
+    ord("j"): partial(Viewport.pan, dx=-1, dy=0),
+    ord("l"): partial(Viewport.pan, dx=1, dy=0),
+    ord("0"): Viewport.fit,
+}
+
+# configurations sections that are applied to a running session when they change, the
+# mat image is read once when the session starts
+LIVE_CONFIGS: Tuple[str, ...] = (
+    "robot_dimensions",
+    "mat_dimensions",
+    "steps",
+    "robot_movement_configurations",
 )
-if large_motors_positive_direction is None or gyro_positive_direction is None:
-    raise ValueError("Robot movement configurations are not defined in the config file.")
-
-speed_steps: int = int(get_config("steps.speed_steps"))
-logging.info(f"defined speed steps: {speed_steps}")
-if not speed_steps:
-    raise ValueError("Speed steps configurations are not defined in the config file.")
-
-
-def run(image: Optional[np.ndarray] = None):
-    """Run the main window GUI."""
-    _, medium_motors_list = motors_extraction()
-    if len(medium_motors_list) == 2:
-        first_additional_motor, second_additional_motor = medium_motors_list
-    elif len(medium_motors_list) == 1:
-        first_additional_motor = medium_motors_list
-        second_additional_motor = "X"
+
+
+class LiveSettings:
+    """Planning session configurations that follow the configurations file.
+
+    The settings are rebuilt on the configurations watcher thread and swapped in with a
+    single assignment, so the render loop reads them with one attribute access.
+    """
+
+    def __init__(self, settings: PlannerSettings):
+        """Class Constructor.
+
+        Parameters
+        ----------
+        settings : PlannerSettings
+            the initial planning session configurations
+        """
+        self.current = settings
+
+    def on_configs_changed(self, changed: set) -> None:
+        """Rebuild the settings when a configuration used by the session changed.
+
+        Parameters
+        ----------
+        changed : set
+            dotted paths of the changed configurations
+        """
+        if not any(path.split(".")[0] in LIVE_CONFIGS for path in changed):
+            return
+        try:
+            settings: PlannerSettings = load_planner_settings()
+        except (ValueError, TypeError) as e:
+            logging.error(f"keeping the previous session configurations: {e}")
+            return
+        self.current = settings
+        logging.info(f"applied the changed configurations to the running session: {settings}")
+
+
+def planner_window_size(image_size: Tuple[int, int]) -> Tuple[int, int]:
+    """Get the planner window size.
+
+    Parameters
+    ----------
+    image_size : Tuple[int, int]
+        the mat image height and width
+
+    Returns
+    -------
+    Tuple[int, int]
+        the window width and height, the configured size shrunk to the mat image size
+    """
+    try:
+        window_width: int = int(get_config("gui.window_width") or DEFAULT_WINDOW_SIZE[0])
+        window_height: int = int(get_config("gui.window_height") or DEFAULT_WINDOW_SIZE[1])
+    except KeyError:
+        window_width, window_height = DEFAULT_WINDOW_SIZE
+    image_height_y, image_width_x = image_size
+    return min(window_width, image_width_x), min(window_height, image_height_y)
+
+
+def planner_max_fps() -> float:
+    """Get the maximum frames per second of the planner window.
+
+    Returns
+    -------
+    float
+        the configured maximum frames per second, by default 60
+    """
+    try:
+        return float(get_config("gui.max_fps") or DEFAULT_MAX_FPS)
+    except KeyError:
+        return DEFAULT_MAX_FPS
+
+
+def planner_measure_loop() -> bool:
+    """Check if the planner window loop is measured.
+
+    Returns
+    -------
+    bool
+        the ``gui.measure_loop`` configuration, by default False
+    """
+    try:
+        return bool(get_config("gui.measure_loop"))
+    except KeyError:
+        return False
+
+
+def planner_frame_metrics_file() -> Optional[str]:
+    """Get the file the planner frame timings are written to.
+
+    Returns
+    -------
+    Optional[str]
+        the frame timings JSON file, None when the ``gui.frame_metrics`` configuration
+        is off
+    """
+    try:
+        if not get_config("gui.frame_metrics"):
+            return None
+        return get_config("gui.frame_metrics_file") or DEFAULT_FRAME_METRICS_FILE
+    except KeyError:
+        return None
+
+
+def planner_backend() -> str:
+    """Get the window the planning session runs in.
+
+    Returns
+    -------
+    str
+        opencv for the OpenCV window of run, tk for the Tk main window, by default opencv
+
+    Raises
+    ------
+    ValueError
+        when ``gui.backend`` is not one of the planner backends
+    """
+    try:
+        backend: str = get_config("gui.backend") or PLANNER_BACKENDS[0]
+    except KeyError:
+        return PLANNER_BACKENDS[0]
+    if backend not in PLANNER_BACKENDS:
+        raise ValueError(f"gui.backend must be one of {PLANNER_BACKENDS}, not {backend}")
+    return backend
+
+
+def wait_key(
+    scheduler: FrameScheduler,
+    measurement: Optional[LoopMeasurement] = None,
+    metrics: Optional[FrameMetrics] = None,
+) -> int:
+    """Block until a key is pressed or the next frame is due.
+
+    Parameters
+    ----------
+    scheduler : FrameScheduler
+        the window frame scheduler
+    measurement : Optional[LoopMeasurement], optional
+        the loop measurement to record the wait, by default None
+    metrics : Optional[FrameMetrics], optional
+        the frame timings, the key handling is timed from the key press,
+        by default None
+
+    Returns
+    -------
+    int
+        the pressed key, -1 when the wait timed out
+    """
+    if measurement is not None:
+        measurement.wait_started()
+    key: int = cv2.waitKey(scheduler.wait_time_ms())
+    if measurement is not None:
+        measurement.wait_ended(key)
+    if metrics is not None:
+        metrics.start()
+    return key
+
+
+def show_frame(
+    renderer: PlannerRenderer,
+    live_box: np.ndarray,
+    live_labels: List[str],
+    large_motors_positive_direction: bool,
+    metrics: Optional[FrameMetrics] = None,
+    show_hud: bool = False,
+    live_color: Tuple[int, int, int] = BOX_COLOR,
+) -> None:
+    """Render and show a planner frame.
+
+    Parameters
+    ----------
+    renderer : PlannerRenderer
+        the planner window renderer
+    live_box : np.ndarray
+        the live robot box in the mat image pixels
+    live_labels : List[str]
+        the live robot labels
+    large_motors_positive_direction : bool
+        if the LARGE motors positive movement is forward
+    metrics : Optional[FrameMetrics], optional
+        the frame timings to record the frame, by default None
+    show_hud : bool, optional
+        draw the frame timings percentiles on the frame, by default False
+    live_color : Tuple[int, int, int], optional
+        the live robot box color, by default BOX_COLOR
+    """
+    if metrics is not None:
+        metrics.start()
+    image: np.ndarray = renderer.render(
+        live_box, live_labels, large_motors_positive_direction, live_color
+    )
+    if metrics is not None:
+        if show_hud:
+            renderer.draw_hud(metrics.hud_lines())
+            metrics.start()
+        cv2.imshow("image", image)
+        metrics.lap("imshow")
+        metrics.commit()
     else:
-        first_additional_motor = second_additional_motor = "X"
+        cv2.imshow("image", image)
+
+
+def sync_waypoints(renderer: PlannerRenderer, state: PlannerState) -> None:
+    """Redraw every saved waypoint after an edit or a selection change.
+
+    Parameters
+    ----------
+    renderer : PlannerRenderer
+        the planner window renderer
+    state : PlannerState
+        the planning session state
+    """
+    renderer.set_waypoints(
+        state.waypoints.boxes.copy(),
+        [state.waypoint_labels(index) for index in range(len(state.waypoints))],
+        state.selected,
+    )
+
+
+def draw_waypoints_change(renderer: PlannerRenderer, state: PlannerState, key: int) -> None:
+    """Update the drawn waypoints after a planning key.
+
+    Parameters
+    ----------
+    renderer : PlannerRenderer
+        the planner window renderer
+    state : PlannerState
+        the planning session state
+    key : int
+        the handled planning key
+    """
+    if key == SAVE_KEY:
+        renderer.add_waypoint(state.waypoints.boxes[-1].copy(), state.waypoint_labels(-1))
+    elif key in EDIT_KEYS or key in SELECT_KEYS:
+        sync_waypoints(renderer, state)
+
+
+def run(
+    image: Optional[np.ndarray] = None, hot_reload: bool = True, measure: Optional[bool] = None
+):
+    """Run the main window GUI.
+
+    The window blocks waiting for a key and is redrawn only after a change, at most
+    ``gui.max_fps`` times per second.
+
+    Parameters
+    ----------
+    image : Optional[np.ndarray], optional
+        the mat image, by default the image at the configured mat image path
+    hot_reload : bool, optional
+        apply the changes of the configurations file to the running session,
+        by default True
+    measure : Optional[bool], optional
+        log the idle CPU usage and the input to display latency when the window is
+        closed, by default the ``gui.measure_loop`` configuration
+    """
+    live_settings = LiveSettings(load_planner_settings())
+    watcher: Optional[ConfigWatcher] = None
+    if hot_reload:
+        watcher = ConfigWatcher(live_settings.on_configs_changed).start()
+    motors_names: Tuple[str, str] = additional_motors_names(motors_extraction()[1])
     logging.info(
-        f"defined first additional motor: {first_additional_motor} and second additional motor: {second_additional_motor}"
+        f"defined first additional motor: {motors_names[0]} and second additional motor: {motors_names[1]}"
     )
 
     if image is None:
         image_path: str = get_config("mat_image_path")
         if image_path:
-            original_image: np.ndarray = cv2.imread(image_path)
+            original_image: np.ndarray = image_validation(image_path)
         else:
             raise ValueError("No image was given.")
     else:
         original_image = image
 
-    robot_lengh_x_pixels: int = stud_to_pixel(robot_length)
-    robot_width_y_pixels: int = stud_to_pixel(robot_width)
-    image_height_y, image_width_x, _ = original_image.shape
-    robot_top_left_corner = np.array([0, image_height_y - robot_width_y_pixels])
-    theta: int = 0
-    displayed_theta: int = 0
-    additional_motor_1: int = 0
-    additional_motor_2: int = 0
-    speed_dps: int = 500
-    saved_boxes: list = []
-    saved_theta: list = []
-    saved_displayed_theta: list = []
-    additional_motor_1_list: list = []
-    additional_motor_2_list: list = []
-    additional_motors_mode_list: list = []
-    additional_motors_mode: chr = "S"
-    robot_speed_dps_list: list = []
-    while True:
-        image = original_image.copy()
-        if saved_boxes:
-            for i in range(len(saved_boxes)):
-                cv2.polylines(image, [saved_boxes[i].astype(int)], True, (0, 255, 0), 2)
-                if large_motors_positive_direction:
-                    cv2.circle(
-                        image,
-                        (
-                            (int(saved_boxes[i][0][0]) + int(saved_boxes[i][1][0])) // 2,
-                            (int(saved_boxes[i][0][1]) + int(saved_boxes[i][1][1])) // 2,
-                        ),
-                        5,
-                        (0, 0, 255),
-                        -1,
-                    )
-                else:
-                    cv2.circle(
-                        image,
-                        (
-                            (int(saved_boxes[i][2][0]) + int(saved_boxes[i][3][0])) // 2,
-                            (int(saved_boxes[i][2][1]) + int(saved_boxes[i][3][1])) // 2,
-                        ),
-                        5,
-                        (0, 0, 255),
-                        -1,
-                    )
-                cv2.putText(
-                    image,
-                    str(saved_displayed_theta[i]),
-                    (int(saved_boxes[i][0][0]), int(saved_boxes[i][0][1])),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.5,
-                    (0, 0, 255),
-                    1,
-                )
-                cv2.putText(
-                    image,
-                    first_additional_motor + ": " + str(additional_motor_1_list[i]),
-                    (int(saved_boxes[i][0][0]), int(saved_boxes[i][0][1]) + 15),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.5,
-                    (0, 0, 0),
-                    1,
-                )
-                cv2.putText(
-                    image,
-                    second_additional_motor + ": " + str(additional_motor_2_list[i]),
-                    (int(saved_boxes[i][0][0]), int(saved_boxes[i][0][1]) + 30),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.5,
-                    (0, 0, 0),
-                    1,
-                )
-                cv2.putText(
-                    image,
-                    additional_motors_mode_list[i],
-                    (int(saved_boxes[i][0][0]), int(saved_boxes[i][0][1]) + 45),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.5,
-                    (0, 0, 0),
-                    1,
-                )
-                cv2.putText(
-                    image,
-                    "speed: " + str(robot_speed_dps_list[i]),
-                    (int(saved_boxes[i][0][0]), int(saved_boxes[i][0][1]) + 60),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.5,
-                    (0, 0, 0),
-                    1,
-                )
-
-            if len(saved_boxes) > 1:
-                for i in range(len(saved_boxes) - 1):
-                    if large_motors_positive_direction:
-                        cv2.line(
-                            image,
-                            (
-                                (int(saved_boxes[i][0][0]) + int(saved_boxes[i][1][0])) // 2,
-                                (int(saved_boxes[i][0][1]) + int(saved_boxes[i][1][1])) // 2,
-                            ),
-                            (
-                                (int(saved_boxes[i + 1][0][0]) + int(saved_boxes[i + 1][1][0]))
-                                // 2,
-                                (int(saved_boxes[i + 1][0][1]) + int(saved_boxes[i + 1][1][1]))
-                                // 2,
-                            ),
-                            (0, 0, 255),
-                            2,
-                        )
-                    else:
-                        cv2.line(
-                            image,
-                            (
-                                (int(saved_boxes[i][2][0]) + int(saved_boxes[i][3][0])) // 2,
-                                (int(saved_boxes[i][2][1]) + int(saved_boxes[i][3][1])) // 2,
-                            ),
-                            (
-                                (int(saved_boxes[i + 1][2][0]) + int(saved_boxes[i + 1][3][0]))
-                                // 2,
-                                (int(saved_boxes[i + 1][2][1]) + int(saved_boxes[i + 1][3][1]))
-                                // 2,
-                            ),
-                            (0, 0, 255),
-                            2,
-                        )
-
-        box = np.array(
-            [
-                [robot_top_left_corner[0], robot_top_left_corner[1]],
-                [robot_top_left_corner[0] + robot_lengh_x_pixels, robot_top_left_corner[1]],
-                [
-                    robot_top_left_corner[0] + robot_lengh_x_pixels,
-                    robot_top_left_corner[1] + robot_width_y_pixels,
-                ],
-                [robot_top_left_corner[0], robot_top_left_corner[1] + robot_width_y_pixels],
-            ]
-        )
-
-        center = np.mean(box, axis=0)
-        translated_box = box - center
-        theta_rad = np.deg2rad(theta)
-        rot_matrix = np.array(
-            [[np.cos(theta_rad), -np.sin(theta_rad)], [np.sin(theta_rad), np.cos(theta_rad)]]
-        )
-        rotated_box = np.dot(translated_box, rot_matrix)
-
-        rotated_box = rotated_box + center
-
-        cv2.polylines(image, [rotated_box.astype(int)], True, (0, 255, 0), 2)
-        cv2.putText(
-            image,
-            str(-displayed_theta) if gyro_positive_direction else str(displayed_theta),
-            (int(rotated_box[0][0]), int(rotated_box[0][1])),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.5,
-            (0, 0, 255),
-            1,
-        )
-        cv2.putText(
-            image,
-            first_additional_motor + ": " + str(additional_motor_1),
-            (int(rotated_box[0][0]), int(rotated_box[0][1]) + 15),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.5,
-            (0, 0, 0),
-            1,
-        )
-        cv2.putText(
-            image,
-            second_additional_motor + ": " + str(additional_motor_2),
-            (int(rotated_box[0][0]), int(rotated_box[0][1]) + 30),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.5,
-            (0, 0, 0),
-            1,
-        )
-        cv2.putText(
-            image,
-            additional_motors_mode,
-            (int(rotated_box[0][0]), int(rotated_box[0][1]) + 45),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.5,
-            (0, 0, 0),
-            1,
-        )
-        cv2.putText(
-            image,
-            "speed" + ": " + str(speed_dps),
-            (int(rotated_box[0][0]), int(rotated_box[0][1]) + 60),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.5,
-            (0, 0, 0),
-            1,
-        )
-        if large_motors_positive_direction:
-            cv2.circle(
-                image,
-                (
-                    (int(rotated_box[0][0]) + int(rotated_box[1][0])) // 2,
-                    (int(rotated_box[0][1]) + int(rotated_box[1][1])) // 2,
-                ),
-                5,
-                (0, 0, 255),
-                -1,
-            )
+    state = PlannerState(
+        live_settings.current,
+        original_image.shape[0],
+        motors_names,
+        get_obstacle_mask(original_image.shape[:2]),
+    )
+    journal: Optional[SessionJournal] = get_session_journal(original_image.shape[:2])
+    if journal is not None:
+        if journal.recover(state):
+            logging.info(f"recovered {len(state.waypoints)} waypoints from {journal.path}")
+        journal.open()
+    state.check_collision()
+    window_size: Tuple[int, int] = planner_window_size(original_image.shape[:2])
+    pyramid = ImagePyramid(original_image)
+    viewport = Viewport(original_image.shape[:2], window_size)
+    renderer = PlannerRenderer(pyramid, viewport)
+    renderer.obstacles = state.obstacles
+    sync_waypoints(renderer, state)
+    scheduler = FrameScheduler(planner_max_fps())
+    if measure is None:
+        measure = planner_measure_loop()
+    measurement: Optional[LoopMeasurement] = LoopMeasurement() if measure else None
+    metrics_file: Optional[str] = planner_frame_metrics_file()
+    metrics: Optional[FrameMetrics] = FrameMetrics() if metrics_file else None
+    renderer.metrics = metrics
+    show_hud: bool = metrics is not None
+
+    def on_waypoint_dragged() -> None:
+        if state.selected is not None and renderer.selected == state.selected:
+            # only the dragged pose and its connectors are redrawn while it moves
+            renderer.move_waypoint(state.selected, state.waypoints.boxes[state.selected].copy())
         else:
-            cv2.circle(
-                image,
-                (
-                    (int(rotated_box[2][0]) + int(rotated_box[3][0])) // 2,
-                    (int(rotated_box[2][1]) + int(rotated_box[3][1])) // 2,
-                ),
-                5,
-                (0, 0, 255),
-                -1,
-            )
-        cv2.imshow("image", image)
+            sync_waypoints(renderer, state)
+        scheduler.request_redraw()
 
-        key = cv2.waitKey(1)
-        if key == ord("q"):
-            break
-        elif key == ord(","):
-            theta += detla_theta
-            displayed_theta += detla_theta
-        elif key == ord("."):
-            theta -= detla_theta
-            displayed_theta -= detla_theta
-        elif key == ord("a"):
-            robot_top_left_corner[0] -= delta_pixels
-        elif key == ord("d"):
-            robot_top_left_corner[0] += delta_pixels
-        elif key == ord("w"):
-            robot_top_left_corner[1] -= delta_pixels
-        elif key == ord("s"):
-            robot_top_left_corner[1] += delta_pixels
-        elif key == ord("p"):
-            saved_boxes.append(rotated_box)
-            saved_theta.append(-theta if gyro_positive_direction else theta)
-            saved_displayed_theta.append(
-                -displayed_theta if gyro_positive_direction else displayed_theta
+    def on_waypoint_dropped() -> None:
+        if journal is not None:
+            journal.compact(state)
+
+    mouse_editor = MouseEditor(
+        state,
+        viewport,
+        on_waypoint_dragged,
+        on_waypoint_dropped,
+        on_paint=scheduler.request_redraw,
+        brush_radius=obstacle_brush_radius(),
+    )
+    cv2.namedWindow("image")
+    cv2.setMouseCallback("image", mouse_editor)
+    while not state.finished:
+        if live_settings.current is not state.settings:
+            state.settings = live_settings.current
+            scheduler.request_redraw()
+
+        if scheduler.should_render():
+            show_frame(
+                renderer,
+                state.live_box(),
+                state.live_labels(),
+                state.settings.large_motors_positive_direction,
+                metrics,
+                show_hud,
+                COLLISION_COLOR if state.colliding else BOX_COLOR,
             )
-            additional_motor_1_list.append(additional_motor_1)
-            additional_motor_2_list.append(additional_motor_2)
-            additional_motors_mode_list.append(additional_motors_mode)
-            robot_speed_dps_list.append(speed_dps)
-            additional_motor_1: int = 0
-            additional_motor_2: int = 0
-        elif key == ord("z"):
-            additional_motor_1 += additional_motors_steps
-        elif key == ord("x"):
-            additional_motor_1 -= additional_motors_steps
-        elif key == ord("c"):
-            additional_motor_2 += additional_motors_steps
-        elif key == ord("v"):
-            additional_motor_2 -= additional_motors_steps
-        elif key == ord("r"):
-            additional_motors_mode: chr = "P"
-        elif key == ord("t"):
-            additional_motors_mode: chr = "S"
-        elif key == ord("m"):
-            if speed_dps < 1000:
-                speed_dps += speed_steps
-        elif key == ord("n"):
-            if speed_dps > 0:
-                speed_dps -= speed_steps
-        elif key == ord("y"):
-            displayed_theta = 0
+            scheduler.rendered()
+            if measurement is not None:
+                measurement.displayed()
+
+        key = wait_key(scheduler, measurement, metrics)
+        if key == NO_KEY:
+            continue
+        scheduler.request_redraw()
+        if state.handle_key(key):
+            draw_waypoints_change(renderer, state, key)
+            if journal is not None and not state.finished:
+                journal.append(key, state)
+        elif key in VIEW_KEYS:
+            VIEW_KEYS[key](viewport)
+        elif key == ord("h"):
+            show_hud = not show_hud
+            renderer.invalidate()
+        elif key == ord("g"):
+            mouse_editor.painting = not mouse_editor.painting
+            logging.info(f"obstacles paint mode {'on' if mouse_editor.painting else 'off'}")
+        if metrics is not None:
+            metrics.lap("keys")
 
     cv2.destroyAllWindows()
+    if watcher is not None:
+        watcher.stop()
+    if journal is not None:
+        journal.discard()
+    if state.obstacles.modified:
+        state.obstacles.save(obstacle_mask_path())
+        logging.info(f"obstacles written to {obstacle_mask_path()}")
+    if measurement is not None:
+        measurement.log_report()
+    if metrics is not None:
+        metrics.dump(metrics_file)
+        logging.info(f"frame timings written to {metrics_file}")
 
-    return (
-        saved_boxes,
-        saved_displayed_theta,
-        additional_motor_1_list,
-        additional_motor_2_list,
-        additional_motors_mode_list,
-        robot_speed_dps_list,
-    )
+    return state.result()
+
+
+def run_headless(
+    keys: Union[str, Iterable[Union[int, str]]],
+    image: Optional[np.ndarray] = None,
+    settings: Optional[PlannerSettings] = None,
+    motors_names: Optional[Tuple[str, str]] = None,
+    render: bool = False,
+):
+    """Run a planning session from a key sequence, without a window.
+
+    The keys drive the same planning state as the main window GUI, the session ends
+    with the q key or at the end of the keys.
+
+    Parameters
+    ----------
+    keys : Union[str, Iterable[Union[int, str]]]
+        the key characters or codes, see read_key_script for reading them from a file
+    image : Optional[np.ndarray], optional
+        the mat image, by default only the size of the configured mat image is read
+    settings : Optional[PlannerSettings], optional
+        the planning session configurations, by default loaded from the configurations
+        file
+    motors_names : Optional[Tuple[str, str]], optional
+        the first and second additional motors names, by default the configured
+        MEDIUM motors
+    render : bool, optional
+        render every frame offscreen, needs the image, by default False
+
+    Returns
+    -------
+    Tuple[list, list, list, list, list, list]
+        the robot boxes, the displayed angles, the first and second additional
+        motors rotations, the additional motors modes and the speeds, as returned by
+        run
+    """
+    if settings is None:
+        settings = load_planner_settings()
+    if motors_names is None:
+        motors_names = additional_motors_names(motors_extraction()[1])
+    if image is not None:
+        image_size: Tuple[int, int] = image.shape[:2]
+    else:
+        image_size = read_image_size(get_config("mat_image_path"))
+    state = PlannerState(settings, image_size[0], motors_names, get_obstacle_mask(image_size))
+    state.check_collision()
+
+    renderer: Optional[PlannerRenderer] = None
+    if render:
+        if image is None:
+            raise ValueError("Rendering the headless session needs the mat image.")
+        viewport = Viewport(image.shape[:2], planner_window_size(image.shape[:2]))
+        renderer = PlannerRenderer(ImagePyramid(image), viewport)
+        renderer.obstacles = state.obstacles
+    for key in key_codes(keys):
+        if renderer is not None:
+            renderer.render(
+                state.live_box(), state.live_labels(), settings.large_motors_positive_direction
+            )
+        if state.handle_key(key) and renderer is not None:
+            draw_waypoints_change(renderer, state, key)
+        elif key in VIEW_KEYS and renderer is not None:
+            VIEW_KEYS[key](renderer.viewport)
+        if state.finished:
+            break
+    return state.result()
@@ -1,32 +1,55 @@
 """This module contains the main window GUI class."""
 import tkinter as tk
-from time import sleep
+from typing import Optional
 
 import cv2
 import numpy as np
-from PIL import Image, ImageTk
 
 from src.configs import get_config
-from src.GUIs.key_logger import keylogger
-from src.GUIs.mouse_logger import mouselogger
+from src.GUIs.canvas_renderer import CanvasRenderer
+from src.GUIs.overlay import BOX_COLOR, COLLISION_COLOR
+from src.planner_state import (
+    EDIT_KEYS,
+    SAVE_KEY,
+    SELECT_KEYS,
+    PlannerState,
+    additional_motors_names,
+    load_planner_settings,
+)
 
-robot_length = get_config("robot_dimensions.length_x")
-robot_width = get_config("robot_dimensions.width_y")
+# the width of the left side of the window, the mat is shown right of it
+SIDE_PANEL_WIDTH: int = 230
 
-mat_length = get_config("mat_dimensions.length_x")
-mat_width = get_config("mat_dimensions.width_y")
 
-if not robot_length or not robot_width:
-    raise ValueError("Robot length or width is not defined in the config file.")
+def _validate_dimensions() -> None:
+    """Validate the robot and mat dimensions configurations.
 
-if not mat_length or not mat_width:
-    raise ValueError("Mat length or width is not defined in the config file.")
+    Raises
+    ------
+    ValueError
+        If the robot or mat dimensions are not defined in the config file.
+    """
+    robot_length = get_config("robot_dimensions.length_x")
+    robot_width = get_config("robot_dimensions.width_y")
+
+    mat_length = get_config("mat_dimensions.length_x")
+    mat_width = get_config("mat_dimensions.width_y")
+
+    if not robot_length or not robot_width:
+        raise ValueError("Robot length or width is not defined in the config file.")
+
+    if not mat_length or not mat_width:
+        raise ValueError("Mat length or width is not defined in the config file.")
 
 
 class MainWindow(tk.Frame):
-    """This class contains the GUI for the main window."""
+    """This class contains the GUI for the main window.
 
-    def __init__(self, master=None, image: np.ndarray = None):
+    The mat image is drawn once, the planning keys update the canvas items of the
+    changed waypoints and of the live robot only, see CanvasRenderer.
+    """
+
+    def __init__(self, master=None, image: np.ndarray = None, state: Optional[PlannerState] = None):
         """Initialize the main window GUI.
 
         Arguments
@@ -35,7 +58,14 @@ class MainWindow(tk.Frame):
             The master window.
         image : np.ndarray
             The image to be displayed.
+        state : Optional[PlannerState]
+            The planning session state, by default a new session on the image.
         """
+        from PIL import Image, ImageTk
+
+        from src.motors_extraction import motors_extraction
+
+        _validate_dimensions()
         super().__init__(master)
         self.master = master
         self.master.title("EV3PathBOT")
@@ -45,11 +75,30 @@ class MainWindow(tk.Frame):
         self.bg_color = "#23272D"
         self.master.configure(background=self.bg_color)
         self.master.resizable(False, False)
+        if state is None:
+            state = PlannerState(
+                load_planner_settings(),
+                image.shape[0],
+                additional_motors_names(motors_extraction()[1]),
+            )
+        self.state = state
+        # the mat is shrunk once to fit the screen, the canvas items are scaled instead
+        self.scale: float = min(
+            1.0, (width - SIDE_PANEL_WIDTH) / image.shape[1], height / image.shape[0]
+        )
+        if self.scale < 1.0:
+            image = cv2.resize(
+                image, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA
+            )
         image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
         img = Image.fromarray(image)
         self.photo = ImageTk.PhotoImage(img)
         self.off_white = "#FAF9F6"
         self.create_widgets()
+        self.renderer = CanvasRenderer(self.image_canvas, self.scale)
+        self.sync_waypoints()
+        self.draw_live_robot()
+        self.master.bind("<Key>", self.on_key)
 
     def create_widgets(self):
         """Create the widgets for the main window."""
@@ -58,7 +107,7 @@ class MainWindow(tk.Frame):
             """Create the image frame."""
             self.image_frame = tk.Frame(self.master, bg=self.off_white)
             self.image_frame.place(
-                x=230,
+                x=SIDE_PANEL_WIDTH,
                 y=0,
                 width=self.photo.width(),
                 height=self.photo.height(),
@@ -76,3 +125,73 @@ class MainWindow(tk.Frame):
             self.image_canvas.create_image(0, 0, anchor="nw", image=self.photo)
 
         _create_image_frame()
+
+    def sync_waypoints(self) -> None:
+        """Redraw the changed saved waypoints."""
+        self.renderer.set_waypoints(
+            self.state.waypoints.boxes,
+            [self.state.waypoint_labels(index) for index in range(len(self.state.waypoints))],
+            self.state.selected,
+        )
+
+    def draw_live_robot(self) -> None:
+        """Move the live robot items."""
+        self.renderer.render(
+            self.state.live_box(),
+            self.state.live_labels(),
+            self.state.settings.large_motors_positive_direction,
+            COLLISION_COLOR if self.state.colliding else BOX_COLOR,
+        )
+
+    def on_key(self, event: tk.Event) -> None:
+        """Handle a planning key press.
+
+        Arguments
+        ---------
+        event : tk.Event
+            The key press event.
+        """
+        if len(event.char) != 1:
+            return
+        key: int = ord(event.char)
+        if not self.state.handle_key(key):
+            return
+        if self.state.finished:
+            self.master.quit()
+            return
+        if key == SAVE_KEY:
+            self.renderer.add_waypoint(
+                self.state.waypoints.boxes[-1], self.state.waypoint_labels(-1)
+            )
+        elif key in EDIT_KEYS or key in SELECT_KEYS:
+            self.sync_waypoints()
+        self.draw_live_robot()
+
+
+def run_main_window(image: Optional[np.ndarray] = None):
+    """Run a planning session in the Tk main window.
+
+    Parameters
+    ----------
+    image : Optional[np.ndarray], optional
+        the mat image, by default the image at the configured mat image path
+
+    Returns
+    -------
+    Tuple[list, list, list, list, list, list]
+        the robot boxes, the displayed angles, the first and second additional
+        motors rotations, the additional motors modes and the speeds, as returned by
+        main_screen.run
+    """
+    from src.image_reader import image_validation
+
+    if image is None:
+        image_path: str = get_config("mat_image_path")
+        if not image_path:
+            raise ValueError("No image was given.")
+        image = image_validation(image_path)
+    root = tk.Tk()
+    window = MainWindow(root, image)
+    window.mainloop()
+    root.destroy()
+    return window.state.result()
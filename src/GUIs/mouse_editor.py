@@ -0,0 +1,101 @@
+"""This module contains the mouse editing of the saved waypoints."""
+from typing import Callable, Optional
+
+import cv2
+import numpy as np
+
+from src.collision import DEFAULT_BRUSH_RADIUS, ObstacleMask
+from src.GUIs.viewport import Viewport
+from src.planner_state import PlannerState
+
+# the farthest waypoint center picked by a click outside every waypoint, in window pixels
+PICK_RADIUS: int = 20
+
+
+class MouseEditor:
+    """Select the saved waypoints by clicking them and move them by dragging.
+
+    The clicked waypoint is found with the spatial index of the state, so clicking
+    and dragging do not depend on the path length. A drag is undone as one edit. In
+    the paint mode the left button paints obstacles and the right button erases them.
+    """
+
+    def __init__(
+        self,
+        state: PlannerState,
+        viewport: Viewport,
+        on_change: Callable[[], None],
+        on_drop: Optional[Callable[[], None]] = None,
+        on_paint: Optional[Callable[[], None]] = None,
+        brush_radius: int = DEFAULT_BRUSH_RADIUS,
+    ):
+        """Class Constructor.
+
+        Parameters
+        ----------
+        state : PlannerState
+            the planning session state
+        viewport : Viewport
+            the planner window viewport, converts the window pixels to the mat image
+        on_change : Callable[[], None]
+            called after the selection or a dragged waypoint changed
+        on_drop : Optional[Callable[[], None]], optional
+            called after a waypoint was dropped, by default None
+        on_paint : Optional[Callable[[], None]], optional
+            called after the obstacles were painted, by default None
+        brush_radius : int, optional
+            the obstacles brush radius in mat image pixels, by default 10
+        """
+        self.state = state
+        self.viewport = viewport
+        self.on_change = on_change
+        self.on_drop = on_drop
+        self.on_paint = on_paint
+        self.brush_radius = brush_radius
+        self.dragging: bool = False
+        self.painting: bool = False
+
+    def __call__(self, event: int, x: int, y: int, flags: int, param=None) -> None:
+        """Handle a mouse event, see cv2.setMouseCallback."""
+        point: np.ndarray = self.viewport.to_image((x, y))
+        if self.painting:
+            self._paint(event, point, flags)
+        else:
+            self._edit(event, point)
+
+    def _paint(self, event: int, point: np.ndarray, flags: int) -> None:
+        obstacles: Optional[ObstacleMask] = self.state.obstacles
+        if obstacles is None:
+            return
+        if event == cv2.EVENT_LBUTTONDOWN or (
+            event == cv2.EVENT_MOUSEMOVE and flags & cv2.EVENT_FLAG_LBUTTON
+        ):
+            obstacles.paint(point, self.brush_radius)
+        elif event == cv2.EVENT_RBUTTONDOWN or (
+            event == cv2.EVENT_MOUSEMOVE and flags & cv2.EVENT_FLAG_RBUTTON
+        ):
+            obstacles.paint(point, self.brush_radius, obstacle=False)
+        else:
+            return
+        self.state.check_collision()
+        if self.on_paint is not None:
+            self.on_paint()
+
+    def _edit(self, event: int, point: np.ndarray) -> None:
+        if event == cv2.EVENT_LBUTTONDOWN:
+            index: Optional[int] = self.state.waypoint_at(point, PICK_RADIUS / self.viewport.zoom)
+            if index is None:
+                return
+            self.state.begin_drag(index, point)
+            self.dragging = True
+            self.on_change()
+        elif event == cv2.EVENT_MOUSEMOVE and self.dragging:
+            self.state.drag_to(point)
+            self.on_change()
+        elif event == cv2.EVENT_LBUTTONUP and self.dragging:
+            self.state.drag_to(point)
+            self.dragging = False
+            self.state.end_drag()
+            self.on_change()
+            if self.on_drop is not None:
+                self.on_drop()
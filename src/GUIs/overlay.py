@@ -0,0 +1,102 @@
+"""This module contains the drawing of the robot poses on the planner window."""
+from typing import Sequence, Tuple
+
+import cv2
+import numpy as np
+
+BOX_COLOR: Tuple[int, int, int] = (0, 255, 0)
+SELECTED_COLOR: Tuple[int, int, int] = (255, 0, 255)
+COLLISION_COLOR: Tuple[int, int, int] = (0, 0, 255)
+OBSTACLE_COLOR: Tuple[int, int, int] = (0, 0, 255)
+FRONT_COLOR: Tuple[int, int, int] = (0, 0, 255)
+ANGLE_COLOR: Tuple[int, int, int] = (0, 0, 255)
+LABEL_COLOR: Tuple[int, int, int] = (0, 0, 0)
+LABEL_LINE_HEIGHT: int = 15
+LABEL_FONT_SCALE: float = 0.5
+
+
+def front_point(box: np.ndarray, large_motors_positive_direction: bool) -> Tuple[int, int]:
+    """Get the middle of the robot front side.
+
+    Parameters
+    ----------
+    box : np.ndarray
+        the robot box corners, with shape (4, 2)
+    large_motors_positive_direction : bool
+        if the LARGE motors positive movement is forward
+
+    Returns
+    -------
+    Tuple[int, int]
+        the front point
+    """
+    first, second = (0, 1) if large_motors_positive_direction else (2, 3)
+    return (
+        (int(box[first][0]) + int(box[second][0])) // 2,
+        (int(box[first][1]) + int(box[second][1])) // 2,
+    )
+
+
+def draw_robot(
+    image: np.ndarray,
+    box: np.ndarray,
+    labels: Sequence[str],
+    large_motors_positive_direction: bool,
+    box_color: Tuple[int, int, int] = BOX_COLOR,
+) -> None:
+    """Draw a robot pose with its labels.
+
+    Parameters
+    ----------
+    image : np.ndarray
+        the image to draw on
+    box : np.ndarray
+        the robot box corners in the image pixels, with shape (4, 2)
+    labels : Sequence[str]
+        the labels written under the top left corner, the first one is the angle
+    large_motors_positive_direction : bool
+        if the LARGE motors positive movement is forward
+    box_color : Tuple[int, int, int], optional
+        the box color, by default green
+    """
+    cv2.polylines(image, [box.astype(int)], True, box_color, 2)
+    corner_x, corner_y = int(box[0][0]), int(box[0][1])
+    for line, label in enumerate(labels):
+        cv2.putText(
+            image,
+            label,
+            (corner_x, corner_y + line * LABEL_LINE_HEIGHT),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            LABEL_FONT_SCALE,
+            ANGLE_COLOR if line == 0 else LABEL_COLOR,
+            1,
+        )
+    cv2.circle(image, front_point(box, large_motors_positive_direction), 5, FRONT_COLOR, -1)
+
+
+def draw_connector(
+    image: np.ndarray,
+    box: np.ndarray,
+    next_box: np.ndarray,
+    large_motors_positive_direction: bool,
+) -> None:
+    """Draw the line between the front points of two consecutive robot poses.
+
+    Parameters
+    ----------
+    image : np.ndarray
+        the image to draw on
+    box : np.ndarray
+        the first robot box corners in the image pixels, with shape (4, 2)
+    next_box : np.ndarray
+        the second robot box corners in the image pixels, with shape (4, 2)
+    large_motors_positive_direction : bool
+        if the LARGE motors positive movement is forward
+    """
+    cv2.line(
+        image,
+        front_point(box, large_motors_positive_direction),
+        front_point(next_box, large_motors_positive_direction),
+        FRONT_COLOR,
+        2,
+    )
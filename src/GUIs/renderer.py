@@ -0,0 +1,333 @@
+"""This module contains the layered renderer of the planner window."""
+from typing import List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from src.collision import ObstacleMask
+from src.GUIs.frame_metrics import FrameMetrics
+from src.GUIs.overlay import (
+    BOX_COLOR,
+    LABEL_COLOR,
+    LABEL_FONT_SCALE,
+    LABEL_LINE_HEIGHT,
+    OBSTACLE_COLOR,
+    SELECTED_COLOR,
+    draw_connector,
+    draw_robot,
+)
+from src.GUIs.viewport import ImagePyramid, Viewport
+
+Rectangle = Tuple[int, int, int, int]
+
+# pixels around a drawn pose covered by the line thickness and the front circle
+DRAWING_MARGIN: int = 8
+# window pixels around a box that may be covered by its labels
+LABELS_HEIGHT: int = 200
+HUD_BACKGROUND_COLOR: Tuple[int, int, int] = (255, 255, 255)
+HUD_FONT = cv2.FONT_HERSHEY_PLAIN
+# the weight of the obstacle color over the obstacles of the mat
+OBSTACLE_OPACITY: float = 0.4
+
+
+def _union(first: Optional[Rectangle], second: Optional[Rectangle]) -> Optional[Rectangle]:
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return (
+        min(first[0], second[0]),
+        min(first[1], second[1]),
+        max(first[2], second[2]),
+        max(first[3], second[3]),
+    )
+
+
+class PlannerRenderer:
+    """Layered renderer of the mat, the committed waypoints and the live robot.
+
+    The base layer is the visible mat with every committed waypoint, it is cached at
+    the window resolution and only rebuilt when the view changes. Committing a
+    waypoint draws it on the cached base layer, and moving a waypoint only redraws the
+    rectangles its pose and its connectors covered. The live robot is drawn on the
+    displayed frame, and on the next frame only the rectangle it covered is restored
+    from the base layer, so the frame cost does not grow with the path length.
+    """
+
+    def __init__(self, pyramid: ImagePyramid, viewport: Viewport):
+        """Class Constructor.
+
+        Parameters
+        ----------
+        pyramid : ImagePyramid
+            the mat image pyramid
+        viewport : Viewport
+            the viewport over the mat image
+        """
+        self.pyramid = pyramid
+        self.viewport = viewport
+        self.boxes: List[np.ndarray] = []
+        self.labels: List[Sequence[str]] = []
+        self.selected: Optional[int] = None
+        self.large_motors_positive_direction: bool = True
+        self._base: Optional[np.ndarray] = None
+        # the base layer without the waypoints, and the buffer the moved waypoints are
+        # redrawn on
+        self._mat: Optional[np.ndarray] = None
+        self._scratch: Optional[np.ndarray] = None
+        self._frame: Optional[np.ndarray] = None
+        self._base_version: Optional[int] = None
+        self._dirty: Optional[Rectangle] = None
+        self.obstacles: Optional[ObstacleMask] = None
+        self._obstacles_version: Optional[int] = None
+        self.metrics: Optional[FrameMetrics] = None
+
+    def _window_rectangle(self, rectangle: Rectangle) -> Optional[Rectangle]:
+        x0, y0, x1, y1 = rectangle
+        x0, y0 = max(x0, 0), max(y0, 0)
+        x1, y1 = min(x1, self.viewport.window_width), min(y1, self.viewport.window_height)
+        if x1 <= x0 or y1 <= y0:
+            return None
+        return x0, y0, x1, y1
+
+    def _pose_rectangle(self, box: np.ndarray, labels: Sequence[str]) -> Optional[Rectangle]:
+        """Get the window rectangle covered by a pose drawn at window coordinates."""
+        x0, y0 = np.floor(box.min(axis=0)).astype(int)
+        x1, y1 = np.ceil(box.max(axis=0)).astype(int)
+        corner_x, corner_y = int(box[0][0]), int(box[0][1])
+        for line, label in enumerate(labels):
+            (text_width, text_height), baseline = cv2.getTextSize(
+                label, cv2.FONT_HERSHEY_SIMPLEX, LABEL_FONT_SCALE, 1
+            )
+            text_y: int = corner_y + line * LABEL_LINE_HEIGHT
+            x0, x1 = min(x0, corner_x), max(x1, corner_x + text_width)
+            y0, y1 = min(y0, text_y - text_height), max(y1, text_y + baseline)
+        return self._window_rectangle(
+            (x0 - DRAWING_MARGIN, y0 - DRAWING_MARGIN, x1 + DRAWING_MARGIN, y1 + DRAWING_MARGIN)
+        )
+
+    def _draw_waypoint(self, index: int, image: Optional[np.ndarray] = None) -> Optional[Rectangle]:
+        """Draw a committed waypoint and its connector to the previous one on the base."""
+        if image is None:
+            image = self._base
+        box: np.ndarray = self.viewport.to_view(self.boxes[index])
+        draw_robot(
+            image,
+            box,
+            self.labels[index],
+            self.large_motors_positive_direction,
+            box_color=SELECTED_COLOR if index == self.selected else BOX_COLOR,
+        )
+        rectangle: Optional[Rectangle] = self._pose_rectangle(box, self.labels[index])
+        if index > 0:
+            previous_box: np.ndarray = self.viewport.to_view(self.boxes[index - 1])
+            draw_connector(image, previous_box, box, self.large_motors_positive_direction)
+            points = np.vstack([previous_box, box])
+            x0, y0 = np.floor(points.min(axis=0)).astype(int) - DRAWING_MARGIN
+            x1, y1 = np.ceil(points.max(axis=0)).astype(int) + DRAWING_MARGIN
+            rectangle = _union(rectangle, self._window_rectangle((x0, y0, x1, y1)))
+        return rectangle
+
+    def _draw_obstacles(self) -> None:
+        self._obstacles_version = self.obstacles.version
+        if self.obstacles.empty:
+            return
+        covered: np.ndarray = self.viewport.render_mask(self.obstacles.mask) != 0
+        self._base[covered] = (
+            self._base[covered] * (1 - OBSTACLE_OPACITY)
+            + np.array(OBSTACLE_COLOR) * OBSTACLE_OPACITY
+        ).astype(np.uint8)
+
+    def _waypoints_near(self, rectangle: Rectangle) -> np.ndarray:
+        """Get the waypoints whose drawing may cover a window rectangle, in order."""
+        if not self.boxes:
+            return np.zeros(0, dtype=int)
+        boxes: np.ndarray = self.viewport.to_view(np.stack(self.boxes))
+        low, high = boxes.min(axis=1), boxes.max(axis=1)
+        # a waypoint is drawn with its connector from the previous waypoint
+        low[1:], high[1:] = np.minimum(low[1:], low[:-1]), np.maximum(high[1:], high[:-1])
+        near = (high > np.array(rectangle[:2]) - LABELS_HEIGHT) & (
+            low < np.array(rectangle[2:]) + LABELS_HEIGHT
+        )
+        return np.flatnonzero(near.all(axis=1))
+
+    def _rebuild_base(self) -> None:
+        self._base = self.viewport.render(self.pyramid)
+        if self.obstacles is not None:
+            self._draw_obstacles()
+        self._mat = self._base.copy()
+        if self.metrics is not None:
+            self.metrics.lap("image")
+        # skip the waypoints out of the window
+        window: Rectangle = (0, 0, self.viewport.window_width, self.viewport.window_height)
+        for index in self._waypoints_near(window):
+            self._draw_waypoint(index)
+        if self.metrics is not None:
+            self.metrics.lap("waypoints")
+        self._base_version = self.viewport.version
+        self._frame = self._base.copy()
+        self._dirty = None
+        if self.metrics is not None:
+            self.metrics.lap("image")
+
+    def invalidate(self) -> None:
+        """Rebuild the base layer on the next frame."""
+        self._base_version = None
+
+    def set_waypoints(
+        self,
+        boxes: Sequence[np.ndarray],
+        labels: Sequence[Sequence[str]],
+        selected: Optional[int] = None,
+    ) -> None:
+        """Replace every committed waypoint.
+
+        Parameters
+        ----------
+        boxes : Sequence[np.ndarray]
+            the waypoints robot boxes in the mat image pixels
+        labels : Sequence[Sequence[str]]
+            the labels of every waypoint
+        selected : Optional[int], optional
+            the index of the highlighted waypoint, by default None
+        """
+        self.boxes = list(boxes)
+        self.labels = list(labels)
+        self.selected = selected
+        self.invalidate()
+
+    def add_waypoint(self, box: np.ndarray, labels: Sequence[str]) -> None:
+        """Commit a waypoint, drawing it on the cached base layer.
+
+        Parameters
+        ----------
+        box : np.ndarray
+            the waypoint robot box in the mat image pixels
+        labels : Sequence[str]
+            the waypoint labels
+        """
+        self.boxes.append(box)
+        self.labels.append(labels)
+        if self._base is not None and self._base_version == self.viewport.version:
+            self._dirty = _union(self._dirty, self._draw_waypoint(len(self.boxes) - 1))
+
+    def _moved_rectangle(self, index: int) -> Optional[Rectangle]:
+        """Get the window rectangle of a waypoint pose and of both its connectors."""
+        rectangle: Optional[Rectangle] = self._pose_rectangle(
+            self.viewport.to_view(self.boxes[index]), self.labels[index]
+        )
+        for end in (index, index + 1):
+            if 0 < end < len(self.boxes):
+                points: np.ndarray = self.viewport.to_view(np.vstack(self.boxes[end - 1 : end + 1]))
+                x0, y0 = np.floor(points.min(axis=0)).astype(int) - DRAWING_MARGIN
+                x1, y1 = np.ceil(points.max(axis=0)).astype(int) + DRAWING_MARGIN
+                rectangle = _union(rectangle, self._window_rectangle((x0, y0, x1, y1)))
+        return rectangle
+
+    def move_waypoint(self, index: int, box: np.ndarray) -> None:
+        """Move a committed waypoint, redrawing only the region it covered and covers.
+
+        The region is restored from the mat and the waypoints near it are drawn again
+        in order, so the result is the same as a full redraw.
+
+        Parameters
+        ----------
+        index : int
+            the waypoint index
+        box : np.ndarray
+            the new waypoint robot box in the mat image pixels
+        """
+        if self._base is None or self._base_version != self.viewport.version:
+            self.boxes[index] = box
+            return
+        previous: Optional[Rectangle] = self._moved_rectangle(index)
+        self.boxes[index] = box
+        region: Optional[Rectangle] = _union(previous, self._moved_rectangle(index))
+        if region is None:
+            return
+        x0, y0, x1, y1 = region
+        if self._scratch is None or self._scratch.shape != self._base.shape:
+            self._scratch = np.empty_like(self._base)
+        # the waypoints are drawn whole on the scratch buffer, only the region is kept
+        self._scratch[y0:y1, x0:x1] = self._mat[y0:y1, x0:x1]
+        for near in self._waypoints_near(region):
+            self._draw_waypoint(near, self._scratch)
+        self._base[y0:y1, x0:x1] = self._scratch[y0:y1, x0:x1]
+        self._dirty = _union(self._dirty, region)
+
+    def render(
+        self,
+        live_box: np.ndarray,
+        live_labels: Sequence[str],
+        large_motors_positive_direction: bool,
+        live_color: Tuple[int, int, int] = (0, 255, 0),
+    ) -> np.ndarray:
+        """Render the frame with the live robot.
+
+        Parameters
+        ----------
+        live_box : np.ndarray
+            the live robot box in the mat image pixels
+        live_labels : Sequence[str]
+            the live robot labels
+        large_motors_positive_direction : bool
+            if the LARGE motors positive movement is forward
+        live_color : Tuple[int, int, int], optional
+            the live robot box color, by default green
+
+        Returns
+        -------
+        np.ndarray
+            the window frame, it is reused by the next render
+        """
+        if large_motors_positive_direction != self.large_motors_positive_direction:
+            self.large_motors_positive_direction = large_motors_positive_direction
+            self.invalidate()
+        if self.obstacles is not None and self.obstacles.version != self._obstacles_version:
+            self.invalidate()
+        if self._base_version != self.viewport.version or self._base is None:
+            self._rebuild_base()
+        elif self._dirty is not None:
+            x0, y0, x1, y1 = self._dirty
+            self._frame[y0:y1, x0:x1] = self._base[y0:y1, x0:x1]
+            self._dirty = None
+            if self.metrics is not None:
+                self.metrics.lap("image")
+
+        box: np.ndarray = self.viewport.to_view(live_box)
+        draw_robot(
+            self._frame, box, live_labels, large_motors_positive_direction, box_color=live_color
+        )
+        self._dirty = self._pose_rectangle(box, live_labels)
+        if self.metrics is not None:
+            self.metrics.lap("robot")
+        return self._frame
+
+    def draw_hud(self, lines: Sequence[str]) -> None:
+        """Draw a text block at the top left corner of the last rendered frame.
+
+        Parameters
+        ----------
+        lines : Sequence[str]
+            the text lines
+        """
+        line_height: int = 14
+        width: int = (
+            max(cv2.getTextSize(line, HUD_FONT, 1, 1)[0][0] for line in lines) + 2 * DRAWING_MARGIN
+        )
+        rectangle = self._window_rectangle((0, 0, width, line_height * len(lines) + DRAWING_MARGIN))
+        if rectangle is None:
+            return
+        x0, y0, x1, y1 = rectangle
+        self._frame[y0:y1, x0:x1] = HUD_BACKGROUND_COLOR
+        for line_number, line in enumerate(lines):
+            cv2.putText(
+                self._frame,
+                line,
+                (DRAWING_MARGIN, (line_number + 1) * line_height),
+                HUD_FONT,
+                1,
+                LABEL_COLOR,
+                1,
+            )
+        self._dirty = _union(self._dirty, rectangle)
@@ -0,0 +1,253 @@
+"""This module contains the zoomable viewport over the mat image."""
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+BACKGROUND_COLOR: Tuple[int, int, int] = (35, 39, 45)
+
+
+class ImagePyramid:
+    """Multi-resolution levels of an image.
+
+    Every level halves the previous one, so any zoom level is rendered from a level
+    that is at most twice the display resolution.
+    """
+
+    def __init__(self, image: np.ndarray, min_size: int = 256):
+        """Class Constructor.
+
+        Parameters
+        ----------
+        image : np.ndarray
+            the full resolution image, it is the first level of the pyramid
+        min_size : int, optional
+            the smallest side of the coarsest level, by default 256
+        """
+        self.levels: List[np.ndarray] = [image]
+        while min(self.levels[-1].shape[:2]) // 2 >= min_size:
+            self.levels.append(cv2.pyrDown(self.levels[-1]))
+        image_height_y, image_width_x = image.shape[:2]
+        # the exact scale of each level, pyrDown rounds the odd sizes up
+        self.scales: List[Tuple[float, float]] = [
+            (level.shape[1] / image_width_x, level.shape[0] / image_height_y)
+            for level in self.levels
+        ]
+
+    def level_for(self, zoom: float) -> int:
+        """Get the coarsest level that still has at least the display resolution.
+
+        Parameters
+        ----------
+        zoom : float
+            the display pixels per full resolution pixel
+
+        Returns
+        -------
+        int
+            the level index
+        """
+        for index in range(len(self.levels) - 1, 0, -1):
+            if min(self.scales[index]) >= zoom:
+                return index
+        return 0
+
+
+class Viewport:
+    """Zoom and pan state of the window over the full resolution image.
+
+    Poses are always kept in full resolution image pixels, the viewport maps them to
+    window pixels and renders only the visible part of the image.
+    """
+
+    zoom_step: float = 1.25
+    pan_step: float = 0.2
+
+    def __init__(self, image_size: Tuple[int, int], window_size: Tuple[int, int]):
+        """Class Constructor.
+
+        Parameters
+        ----------
+        image_size : Tuple[int, int]
+            the full resolution image height and width
+        window_size : Tuple[int, int]
+            the window width and height
+        """
+        self.image_height_y, self.image_width_x = image_size
+        self.window_width, self.window_height = window_size
+        self.fit_zoom: float = min(
+            self.window_width / self.image_width_x, self.window_height / self.image_height_y
+        )
+        self.zoom: float = self.fit_zoom
+        self.center: np.ndarray = np.array([self.image_width_x / 2, self.image_height_y / 2])
+        self.version: int = 0
+
+    @property
+    def origin(self) -> np.ndarray:
+        """The image point at the top left corner of the window."""
+        return self.center - np.array([self.window_width, self.window_height]) / (2 * self.zoom)
+
+    def fit(self) -> None:
+        """Show the whole image."""
+        self.zoom = self.fit_zoom
+        self.center = np.array([self.image_width_x / 2, self.image_height_y / 2])
+        self.version += 1
+
+    def zoom_by(self, factor: float, anchor: Optional[np.ndarray] = None) -> None:
+        """Zoom in or out keeping an image point under the same window point.
+
+        Parameters
+        ----------
+        factor : float
+            the zoom factor, greater than 1 zooms in
+        anchor : Optional[np.ndarray], optional
+            the image point to keep in place, by default the window center
+        """
+        zoom: float = float(np.clip(self.zoom * factor, self.fit_zoom, 8.0))
+        if anchor is not None:
+            self.center = anchor + (self.center - anchor) * self.zoom / zoom
+        self.zoom = zoom
+        self._clamp()
+        self.version += 1
+
+    def zoom_in(self) -> None:
+        """Zoom in by one step."""
+        self.zoom_by(self.zoom_step)
+
+    def zoom_out(self) -> None:
+        """Zoom out by one step."""
+        self.zoom_by(1 / self.zoom_step)
+
+    def pan(self, dx: float, dy: float) -> None:
+        """Move the view by a fraction of the window size.
+
+        Parameters
+        ----------
+        dx : float
+            the horizontal steps, positive moves the view to the right
+        dy : float
+            the vertical steps, positive moves the view down
+        """
+        self.center = (
+            self.center
+            + np.array([dx * self.window_width, dy * self.window_height])
+            * self.pan_step
+            / self.zoom
+        )
+        self._clamp()
+        self.version += 1
+
+    def _clamp(self) -> None:
+        half_view = np.array([self.window_width, self.window_height]) / (2 * self.zoom)
+        image_size = np.array([self.image_width_x, self.image_height_y])
+        # keep the image in view, center it when it is smaller than the window
+        low = np.minimum(half_view, image_size / 2)
+        high = np.maximum(image_size - half_view, image_size / 2)
+        self.center = np.clip(self.center, low, high)
+
+    def visible_region(self) -> Tuple[int, int, int, int]:
+        """Get the visible region of the image.
+
+        Returns
+        -------
+        Tuple[int, int, int, int]
+            the (x0, y0, x1, y1) visible region in full resolution pixels, clipped to
+            the image
+        """
+        x0, y0 = np.floor(self.origin).astype(int)
+        x1 = int(np.ceil(x0 + self.window_width / self.zoom)) + 1
+        y1 = int(np.ceil(y0 + self.window_height / self.zoom)) + 1
+        return (
+            max(x0, 0),
+            max(y0, 0),
+            min(x1, self.image_width_x),
+            min(y1, self.image_height_y),
+        )
+
+    def to_view(self, points: np.ndarray) -> np.ndarray:
+        """Map full resolution image points to window points.
+
+        Parameters
+        ----------
+        points : np.ndarray
+            array of (x, y) image points, with shape (..., 2)
+
+        Returns
+        -------
+        np.ndarray
+            the window points, with the same shape
+        """
+        return (np.asarray(points, dtype=float) - self.origin) * self.zoom
+
+    def to_image(self, points: np.ndarray) -> np.ndarray:
+        """Map window points to full resolution image points.
+
+        Parameters
+        ----------
+        points : np.ndarray
+            array of (x, y) window points, with shape (..., 2)
+
+        Returns
+        -------
+        np.ndarray
+            the image points, with the same shape
+        """
+        return np.asarray(points, dtype=float) / self.zoom + self.origin
+
+    def render(self, pyramid: ImagePyramid) -> np.ndarray:
+        """Render the visible part of the image at the window resolution.
+
+        Only the window pixels are sampled, from the coarsest pyramid level that still
+        has the display resolution, so the cost depends on the window size only.
+
+        Parameters
+        ----------
+        pyramid : ImagePyramid
+            the pyramid of the image
+
+        Returns
+        -------
+        np.ndarray
+            the window image
+        """
+        index: int = pyramid.level_for(self.zoom)
+        return cv2.warpAffine(
+            pyramid.levels[index],
+            self._transform(*pyramid.scales[index]),
+            (self.window_width, self.window_height),
+            flags=cv2.INTER_LINEAR,
+            borderMode=cv2.BORDER_CONSTANT,
+            borderValue=BACKGROUND_COLOR,
+        )
+
+    def _transform(self, scale_x: float = 1.0, scale_y: float = 1.0) -> np.ndarray:
+        origin_x, origin_y = self.origin
+        # window = (level / level_scale - origin) * zoom
+        return np.array(
+            [
+                [self.zoom / scale_x, 0, -origin_x * self.zoom],
+                [0, self.zoom / scale_y, -origin_y * self.zoom],
+            ]
+        )
+
+    def render_mask(self, mask: np.ndarray) -> np.ndarray:
+        """Render the visible part of a full resolution mask at the window resolution.
+
+        Parameters
+        ----------
+        mask : np.ndarray
+            the mask, aligned with the image
+
+        Returns
+        -------
+        np.ndarray
+            the window mask, the nearest mask pixel is sampled
+        """
+        return cv2.warpAffine(
+            mask,
+            self._transform(),
+            (self.window_width, self.window_height),
+            flags=cv2.INTER_NEAREST,
+            borderMode=cv2.BORDER_CONSTANT,
+            borderValue=0,
+        )
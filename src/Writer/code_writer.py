@@ -100,10 +100,14 @@ sound = Sound()
         """Add a function to the code."""
         function_code = f"""
 def on_for_degrees_with_correction(
-    speed: int, degrees: int, brake: bool, block: bool, correction_factor: int = 0, kp={get_config("pid_constants.kp")}
+    speed: int, degrees: int, brake: bool, block: bool, correction_factor: int = 0, kp={get_config("pid_constants.kp")}, acceleration: int = 0
 ):
     motor{self.large_motors[0]}.reset()
     motor{self.large_motors[1]}.reset()
+    if acceleration:
+        # the ramps are the time from a stop to the max speed, reset clears them
+        for motor in (motor{self.large_motors[0]}, motor{self.large_motors[1]}):
+            motor.ramp_up_sp = motor.ramp_down_sp = int(1000 * motor.max_speed / acceleration)
     motor{self.large_motors[0]}.on_for_degrees(speed=SpeedDPS(speed), degrees=degrees, brake=brake, block=False)
     motor{self.large_motors[1]}.on_for_degrees(speed=SpeedDPS(speed), degrees=degrees, brake=brake, block=block)
     error{self.large_motors[0]} = 100
@@ -137,6 +141,18 @@ def on_for_degrees_with_correction(
                 motor{self.large_motors[1]}.stop()
     print('{self.large_motors[0]} = ' + str(motor{self.large_motors[0]}.position))
     print('{self.large_motors[1]} = ' + str(motor{self.large_motors[1]}.position))\n\n
+def arc_turn(speed: int, degrees: int, arc_degrees: int, brake: bool):
+    motor{self.large_motors[0]}.reset()
+    motor{self.large_motors[1]}.reset()
+    # the wheels drive different distances in the same time, the outer wheel at the speed
+    degrees{self.large_motors[0]} = degrees - arc_degrees / 2
+    degrees{self.large_motors[1]} = degrees + arc_degrees / 2
+    outer = max(abs(degrees{self.large_motors[0]}), abs(degrees{self.large_motors[1]}))
+    motor{self.large_motors[0]}.on_for_degrees(speed=SpeedDPS(speed * abs(degrees{self.large_motors[0]}) / outer), degrees=degrees{self.large_motors[0]}, brake=brake, block=False)
+    motor{self.large_motors[1]}.on_for_degrees(speed=SpeedDPS(speed * abs(degrees{self.large_motors[1]}) / outer), degrees=degrees{self.large_motors[1]}, brake=brake, block=True)
+    # the arc always blocks, the next command resets the wheels
+    motor{self.large_motors[0]}.wait_until_not_moving()
+    print('gyro angle: ' + str({self.gyro}.angle))\n\n
 def PID_turn(
     set_point: int,
     reset = False,
@@ -187,12 +203,23 @@ print({self.gyro}.angle)
                 block = False
 
             if i <= (len(points["angles_difference"]) - 1):
-                if points["action"][i] == "backward":
+                # the action of a step is stored on the waypoint it reaches
+                if points["action"][i + 1] == "backward":
                     points["distance_degrees"][i] = -1 * points["distance_degrees"][i]
 
-                if points["angles_difference"][i] == 0:
+                if points["action"][i + 1] == "arc":
+                    main_code += f"""
+arc_turn(speed={points['speed'][i]}, degrees={points['distance_degrees'][i]}, arc_degrees={points['arc_degrees'][i]}, brake=True)
+{self._write_medium_motors(medium_motors_list=self.medium_motors, path_dict=points, counter=i)}
+"""
+                elif points["angles_difference"][i] == 0:
+                    ramps: str = (
+                        f", acceleration={points['acceleration'][i]}"
+                        if points.get("acceleration") and points["acceleration"][i]
+                        else ""
+                    )
                     main_code += f"""
-on_for_degrees_with_correction(speed={points['speed'][i]}, degrees={points['distance_degrees'][i]}, brake=True, block={block}, kp={get_config("pid_constants.kp")})
+on_for_degrees_with_correction(speed={points['speed'][i]}, degrees={points['distance_degrees'][i]}, brake=True, block={block}, kp={get_config("pid_constants.kp")}{ramps})
 {self._write_medium_motors(medium_motors_list=self.medium_motors, path_dict=points, counter=i)}
 """
                 elif points["angles_difference"][i] != 0:
@@ -0,0 +1,153 @@
+"""This module contains the arc turns that replace the stops to turn between two moves."""
+import logging
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from src.configs import get_config
+from src.runtime_estimator import RobotModel, get_robot_model
+
+# the smallest arc radius in robot widths, the inner wheel still drives forward
+MIN_RADIUS_WIDTHS: float = 1.0
+
+
+class ArcGeometry(NamedTuple):
+    """The arc turns radius and the distance between the wheels in wheel degrees."""
+
+    radius_degrees: float
+    track_degrees: float
+
+
+def arc_turn_steps(path: np.ndarray) -> np.ndarray:
+    """Find the turns in place between two forward moves.
+
+    The additional motors of both waypoints of the turn must not run, they would run
+    at another place once the corner is cut.
+
+    Parameters
+    ----------
+    path : np.ndarray
+        the path, see path_creation.create_path_array
+
+    Returns
+    -------
+    np.ndarray
+        the steps that can be driven as arcs, with shape (N - 1,)
+    """
+    arcs: np.ndarray = np.zeros(max(len(path) - 1, 0), dtype=bool)
+    if len(path) < 4:
+        return arcs
+    steps: np.ndarray = path[:-1]
+    still: np.ndarray = (path["additional_motor_1"] == 0) & (path["additional_motor_2"] == 0)
+    # the action of a step is stored on the waypoint it reaches
+    arcs[1:-1] = (
+        (path["action"][2:-1] == "Rotate")
+        & (steps["angles_difference"][1:-1] != 0)
+        & (path["action"][1:-2] == "forward")
+        & (path["action"][3:] == "forward")
+        & (steps["distance_degrees"][:-2] > 0)
+        & (steps["distance_degrees"][2:] > 0)
+        & still[:-3]
+        & still[1:-2]
+    )
+    return arcs
+
+
+def apply_arc_turns(path: np.ndarray, geometry: ArcGeometry) -> np.ndarray:
+    """Replace the turns in place between two forward moves with arcs.
+
+    The arc is tangent to both moves, so they are shortened by the distance the arc
+    cuts off the corner. The radius is reduced on short moves, an arc takes at most
+    half of each move, and a turn too sharp for an arc of at least the smallest
+    radius is kept.
+
+    Parameters
+    ----------
+    path : np.ndarray
+        the path, see path_creation.create_path_array
+    geometry : ArcGeometry
+        the arcs radius and the distance between the wheels
+
+    Returns
+    -------
+    np.ndarray
+        a copy of the path, the arc steps action is arc, their distance is the robot
+        center distance and their arc_degrees the wheels distances difference
+    """
+    arced: np.ndarray = path.copy()
+    candidates: np.ndarray = np.flatnonzero(arc_turn_steps(path))
+    if not len(candidates):
+        return arced
+    steps: np.ndarray = arced[:-1]
+    turns: np.ndarray = np.radians(np.abs(steps["angles_difference"][candidates]))
+    tangent: np.ndarray = np.tan(turns / 2)
+    shortest: np.ndarray = np.minimum(
+        steps["distance_degrees"][candidates - 1], steps["distance_degrees"][candidates + 1]
+    )
+    radius: np.ndarray = np.minimum(geometry.radius_degrees, shortest / 2 / tangent)
+    wide: np.ndarray = radius >= MIN_RADIUS_WIDTHS * geometry.track_degrees
+    candidates, turns, tangent, radius = candidates[wide], turns[wide], tangent[wide], radius[wide]
+    cut: np.ndarray = np.rint(radius * tangent).astype(np.int64)
+
+    # the corner waypoints slide along the moves, back on the first and on along the second
+    points: np.ndarray = np.stack([arced["x"], arced["y"]], axis=1).astype(float)
+    for offset, row, sign in ((-1, candidates, -1), (1, candidates + 1, 1)):
+        move: np.ndarray = candidates + offset
+        pixels: np.ndarray = path["distance_pixels"][move]
+        direction: np.ndarray = (points[move + 1] - points[move]) / pixels[:, None]
+        # a move between two arcs is shortened twice, the slides use its full length
+        slide: np.ndarray = cut * pixels / path["distance_degrees"][move]
+        arced["x"][row] = np.rint(points[row, 0] + sign * slide * direction[:, 0])
+        arced["y"][row] = np.rint(points[row, 1] + sign * slide * direction[:, 1])
+        steps["distance_degrees"][move] -= cut
+    steps["distance_degrees"][candidates] = np.rint(radius * turns)
+    steps["arc_degrees"][candidates] = np.rint(
+        np.sign(steps["angles_difference"][candidates]) * geometry.track_degrees * turns
+    )
+    arced["action"][candidates + 1] = "arc"
+    arced["distance_pixels"][:-1] = np.hypot(np.diff(arced["x"]), np.diff(arced["y"]))
+    return arced
+
+
+def get_arc_geometry(model: RobotModel) -> Optional[ArcGeometry]:
+    """Get the arc turns geometry configured in the configurations file.
+
+    Parameters
+    ----------
+    model : RobotModel
+        the robot wheel diameter and distance between the wheels
+
+    Returns
+    -------
+    Optional[ArcGeometry]
+        the geometry, None when ``arc_turns.radius_mm`` is not set
+    """
+    try:
+        radius_mm: Optional[float] = get_config("arc_turns.radius_mm")
+    except KeyError:
+        return None
+    if not radius_mm:
+        return None
+    degrees_per_mm: float = 360 / (np.pi * model.wheel_diameter_mm)
+    return ArcGeometry(radius_mm * degrees_per_mm, model.track_width_mm * degrees_per_mm)
+
+
+def arc_path(path: np.ndarray) -> np.ndarray:
+    """Apply the configured arc turns to a path.
+
+    Parameters
+    ----------
+    path : np.ndarray
+        the path, see path_creation.create_path_array, after it is simplified
+
+    Returns
+    -------
+    np.ndarray
+        the path with arc turns, the path itself when there is no arc radius
+    """
+    geometry: Optional[ArcGeometry] = get_arc_geometry(get_robot_model())
+    if geometry is None:
+        return path
+    arced: np.ndarray = apply_arc_turns(path, geometry)
+    logging.info(f"{int((arced['action'] == 'arc').sum())} turns in place replaced with arcs")
+    return arced
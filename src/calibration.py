@@ -0,0 +1,159 @@
+"""This module contains the perspective calibration of the mat image."""
+import logging
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.configs import get_config
+
+logger = logging.getLogger(__name__)
+
+Points = Tuple[Tuple[float, float], ...]
+
+
+class MatCalibration:
+    """Homography between a perspective distorted mat photo and the mat plane.
+
+    The homography is computed once from four or more reference points, then whole
+    arrays of points are mapped with a single ``cv2.perspectiveTransform`` call.
+    """
+
+    def __init__(self, image_points: np.ndarray, mat_points: np.ndarray):
+        """Class Constructor.
+
+        Parameters
+        ----------
+        image_points : np.ndarray
+            the reference points on the mat image in pixels, with shape (N, 2), N >= 4
+        mat_points : np.ndarray
+            the matching reference points on the mat in mm, with shape (N, 2)
+
+        Raises
+        ------
+        ValueError
+            If less than four point pairs are given, or the points are degenerate.
+        """
+        import cv2
+
+        image_points = np.asarray(image_points, dtype=np.float64).reshape(-1, 2)
+        mat_points = np.asarray(mat_points, dtype=np.float64).reshape(-1, 2)
+        if len(image_points) < 4 or len(image_points) != len(mat_points):
+            raise ValueError(
+                "Calibration needs four or more image points and the same number of mat points."
+            )
+        homography, _ = cv2.findHomography(image_points, mat_points, 0)
+        if homography is None:
+            raise ValueError("Calibration points are degenerate, no homography was found.")
+        self.image_points: np.ndarray = image_points
+        self.mat_points: np.ndarray = mat_points
+        self.homography: np.ndarray = homography
+        self.inverse_homography: np.ndarray = np.linalg.inv(homography)
+
+    @staticmethod
+    def _transform(points: np.ndarray, homography: np.ndarray) -> np.ndarray:
+        import cv2
+
+        points = np.asarray(points, dtype=np.float64)
+        if points.size == 0:
+            return points
+        transformed = cv2.perspectiveTransform(points.reshape(-1, 1, 2), homography)
+        return transformed.reshape(points.shape)
+
+    def pixels_to_mm(self, points: np.ndarray) -> np.ndarray:
+        """Map points from the mat image to the mat plane.
+
+        Parameters
+        ----------
+        points : np.ndarray
+            array of (x, y) points in pixels, with shape (..., 2)
+
+        Returns
+        -------
+        np.ndarray
+            the points in mm, with the same shape
+        """
+        return self._transform(points, self.homography)
+
+    def mm_to_pixels(self, points: np.ndarray) -> np.ndarray:
+        """Map points from the mat plane to the mat image.
+
+        Parameters
+        ----------
+        points : np.ndarray
+            array of (x, y) points in mm, with shape (..., 2)
+
+        Returns
+        -------
+        np.ndarray
+            the points in pixels, with the same shape
+        """
+        return self._transform(points, self.inverse_homography)
+
+    def path_lengths_mm(self, points: np.ndarray) -> np.ndarray:
+        """Get the real world length of every segment of a path.
+
+        Parameters
+        ----------
+        points : np.ndarray
+            the path points in pixels, with shape (N, 2)
+
+        Returns
+        -------
+        np.ndarray
+            the N - 1 segment lengths in mm
+        """
+        points_mm = self.pixels_to_mm(np.asarray(points, dtype=np.float64).reshape(-1, 2))
+        return np.hypot(*np.diff(points_mm, axis=0).T)
+
+
+@lru_cache(maxsize=4)
+def _calibration(image_points: Points, mat_points: Points) -> MatCalibration:
+    logger.info(f"mat calibration image points: {image_points}, mat points: {mat_points}")
+    return MatCalibration(np.array(image_points), np.array(mat_points))
+
+
+def _as_points(points: Optional[list]) -> Optional[Points]:
+    if not points:
+        return None
+    return tuple((float(x), float(y)) for x, y in points)
+
+
+def get_mat_calibration() -> Optional[MatCalibration]:
+    """Get the calibration of the configured mat image.
+
+    The reference points are read from ``mat_calibration.image_points``, and are matched
+    with ``mat_calibration.mat_points``, which default to the mat corners starting from
+    the top left corner clockwise.
+
+    Returns
+    -------
+    Optional[MatCalibration]
+        the calibration, None when no calibration points are configured
+
+    Raises
+    ------
+    ValueError
+        If the calibration points are invalid.
+    """
+    try:
+        image_points: Optional[Points] = _as_points(get_config("mat_calibration.image_points"))
+    except KeyError:
+        return None
+    if image_points is None:
+        return None
+
+    try:
+        mat_points: Optional[Points] = _as_points(get_config("mat_calibration.mat_points"))
+    except KeyError:
+        mat_points = None
+    if mat_points is None:
+        mat_length_x = float(get_config("mat_dimensions.length_x"))
+        mat_width_y = float(get_config("mat_dimensions.width_y"))
+        mat_points = (
+            (0.0, 0.0),
+            (mat_length_x, 0.0),
+            (mat_length_x, mat_width_y),
+            (0.0, mat_width_y),
+        )
+    return _calibration(image_points, mat_points)
@@ -0,0 +1,212 @@
+"""This module contains the collision checking of the robot against the mat obstacles."""
+import logging
+import os
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from src.configs import get_config
+
+DEFAULT_OBSTACLE_MASK_PATH: str = os.path.join(
+    Path(__file__).parent.parent, ".cache", "obstacles.png"
+)
+DEFAULT_BRUSH_RADIUS: int = 10
+# the mask image pixels brighter than the threshold are obstacles
+OBSTACLE_THRESHOLD: int = 127
+OBSTACLE_VALUE: int = 255
+
+
+class ObstacleMask:
+    """Obstacles of the mat, a mask aligned with the mat image.
+
+    A footprint is checked by rasterizing its polygon into a patch of its bounding
+    rectangle only, so the cost depends on the robot size and not on the mat size.
+    """
+
+    def __init__(self, image_size: Tuple[int, int], mask: Optional[np.ndarray] = None):
+        """Class Constructor.
+
+        Parameters
+        ----------
+        image_size : Tuple[int, int]
+            the mat image height and width
+        mask : Optional[np.ndarray], optional
+            the obstacles, nonzero pixels are obstacles, by default no obstacle
+        """
+        self.mask: np.ndarray = np.zeros(image_size, dtype=np.uint8)
+        if mask is not None:
+            self.mask[np.asarray(mask) != 0] = OBSTACLE_VALUE
+        self.empty: bool = not self.mask.any()
+        self.modified: bool = False
+        self.version: int = 0
+
+    @classmethod
+    def load(cls, path: str, image_size: Tuple[int, int]) -> "ObstacleMask":
+        """Read the obstacles from a black and white image, white pixels are obstacles.
+
+        Parameters
+        ----------
+        path : str
+            the mask image path, the image is stretched to the mat image size
+        image_size : Tuple[int, int]
+            the mat image height and width
+
+        Returns
+        -------
+        ObstacleMask
+            the obstacles
+
+        Raises
+        ------
+        FileExistsError
+            when path is not for a image file
+        TypeError
+            when the image is not readable
+        """
+        if not os.path.isfile(path):
+            raise FileExistsError(f"No image file found at {path}")
+        image: Optional[np.ndarray] = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+        if image is None:
+            raise TypeError("image not readable")
+        if image.shape != tuple(image_size):
+            image = cv2.resize(
+                image, (image_size[1], image_size[0]), interpolation=cv2.INTER_NEAREST
+            )
+        return cls(image_size, image > OBSTACLE_THRESHOLD)
+
+    def save(self, path: str) -> None:
+        """Write the obstacles as a black and white image.
+
+        Parameters
+        ----------
+        path : str
+            the mask image path
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        cv2.imwrite(path, self.mask)
+        self.modified = False
+
+    def paint(self, point: Sequence[float], radius: int, obstacle: bool = True) -> None:
+        """Paint or erase a disk of obstacles.
+
+        Parameters
+        ----------
+        point : Sequence[float]
+            the disk center in the mat image pixels
+        radius : int
+            the disk radius in pixels
+        obstacle : bool, optional
+            paint obstacles, False erases them, by default True
+        """
+        center: Tuple[int, int] = tuple(np.round(point).astype(int))
+        cv2.circle(self.mask, center, radius, OBSTACLE_VALUE if obstacle else 0, -1)
+        self.empty = self.empty and not obstacle
+        self.modified = True
+        self.version += 1
+
+    def hits(self, polygon: np.ndarray) -> bool:
+        """Check if a convex polygon covers an obstacle.
+
+        Parameters
+        ----------
+        polygon : np.ndarray
+            the polygon corners in the mat image pixels, with shape (corners, 2)
+
+        Returns
+        -------
+        bool
+            True when an obstacle pixel is inside the polygon, the parts out of the
+            mat are not checked
+        """
+        if self.empty:
+            return False
+        height, width = self.mask.shape
+        x0, y0 = np.maximum(np.floor(polygon.min(axis=0)).astype(int), 0)
+        x1, y1 = np.ceil(polygon.max(axis=0)).astype(int) + 1
+        x1, y1 = min(x1, width), min(y1, height)
+        if x0 >= x1 or y0 >= y1:
+            return False
+        obstacles: np.ndarray = self.mask[y0:y1, x0:x1]
+        if not obstacles.any():
+            return False
+        footprint: np.ndarray = np.zeros_like(obstacles)
+        corners: np.ndarray = np.round(polygon - (x0, y0)).astype(np.int32)
+        cv2.fillConvexPoly(footprint, corners, 1)
+        return bool(np.any(obstacles[footprint != 0]))
+
+    def sweep_hits(self, boxes: Sequence[np.ndarray]) -> bool:
+        """Check if a robot moving through poses covers an obstacle.
+
+        The area swept between two consecutive poses is their convex hull, which
+        covers a translation exactly and a small rotation closely.
+
+        Parameters
+        ----------
+        boxes : Sequence[np.ndarray]
+            the robot boxes in order, every box with shape (4, 2)
+
+        Returns
+        -------
+        bool
+            True when an obstacle pixel is inside a pose or between two poses
+        """
+        if self.empty:
+            return False
+        if len(boxes) == 1:
+            return self.hits(np.asarray(boxes[0], dtype=float))
+        for previous_box, box in zip(boxes[:-1], boxes[1:]):
+            points: np.ndarray = np.vstack([previous_box, box]).astype(np.float32)
+            if self.hits(cv2.convexHull(points).reshape(-1, 2)):
+                return True
+        return False
+
+
+def obstacle_mask_path() -> str:
+    """Get the obstacles mask image path.
+
+    Returns
+    -------
+    str
+        the configured ``obstacles.mask_path``, by default .cache/obstacles.png
+    """
+    try:
+        return get_config("obstacles.mask_path") or DEFAULT_OBSTACLE_MASK_PATH
+    except KeyError:
+        return DEFAULT_OBSTACLE_MASK_PATH
+
+
+def obstacle_brush_radius() -> int:
+    """Get the radius of the obstacles brush.
+
+    Returns
+    -------
+    int
+        the configured ``obstacles.brush_radius`` in mat image pixels, by default 10
+    """
+    try:
+        return int(get_config("obstacles.brush_radius") or DEFAULT_BRUSH_RADIUS)
+    except KeyError:
+        return DEFAULT_BRUSH_RADIUS
+
+
+def get_obstacle_mask(image_size: Tuple[int, int]) -> ObstacleMask:
+    """Get the obstacles of the mat.
+
+    Parameters
+    ----------
+    image_size : Tuple[int, int]
+        the mat image height and width
+
+    Returns
+    -------
+    ObstacleMask
+        the obstacles read from the obstacles mask image, no obstacle when there is no
+        image
+    """
+    path: str = obstacle_mask_path()
+    if not os.path.isfile(path):
+        return ObstacleMask(image_size)
+    logging.info(f"obstacles read from {path}")
+    return ObstacleMask.load(path, image_size)
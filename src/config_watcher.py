@@ -0,0 +1,209 @@
+"""This module contains the configurations file watcher."""
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+from typing import Callable, Optional
+
+from src.configs import ConfigStore, changed_configs, config_store
+
+logger = logging.getLogger(__name__)
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY: int = 0x00000002
+IN_CLOSE_WRITE: int = 0x00000008
+IN_MOVED_TO: int = 0x00000080
+IN_CREATE: int = 0x00000100
+IN_NONBLOCK: int = 0o4000
+IN_CLOEXEC: int = 0o2000000
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+def _inotify_watch(directory: str) -> Optional[int]:
+    """Open an inotify descriptor watching the writes inside a directory.
+
+    Parameters
+    ----------
+    directory : str
+        the directory to watch, watching the directory instead of the file keeps the
+        watch alive when editors replace the file on save.
+
+    Returns
+    -------
+    Optional[int]
+        the inotify file descriptor, None when inotify is not available
+    """
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        inotify_fd: int = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if inotify_fd < 0:
+            return None
+        mask: int = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(inotify_fd, os.fsencode(directory), mask) < 0:
+            os.close(inotify_fd)
+            return None
+    except (OSError, AttributeError):
+        return None
+    return inotify_fd
+
+
+class ConfigWatcher:
+    """Reload the configurations file in the background whenever it changes.
+
+    The watcher uses inotify where available and falls back to polling the file
+    signature. Bursts of writes are debounced into a single reload, and the callback is
+    only called, from the watcher thread, when at least one configuration changed.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[set], None],
+        store: ConfigStore = config_store,
+        debounce: float = 0.25,
+        poll_interval: float = 0.5,
+    ):
+        """Class Constructor.
+
+        Parameters
+        ----------
+        callback : Callable[[set], None]
+            called with the dotted paths of the changed configurations after a reload
+        store : ConfigStore, optional
+            the configurations store to reload, by default the project store
+        debounce : float, optional
+            seconds without writes before reloading, by default 0.25
+        poll_interval : float, optional
+            seconds between signature checks when inotify is not available,
+            by default 0.5
+        """
+        self.callback = callback
+        self.store = store
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.reloads: int = 0
+        self._tree: dict = {}
+        self._watched_signature: Optional[tuple] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._inotify_fd: Optional[int] = None
+
+    @property
+    def uses_inotify(self) -> bool:
+        """Whether the watcher is driven by inotify events."""
+        return self._inotify_fd is not None
+
+    def start(self) -> "ConfigWatcher":
+        """Start watching the configurations file.
+
+        Returns
+        -------
+        ConfigWatcher
+            the watcher itself
+        """
+        if self._thread is not None:
+            return self
+        self._tree = self.store.tree()
+        self._watched_signature = self._signature()
+        self._inotify_fd = _inotify_watch(os.path.dirname(os.path.abspath(self.store.path)))
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._watch_events if self.uses_inotify else self._watch_polling,
+            name="config-watcher",
+            daemon=True,
+        )
+        self._thread.start()
+        logger.info(
+            f"watching {self.store.path} using {'inotify' if self.uses_inotify else 'polling'}"
+        )
+        return self
+
+    def stop(self) -> None:
+        """Stop watching the configurations file."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._inotify_fd is not None:
+            os.close(self._inotify_fd)
+            self._inotify_fd = None
+
+    def __enter__(self) -> "ConfigWatcher":
+        """Start the watcher on entering the context."""
+        return self.start()
+
+    def __exit__(self, *_) -> None:
+        """Stop the watcher on leaving the context."""
+        self.stop()
+
+    def _signature(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self.store.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read_events(self) -> bool:
+        """Drain the inotify descriptor, return whether the configurations file changed."""
+        file_name: bytes = os.fsencode(os.path.basename(self.store.path))
+        changed: bool = False
+        while True:
+            try:
+                buffer: bytes = os.read(self._inotify_fd, 4096)
+            except BlockingIOError:
+                return changed
+            offset: int = 0
+            while offset < len(buffer):
+                _, _, _, name_length = INOTIFY_EVENT.unpack_from(buffer, offset)
+                offset += INOTIFY_EVENT.size
+                name: bytes = buffer[offset : offset + name_length].rstrip(b"\0")
+                offset += name_length
+                changed = changed or name == file_name
+
+    def _watch_events(self) -> None:
+        pending: bool = False
+        while not self._stop.is_set():
+            timeout: float = self.debounce if pending else self.poll_interval
+            readable, _, _ = select.select([self._inotify_fd], [], [], timeout)
+            if readable:
+                pending = self._read_events() or pending
+            elif pending:
+                pending = False
+                self._reload()
+
+    def _watch_polling(self) -> None:
+        signature = self._watched_signature
+        while not self._stop.wait(self.poll_interval):
+            current_signature = self._signature()
+            if current_signature == signature:
+                continue
+            # wait for the writes to settle before reloading
+            signature = current_signature
+            while not self._stop.wait(self.debounce):
+                current_signature = self._signature()
+                if current_signature == signature:
+                    self._reload()
+                    break
+                signature = current_signature
+
+    def _reload(self) -> None:
+        try:
+            tree: dict = self.store.reload()
+        except Exception as e:
+            logger.error(f"unable to reload {self.store.path}: {e}")
+            return
+        changed: set = changed_configs(self._tree, tree)
+        self._tree = tree
+        self.reloads += 1
+        if not changed:
+            return
+        logger.info(f"configurations changed: {sorted(changed)}")
+        try:
+            self.callback(changed)
+        except Exception as e:
+            logger.error(f"unable to apply the changed configurations: {e}")
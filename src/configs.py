@@ -1,15 +1,27 @@
 """This module contains the configs functions."""
+import copy
 import os
+import threading
+from collections import namedtuple
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional, Tuple
 
 import yaml
 
+CONFIGS_PATH: str = os.path.join(Path(__file__).parent.parent, "configurations.yaml")
 
-def load_yaml() -> dict:
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "loads", "entries"])
+
+
+def load_yaml(yaml_path: str = CONFIGS_PATH) -> dict:
     """
     Load yaml file into memory.
 
+    Parameters
+    ----------
+    yaml_path : str, optional
+        the configurations file path, by default the project configurations.yaml
+
     Returns
     -------
     dict
@@ -20,7 +32,6 @@ def load_yaml() -> dict:
     FileNotFoundError
         If no configurations.yaml file found on project path.
     """
-    yaml_path: str = os.path.join(Path(__file__).parent.parent, "configurations.yaml")
     if not os.path.isfile(yaml_path):
         raise FileNotFoundError("No configurations.yaml found on project path")
 
@@ -30,6 +41,181 @@ def load_yaml() -> dict:
     return cfgs_dict if cfgs_dict else {}
 
 
+def _flatten(tree: dict, prefix: str = "") -> dict:
+    """Flatten a nested configurations dictionary into dotted paths.
+
+    Parameters
+    ----------
+    tree : dict
+        the nested configurations dictionary
+    prefix : str, optional
+        the dotted path of ``tree`` itself, by default ""
+
+    Returns
+    -------
+    dict
+        every section and value of ``tree`` keyed by its dotted path
+    """
+    flat: dict = {}
+    for key, value in tree.items():
+        path: str = f"{prefix}{key}"
+        flat[path] = value
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{path}."))
+    return flat
+
+
+def changed_configs(old_tree: dict, new_tree: dict) -> set:
+    """Get the dotted paths of the configurations that differ between two trees.
+
+    Parameters
+    ----------
+    old_tree : dict
+        the configurations dictionary before the change
+    new_tree : dict
+        the configurations dictionary after the change
+
+    Returns
+    -------
+    set
+        dotted paths of the added, removed and modified configurations
+    """
+    missing = object()
+    old_flat: dict = _flatten(old_tree)
+    new_flat: dict = _flatten(new_tree)
+    return {
+        path
+        for path in old_flat.keys() | new_flat.keys()
+        if old_flat.get(path, missing) != new_flat.get(path, missing)
+    }
+
+
+class ConfigStore:
+    """Parsed configurations served from memory.
+
+    The configurations file is parsed once and flattened into a dictionary keyed by
+    the dotted configuration path, so every lookup is a single dictionary access.
+    The file is only parsed again when its modification time or size changes.
+    """
+
+    def __init__(self, path: str = CONFIGS_PATH):
+        """Class Constructor.
+
+        Parameters
+        ----------
+        path : str, optional
+            the configurations file path, by default the project configurations.yaml
+        """
+        self.path = path
+        self.hits: int = 0
+        self.misses: int = 0
+        self.loads: int = 0
+        self._lock = threading.Lock()
+        self._loaded: bool = False
+        self._signature: Optional[Tuple[int, int]] = None
+        self._tree: dict = {}
+        self._flat: dict = {}
+
+    def _stat_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self, signature: Optional[Tuple[int, int]]) -> None:
+        tree: dict = load_yaml(self.path)
+        self._tree = tree
+        self._flat = _flatten(tree)
+        self._signature = signature
+        self._loaded = True
+        self.loads += 1
+
+    def _current(self) -> Tuple[dict, dict]:
+        signature = self._stat_signature()
+        with self._lock:
+            if self._loaded and signature == self._signature:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self._load(signature)
+            return self._tree, self._flat
+
+    def tree(self) -> dict:
+        """Get the parsed configurations, parsing the file again if it changed.
+
+        Returns
+        -------
+        dict
+            the configurations dictionary, shared with the store, it must not be mutated
+        """
+        return self._current()[0]
+
+    def get(self, config_name: str) -> Any:
+        """Get a configuration by its dotted path.
+
+        Parameters
+        ----------
+        config_name : str
+            The configuration name, nested names are separated by dots.
+
+        Returns
+        -------
+        Any
+            The configuration value, a copy for sections and lists.
+
+        Raises
+        ------
+        KeyError
+            If configuration name not found in configurations.yaml file.
+        """
+        _, flat = self._current()
+        try:
+            value: Any = flat[config_name]
+        except KeyError:
+            raise KeyError(
+                f"Configuration name {config_name} not found in configurations.yaml file"
+            ) from None
+        # the sections and lists are shared with the store, the caller gets its own
+        return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+
+    def reload(self) -> dict:
+        """Parse the configurations file regardless of its signature.
+
+        Returns
+        -------
+        dict
+            the configurations dictionary
+        """
+        signature = self._stat_signature()
+        with self._lock:
+            self.misses += 1
+            self._load(signature)
+            return self._tree
+
+    def invalidate(self) -> None:
+        """Drop the parsed configurations, the next lookup parses the file again."""
+        with self._lock:
+            self._loaded = False
+            self._signature = None
+            self._tree = {}
+            self._flat = {}
+
+    def cache_info(self) -> CacheInfo:
+        """Get the cache counters.
+
+        Returns
+        -------
+        CacheInfo
+            lookups served from memory, lookups that parsed the file, total parses and
+            number of indexed configuration paths.
+        """
+        return CacheInfo(self.hits, self.misses, self.loads, len(self._flat))
+
+
+config_store = ConfigStore()
+
+
 def get_config(config_name: str) -> Any:
     """
     Get specific configuration from configurations.yaml file.
@@ -49,13 +235,4 @@ def get_config(config_name: str) -> Any:
     KeyError
         If configuration name not found in configurations.yaml file.
     """
-    cfgs_dict: dict = load_yaml()
-
-    if "." in config_name:
-        config_name_list: list = config_name.split(".")
-        return cfgs_dict[config_name_list[0]][config_name_list[-1]]
-
-    if config_name not in cfgs_dict:
-        raise KeyError(f"Configuration name {config_name} not found in configurations.yaml file")
-
-    return cfgs_dict[config_name]
+    return config_store.get(config_name)
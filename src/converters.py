@@ -1,10 +1,14 @@
 """This module contains the units converters."""
 import os
-from typing import Tuple
+from functools import lru_cache
+from typing import Tuple, Union
 
-import cv2
+import numpy as np
 
 from src.configs import get_config
+from src.image_reader import read_image_size
+
+ArrayLike = Union[float, int, np.ndarray, list, tuple]
 
 
 def extract_image_dims() -> Tuple[Tuple[int, int], Tuple[int, int]]:
@@ -29,8 +33,7 @@ def extract_image_dims() -> Tuple[Tuple[int, int], Tuple[int, int]]:
         raise FileNotFoundError("Mat image not found.")
 
     try:
-        mat_image_array = cv2.imread(mat_image_path)
-        image_height_y, image_width_x, _ = mat_image_array.shape
+        image_height_y, image_width_x = read_image_size(mat_image_path)
         mat_length_y = int(get_config("mat_dimensions.width_y"))
         mat_width_x = int(get_config("mat_dimensions.length_x"))
         return (image_height_y, image_width_x), (mat_width_x, mat_length_y)
@@ -38,6 +41,145 @@ def extract_image_dims() -> Tuple[Tuple[int, int], Tuple[int, int]]:
         raise e
 
 
+class MatGeometry:
+    """Precomputed ratios between the mat image pixels and the mat millimetres.
+
+    The ratios are computed once per mat image and mat dimensions, every converter
+    accepts scalars as well as arrays and converts them with a single vector operation.
+    """
+
+    def __init__(self, image_dims: Tuple[int, int], mat_dims: Tuple[int, int]):
+        """Class Constructor.
+
+        Parameters
+        ----------
+        image_dims : Tuple[int, int]
+            the image height (y-axis) and width (x-axis) in pixels
+        mat_dims : Tuple[int, int]
+            the mat length (x-axis) and width (y-axis) in mm
+        """
+        image_height_y, image_width_x = image_dims
+        mat_width_x, mat_length_y = mat_dims
+        self.image_dims: Tuple[int, int] = (image_height_y, image_width_x)
+        self.mat_dims: Tuple[int, int] = (mat_width_x, mat_length_y)
+        # per axis ratios ordered as (x, y) to match the points coordinates
+        self.px_per_mm: np.ndarray = np.array(
+            [image_width_x / mat_width_x, image_height_y / mat_length_y]
+        )
+        self.mm_per_px: np.ndarray = np.array(
+            [mat_width_x / image_width_x, mat_length_y / image_height_y]
+        )
+        self.averaged_px_per_mm: float = float(self.px_per_mm.mean())
+        self.averaged_mm_per_px: float = float(self.mm_per_px.mean())
+
+    def mm_to_pixel(self, mm: ArrayLike) -> np.ndarray:
+        """Convert distances from mm to pixel using the averaged ratio.
+
+        Parameters
+        ----------
+        mm : ArrayLike
+            the input mm distances
+
+        Returns
+        -------
+        np.ndarray
+            the output pixel distances
+        """
+        return np.asarray(mm, dtype=float) * self.averaged_px_per_mm
+
+    def pixel_to_mm(self, pixel: ArrayLike) -> np.ndarray:
+        """Convert distances from pixel to mm using the averaged ratio.
+
+        Parameters
+        ----------
+        pixel : ArrayLike
+            the input pixel distances
+
+        Returns
+        -------
+        np.ndarray
+            the output mm distances
+        """
+        return np.asarray(pixel, dtype=float) * self.averaged_mm_per_px
+
+    def stud_to_pixel(self, stud: ArrayLike) -> np.ndarray:
+        """Convert distances from stud to whole pixels.
+
+        Parameters
+        ----------
+        stud : ArrayLike
+            the input stud distances
+
+        Returns
+        -------
+        np.ndarray
+            the output pixel distances
+        """
+        return self.mm_to_pixel(stud_to_mm(np.asarray(stud))).astype(int)
+
+    def pixel_to_stud(self, pixel: ArrayLike) -> np.ndarray:
+        """Convert distances from pixel to whole studs.
+
+        Parameters
+        ----------
+        pixel : ArrayLike
+            the input pixel distances
+
+        Returns
+        -------
+        np.ndarray
+            the output stud distances
+        """
+        return (self.pixel_to_mm(pixel) / 8).astype(int)
+
+    def points_mm_to_pixel(self, points: ArrayLike) -> np.ndarray:
+        """Convert points from mat mm to image pixels using the per axis ratios.
+
+        Parameters
+        ----------
+        points : ArrayLike
+            array of (x, y) points in mm, with shape (..., 2)
+
+        Returns
+        -------
+        np.ndarray
+            the points in pixels, with the same shape
+        """
+        return np.asarray(points, dtype=float) * self.px_per_mm
+
+    def points_pixel_to_mm(self, points: ArrayLike) -> np.ndarray:
+        """Convert points from image pixels to mat mm using the per axis ratios.
+
+        Parameters
+        ----------
+        points : ArrayLike
+            array of (x, y) points in pixels, with shape (..., 2)
+
+        Returns
+        -------
+        np.ndarray
+            the points in mm, with the same shape
+        """
+        return np.asarray(points, dtype=float) * self.mm_per_px
+
+
+@lru_cache(maxsize=8)
+def _mat_geometry(image_dims: Tuple[int, int], mat_dims: Tuple[int, int]) -> MatGeometry:
+    return MatGeometry(image_dims, mat_dims)
+
+
+def get_mat_geometry() -> MatGeometry:
+    """Get the geometry of the configured mat image.
+
+    Returns
+    -------
+    MatGeometry
+        the geometry, shared by every call with the same mat image and dimensions
+    """
+    image_dims, mat_dims = extract_image_dims()
+    return _mat_geometry(image_dims, mat_dims)
+
+
 def stud_to_mm(stud: int) -> float:
     """Convert stud to mm.
 
@@ -80,13 +222,7 @@ def mm_to_pixel(mm: float) -> float:
     float
         the output pixel
     """
-    image_dims, mat_dims = extract_image_dims()
-    image_height_y, image_width_x = image_dims
-    mat_width_x, mat_length_y = mat_dims
-    x_ratio: float = image_width_x / mat_width_x
-    y_ratio: float = image_height_y / mat_length_y
-    averaged_ratio: float = (x_ratio + y_ratio) / 2.0
-    return float(mm * averaged_ratio)
+    return float(get_mat_geometry().mm_to_pixel(mm))
 
 
 def pixel_to_mm(pixel: int) -> float:
@@ -101,13 +237,7 @@ def pixel_to_mm(pixel: int) -> float:
     float
         the output mm
     """
-    image_dims, mat_dims = extract_image_dims()
-    image_height_y, image_width_x = image_dims
-    mat_width_x, mat_length_y = mat_dims
-    x_ratio: float = mat_width_x / image_width_x
-    y_ratio: float = mat_length_y / image_height_y
-    averaged_ratio: float = (x_ratio + y_ratio) / 2.0
-    return float(pixel / averaged_ratio)
+    return float(get_mat_geometry().pixel_to_mm(pixel))
 
 
 def stud_to_pixel(stud: int) -> int:
@@ -137,4 +267,4 @@ def pixel_to_stud(pixel: int) -> int:
     int
         the output stud
     """
-    return int(mm_to_stud(pixel_to_mm(pixel)))
+    return int(get_mat_geometry().pixel_to_stud(pixel))
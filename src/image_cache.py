@@ -0,0 +1,179 @@
+"""This module contains the decoded images cache."""
+import hashlib
+import logging
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from src.configs import get_config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIRECTORY: str = os.path.join(Path(__file__).parent.parent, ".cache", "images")
+DEFAULT_MAX_SIZE_MB: int = 1024
+HASH_CHUNK_SIZE: int = 1 << 20
+
+
+@lru_cache(maxsize=64)
+def _content_hash(path: str, mtime_ns: int, size: int) -> str:
+    """Hash the file content, once per file version.
+
+    Parameters
+    ----------
+    path : str
+        the file path
+    mtime_ns : int
+        the file modification time, part of the cache key
+    size : int
+        the file size in bytes, part of the cache key
+
+    Returns
+    -------
+    str
+        the hexadecimal content hash
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as image_file:
+        for chunk in iter(lambda: image_file.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ImageCache:
+    """Decoded images stored as uncompressed ``.npy`` files.
+
+    The decoded BGR array of every image is stored under the hash of the image file
+    content, later loads memory map the stored array instead of decoding the image.
+    The least recently used arrays are removed once the cache exceeds its size cap.
+    """
+
+    def __init__(
+        self, directory: str = DEFAULT_CACHE_DIRECTORY, max_size_mb: float = DEFAULT_MAX_SIZE_MB
+    ):
+        """Class Constructor.
+
+        Parameters
+        ----------
+        directory : str, optional
+            the cache directory, by default ``.cache/images`` in the project directory
+        max_size_mb : float, optional
+            the maximum size of the cache directory in MB, by default 1024
+        """
+        self.directory = directory
+        self.max_size_bytes: int = int(max_size_mb * 1024 * 1024)
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def _array_path(self, path: str) -> str:
+        stat = os.stat(path)
+        key: str = _content_hash(os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+        return os.path.join(self.directory, f"{key}.npy")
+
+    def load(self, path: str) -> Optional[np.ndarray]:
+        """Load the decoded image.
+
+        Parameters
+        ----------
+        path : str
+            the image path
+
+        Returns
+        -------
+        Optional[np.ndarray]
+            the read-only BGR image, None when the image is not readable
+        """
+        array_path: str = self._array_path(path)
+        try:
+            image: np.ndarray = np.load(array_path, mmap_mode="r")
+        except (OSError, ValueError):
+            pass
+        else:
+            self.hits += 1
+            # the modification time of the stored array tracks its last use
+            os.utime(array_path)
+            return image
+
+        self.misses += 1
+        import cv2
+
+        image = cv2.imread(path)
+        if image is None:
+            return None
+        try:
+            self._store(array_path, image)
+        except OSError as e:
+            logger.warning(f"unable to cache the decoded image {path}: {e}")
+            return image
+        self.evict()
+        return np.load(array_path, mmap_mode="r")
+
+    def _store(self, array_path: str, image: np.ndarray) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as array_file:
+                np.save(array_file, image)
+            os.replace(temporary_path, array_path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+    def entries(self) -> List[Tuple[float, int, str]]:
+        """List the stored arrays.
+
+        Returns
+        -------
+        List[Tuple[float, int, str]]
+            the last use time, size and path of every stored array, least recently used
+            first
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        entries: List[Tuple[float, int, str]] = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".npy"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return sorted(entries)
+
+    def evict(self) -> None:
+        """Remove the least recently used arrays until the cache fits its size cap."""
+        entries: List[Tuple[float, int, str]] = self.entries()
+        total_size: int = sum(size for _, size, _ in entries)
+        # the most recently used array is kept even when it is larger than the cap
+        for _, size, array_path in entries[:-1]:
+            if total_size <= self.max_size_bytes:
+                break
+            try:
+                os.remove(array_path)
+            except OSError:
+                continue
+            total_size -= size
+            logger.info(f"evicted {array_path} from the images cache")
+
+
+@lru_cache(maxsize=1)
+def _image_cache(directory: str, max_size_mb: float) -> ImageCache:
+    return ImageCache(directory, max_size_mb)
+
+
+def get_image_cache() -> ImageCache:
+    """Get the images cache configured in the configurations file.
+
+    Returns
+    -------
+    ImageCache
+        the images cache
+    """
+    try:
+        directory: Optional[str] = get_config("image_cache.directory")
+        max_size_mb: Optional[float] = get_config("image_cache.max_size_mb")
+    except KeyError:
+        directory = max_size_mb = None
+    return _image_cache(
+        directory or DEFAULT_CACHE_DIRECTORY, float(max_size_mb or DEFAULT_MAX_SIZE_MB)
+    )
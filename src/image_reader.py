@@ -1,22 +1,35 @@
 """This module contains reading the image."""
 import os
+import struct
+from functools import lru_cache
+from typing import BinaryIO, Optional, Tuple
 
-import cv2 as cv
 import numpy as np
 
+from src.image_cache import ImageCache, get_image_cache
 
-def image_validation(path: str) -> np.ndarray:
+# JPEG start of frame markers, every SOFn except DHT (C4), JPG (C8) and DAC (CC)
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# JPEG markers without a length field
+JPEG_STANDALONE_MARKERS = frozenset(range(0xD0, 0xDA)) | {0x01}
+# EXIF orientations that rotate the image by 90 degrees when it is decoded
+EXIF_TRANSPOSED_ORIENTATIONS = frozenset({5, 6, 7, 8})
+
+
+def image_validation(path: str, cache: Optional[ImageCache] = None) -> np.ndarray:
     """Validate the image.
 
     Parameters
     ----------
     path : str
         image path
+    cache : Optional[ImageCache], optional
+        the decoded images cache, by default the configured one, see get_image_cache
 
     Returns
     -------
     np.ndarray
-        image extracted from path
+        read-only image extracted from path, loaded through the decoded images cache
 
     Raises
     ------
@@ -29,7 +42,156 @@ def image_validation(path: str) -> np.ndarray:
         raise FileExistsError(f"No image file found at {path}")
 
     try:
-        img: np.ndarray = cv.imread(path)
+        img: np.ndarray = (cache or get_image_cache()).load(path)
     except Exception:
         raise TypeError("image not readable")
     return img
+
+
+def _png_size(image_file: BinaryIO) -> Optional[Tuple[int, int]]:
+    header: bytes = image_file.read(24)
+    if len(header) < 24 or header[12:16] != b"IHDR":
+        return None
+    width, height = struct.unpack(">II", header[16:24])
+    return height, width
+
+
+def _exif_orientation(segment: bytes) -> Optional[int]:
+    """Read the orientation tag of an EXIF APP1 segment."""
+    if not segment.startswith(b"Exif\0\0") or len(segment) < 14:
+        return None
+    tiff: bytes = segment[6:]
+    byte_order: str = {b"II": "<", b"MM": ">"}.get(tiff[:2], "")
+    if not byte_order:
+        return None
+    (ifd_offset,) = struct.unpack(f"{byte_order}I", tiff[4:8])
+    if ifd_offset + 2 > len(tiff):
+        return None
+    (entries,) = struct.unpack(f"{byte_order}H", tiff[ifd_offset : ifd_offset + 2])
+    for entry in range(entries):
+        start: int = ifd_offset + 2 + entry * 12
+        if start + 12 > len(tiff):
+            return None
+        tag, _, _ = struct.unpack(f"{byte_order}HHI", tiff[start : start + 8])
+        if tag == 0x0112:
+            (orientation,) = struct.unpack(f"{byte_order}H", tiff[start + 8 : start + 10])
+            return orientation
+    return None
+
+
+def _jpeg_size(image_file: BinaryIO) -> Optional[Tuple[int, int]]:
+    image_file.seek(2)
+    orientation: Optional[int] = None
+    while True:
+        byte: bytes = image_file.read(1)
+        while byte == b"\xff":
+            byte = image_file.read(1)
+        if not byte:
+            return None
+        marker: int = byte[0]
+        if marker in JPEG_STANDALONE_MARKERS:
+            continue
+        length_bytes: bytes = image_file.read(2)
+        if len(length_bytes) < 2:
+            return None
+        (length,) = struct.unpack(">H", length_bytes)
+        if marker == 0xE1 and orientation is None:
+            orientation = _exif_orientation(image_file.read(length - 2))
+            continue
+        if marker in JPEG_SOF_MARKERS:
+            frame: bytes = image_file.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack(">HH", frame[1:5])
+            # the decoder applies the EXIF orientation, rotated images are transposed
+            if orientation in EXIF_TRANSPOSED_ORIENTATIONS:
+                return width, height
+            return height, width
+        if marker == 0xDA:
+            return None
+        image_file.seek(length - 2, os.SEEK_CUR)
+
+
+def _bmp_size(image_file: BinaryIO) -> Optional[Tuple[int, int]]:
+    header: bytes = image_file.read(26)
+    if len(header) < 26:
+        return None
+    (dib_header_size,) = struct.unpack("<I", header[14:18])
+    if dib_header_size == 12:
+        width, height = struct.unpack("<HH", header[18:22])
+    else:
+        width, height = struct.unpack("<ii", header[18:26])
+    return abs(height), width
+
+
+IMAGE_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", _png_size),
+    (b"\xff\xd8", _jpeg_size),
+    (b"BM", _bmp_size),
+)
+
+
+def probe_image_size(path: str) -> Optional[Tuple[int, int]]:
+    """Read the image dimensions from the PNG, JPEG or BMP header.
+
+    Parameters
+    ----------
+    path : str
+        image path
+
+    Returns
+    -------
+    Optional[Tuple[int, int]]
+        the image height and width, None when the format is unknown or the header is
+        malformed
+    """
+    with open(path, "rb") as image_file:
+        signature: bytes = image_file.read(8)
+        for magic, reader in IMAGE_SIGNATURES:
+            if signature.startswith(magic):
+                image_file.seek(0)
+                try:
+                    return reader(image_file)
+                except struct.error:
+                    return None
+    return None
+
+
+@lru_cache(maxsize=32)
+def _image_size(path: str, mtime_ns: int, size: int) -> Tuple[int, int]:
+    image_size: Optional[Tuple[int, int]] = probe_image_size(path)
+    if image_size is not None:
+        return image_size
+    img: Optional[np.ndarray] = image_validation(path)
+    if img is None:
+        raise TypeError("image not readable")
+    return img.shape[0], img.shape[1]
+
+
+def read_image_size(path: str) -> Tuple[int, int]:
+    """Get the image dimensions without decoding the image.
+
+    Only the header is read for PNG, JPEG and BMP images, other formats are decoded.
+    The dimensions are cached for each version of the file.
+
+    Parameters
+    ----------
+    path : str
+        image path
+
+    Returns
+    -------
+    Tuple[int, int]
+        the image height and width
+
+    Raises
+    ------
+    FileExistsError
+        when path is not for a image file
+    TypeError
+        when the image is not readable
+    """
+    if not os.path.isfile(path):
+        raise FileExistsError(f"No image file found at {path}")
+    stat = os.stat(path)
+    return _image_size(path, stat.st_mtime_ns, stat.st_size)
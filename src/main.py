@@ -1,33 +1,62 @@
 """This module contains the main code for EV3PathBot."""
 import logging
 
-from src.GUIs.main_screen import run
-from src.path_creation import create_path
-from src.Writer.code_writer import CodeEditor
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(levelname)s: on file %(filename)s, on line %(lineno)d: %(message)s",
-    filename="logs.log",
-    filemode="w",
-)
-
-(
-    robot_positions,
-    robot_angles,
-    additional_motor_1,
-    additional_motor_2,
-    additional_motors_mode,
-    speed,
-) = run()
-point = create_path(
-    robot_positions,
-    robot_angles,
-    additional_motor_1,
-    additional_motor_2,
-    additional_motors_mode,
-    speed,
-)
-
-editor = CodeEditor()
-editor(point)
+
+def main() -> None:
+    """Run the planner, then compile the planned path into an EV3 script.
+
+    The path compilation modules are imported once the planner window is closed, so
+    they do not delay the window from showing up.
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(levelname)s: on file %(filename)s, on line %(lineno)d: %(message)s",
+        filename="logs.log",
+        filemode="w",
+    )
+
+    from src.GUIs.main_screen import planner_backend
+
+    if planner_backend() == "tk":
+        from src.GUIs.main_window_gui import run_main_window as run
+    else:
+        from src.GUIs.main_screen import run
+
+    (
+        robot_positions,
+        robot_angles,
+        additional_motor_1,
+        additional_motor_2,
+        additional_motors_mode,
+        speed,
+    ) = run()
+
+    from src.arc_turns import arc_path
+    from src.motion_profile import profile_path
+    from src.path_creation import (
+        additional_motors_keys,
+        create_path_array,
+        path_columns,
+    )
+    from src.path_optimization import optimize_path
+    from src.runtime_estimator import estimate_path_runtime, get_robot_model
+    from src.Writer.code_writer import CodeEditor
+
+    path = create_path_array(
+        robot_positions,
+        robot_angles,
+        additional_motor_1,
+        additional_motor_2,
+        additional_motors_mode,
+        speed,
+    )
+    path = profile_path(arc_path(optimize_path(path)))
+    logging.info(estimate_path_runtime(path, get_robot_model()).summary())
+    point = path_columns(path, *additional_motors_keys())
+
+    editor = CodeEditor()
+    editor(point)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""This module contains the trapezoidal velocity profiles of the robot moves."""
+import logging
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from src.configs import get_config
+
+# the highest wheels speed of the robot, the planner speed and the ramped moves limit
+MAX_SPEED_DPS: int = 1000
+
+
+class MotionLimits(NamedTuple):
+    """The wheels speed and acceleration limits of the robot moves."""
+
+    max_speed_dps: int
+    max_acceleration_dps2: int
+
+
+def move_durations(
+    distance_degrees: np.ndarray, speed_dps: np.ndarray, acceleration_dps2: np.ndarray
+) -> np.ndarray:
+    """Get the time of moves that start and end at a stop.
+
+    A move with an acceleration ramps up to its speed, cruises and ramps down, a move
+    too short to reach its speed ramps up and down only. A move without an
+    acceleration is at its speed the whole time.
+
+    Parameters
+    ----------
+    distance_degrees : np.ndarray
+        the moves distances in wheel degrees
+    speed_dps : np.ndarray
+        the moves cruise speeds in wheel degrees per second
+    acceleration_dps2 : np.ndarray
+        the moves accelerations in wheel degrees per second squared, 0 for no ramps
+
+    Returns
+    -------
+    np.ndarray
+        the moves durations in seconds
+    """
+    distance: np.ndarray = np.abs(np.asarray(distance_degrees, dtype=float))
+    speed: np.ndarray = np.maximum(np.asarray(speed_dps, dtype=float), 1)
+    acceleration: np.ndarray = np.broadcast_to(
+        np.asarray(acceleration_dps2, dtype=float), distance.shape
+    )
+    durations: np.ndarray = distance / speed
+    ramped: np.ndarray = acceleration > 0
+    accelerating: np.ndarray = acceleration[ramped]
+    # a ramp covers speed ** 2 / (2 * acceleration) degrees and takes speed / acceleration
+    durations[ramped] = np.where(
+        speed[ramped] ** 2 <= accelerating * distance[ramped],
+        distance[ramped] / speed[ramped] + speed[ramped] / accelerating,
+        2 * np.sqrt(distance[ramped] / accelerating),
+    )
+    return durations
+
+
+def cruise_speeds(distance_degrees: np.ndarray, limits: MotionLimits) -> np.ndarray:
+    """Get the highest speeds the moves reach and still stop at their end.
+
+    Parameters
+    ----------
+    distance_degrees : np.ndarray
+        the moves distances in wheel degrees
+    limits : MotionLimits
+        the robot speed and acceleration limits
+
+    Returns
+    -------
+    np.ndarray
+        the cruise speeds in wheel degrees per second, the maximum speed for the moves
+        long enough to reach it
+    """
+    peak: np.ndarray = np.sqrt(limits.max_acceleration_dps2 * np.abs(distance_degrees))
+    return np.clip(peak, 1, limits.max_speed_dps).astype(np.int64)
+
+
+def apply_motion_profile(path: np.ndarray, limits: MotionLimits) -> np.ndarray:
+    """Ramp every move of a path up and down at the maximum acceleration.
+
+    Parameters
+    ----------
+    path : np.ndarray
+        the path, see path_creation.create_path_array
+    limits : MotionLimits
+        the robot speed and acceleration limits
+
+    Returns
+    -------
+    np.ndarray
+        a copy of the path, the moves speeds are their saved speeds capped by their
+        cruise speeds and their accelerations are the maximum acceleration, the turns
+        are not changed
+    """
+    profiled: np.ndarray = path.copy()
+    steps: np.ndarray = profiled[:-1]
+    moves: np.ndarray = (steps["angles_difference"] == 0) & (steps["distance_degrees"] != 0)
+    steps["speed"][moves] = np.minimum(
+        steps["speed"][moves], cruise_speeds(steps["distance_degrees"][moves], limits)
+    )
+    steps["acceleration"][moves] = limits.max_acceleration_dps2
+    return profiled
+
+
+def get_motion_limits() -> Optional[MotionLimits]:
+    """Get the motion limits configured in the configurations file.
+
+    Returns
+    -------
+    Optional[MotionLimits]
+        the limits, None when ``motion_profile.max_acceleration_dps2`` is not set
+    """
+    try:
+        max_acceleration: Optional[int] = get_config("motion_profile.max_acceleration_dps2")
+        max_speed: Optional[int] = get_config("motion_profile.max_speed_dps")
+    except KeyError:
+        return None
+    if not max_acceleration:
+        return None
+    return MotionLimits(int(max_speed or MAX_SPEED_DPS), int(max_acceleration))
+
+
+def profile_path(path: np.ndarray) -> np.ndarray:
+    """Apply the configured motion profile to a path.
+
+    Parameters
+    ----------
+    path : np.ndarray
+        the path, see path_creation.create_path_array
+
+    Returns
+    -------
+    np.ndarray
+        the profiled path, the path itself when there are no motion limits
+    """
+    limits: Optional[MotionLimits] = get_motion_limits()
+    if limits is None:
+        return path
+    logging.info(
+        f"moves ramped at {limits.max_acceleration_dps2} dps2 up to {limits.max_speed_dps} dps"
+    )
+    return apply_motion_profile(path, limits)
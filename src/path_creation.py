@@ -1,13 +1,183 @@
 """This module contains the path creation code."""
-import math
-from collections import namedtuple
-from typing import List
+from typing import List, Sequence, Tuple, Union
 
 import numpy as np
-from scipy.spatial.transform import Rotation
 
+from src.calibration import get_mat_calibration
 from src.motors_extraction import motors_extraction
-from src.pixels_to_degrees_ratio import convert_pixels_to_degrees
+from src.pixels_to_degrees_ratio import convert_mm_to_degrees, convert_pixels_to_degrees
+
+# one row per saved waypoint, the step fields describe the step to the next waypoint and
+# are 0 on the last row
+PATH_DTYPE = np.dtype(
+    [
+        ("x", "<i8"),
+        ("y", "<i8"),
+        ("angle", "<i8"),
+        ("angles_difference", "<i8"),
+        ("distance_pixels", "<f8"),
+        ("distance_degrees", "<i8"),
+        ("additional_motor_1", "<i8"),
+        ("additional_motor_2", "<i8"),
+        ("additional_motors_mode", "U1"),
+        ("speed", "<i8"),
+        # the wheels acceleration of a move in degrees per second squared, 0 for no ramps
+        ("acceleration", "<i8"),
+        # the wheels distances difference of an arc, the second LARGE motor drives
+        # distance_degrees + arc_degrees / 2 and the first one distance_degrees - arc_degrees / 2
+        ("arc_degrees", "<i8"),
+        ("action", "U8"),
+    ]
+)
+
+
+def path_steps(
+    robot_positions: Union[np.ndarray, List[np.ndarray]],
+    angles: Sequence[int],
+    additional_motor_1: Sequence[int],
+    additional_motor_2: Sequence[int],
+    additional_motors_mode: Sequence[str],
+    robot_speed_dps: Sequence[int],
+) -> np.ndarray:
+    """Compute the path steps with batched operations, without converting the distances.
+
+    Parameters
+    ----------
+    robot_positions : Union[np.ndarray, List[np.ndarray]]
+        the robot boxes, stacked in one array with shape (N, 4, 2)
+    angles : Sequence[int]
+        the angles
+    additional_motor_1 : Sequence[int]
+        the additional motor 1 rotations
+    additional_motor_2 : Sequence[int]
+        the additional motor 2 rotations
+    additional_motors_mode : Sequence[str]
+        the additional motors modes, Parallel (P) or Series (S)
+    robot_speed_dps : Sequence[int]
+        the robot speeds
+
+    Returns
+    -------
+    np.ndarray
+        the path, a PATH_DTYPE array with one row per waypoint, distance_degrees is 0
+    """
+    boxes: np.ndarray = np.asarray(robot_positions, dtype=float).reshape(-1, 4, 2)
+    path: np.ndarray = np.zeros(len(boxes), dtype=PATH_DTYPE)
+    # the top left corner truncated to whole pixels, the distances are measured on it
+    path["x"] = boxes[:, 0, 0]
+    path["y"] = boxes[:, 0, 1]
+    path["angle"] = angles
+    path["additional_motor_1"] = additional_motor_1
+    path["additional_motor_2"] = additional_motor_2
+    path["additional_motors_mode"] = additional_motors_mode
+    path["speed"] = robot_speed_dps
+    path["distance_pixels"][:-1] = np.hypot(np.diff(path["x"]), np.diff(path["y"]))
+    path["angles_difference"][:-1] = np.diff(path["angle"])
+    if len(boxes):
+        path["action"] = movement_actions(boxes, path["angle"])
+    return path
+
+
+def create_path_array(
+    robot_positions: Union[np.ndarray, List[np.ndarray]],
+    angles: Sequence[int],
+    additional_motor_1: Sequence[int],
+    additional_motor_2: Sequence[int],
+    additional_motors_mode: Sequence[str],
+    robot_speed_dps: Sequence[int],
+) -> np.ndarray:
+    """Create the path with the distances in wheel degrees.
+
+    Parameters
+    ----------
+    robot_positions : Union[np.ndarray, List[np.ndarray]]
+        the robot boxes, stacked in one array with shape (N, 4, 2)
+    angles : Sequence[int]
+        the angles
+    additional_motor_1 : Sequence[int]
+        the additional motor 1 rotations
+    additional_motor_2 : Sequence[int]
+        the additional motor 2 rotations
+    additional_motors_mode : Sequence[str]
+        the additional motors modes, Parallel (P) or Series (S)
+    robot_speed_dps : Sequence[int]
+        the robot speeds
+
+    Returns
+    -------
+    np.ndarray
+        the path, a PATH_DTYPE array with one row per waypoint
+    """
+    path: np.ndarray = path_steps(
+        robot_positions,
+        angles,
+        additional_motor_1,
+        additional_motor_2,
+        additional_motors_mode,
+        robot_speed_dps,
+    )
+    if len(path) < 2:
+        return path
+    calibration = get_mat_calibration()
+    if calibration is None:
+        path["distance_degrees"][:-1] = convert_pixels_to_degrees(path["distance_pixels"][:-1])
+    else:
+        # measure the distances on the mat plane, free of the photo perspective
+        reference_points = np.asarray(robot_positions, dtype=float).reshape(-1, 4, 2)[:, 0]
+        path["distance_degrees"][:-1] = convert_mm_to_degrees(
+            calibration.path_lengths_mm(reference_points)
+        )
+    return path
+
+
+def path_columns(path: np.ndarray, motor_1: str, motor_2: str) -> dict:
+    """Get the path as the dictionary of lists written by CodeEditor.
+
+    Parameters
+    ----------
+    path : np.ndarray
+        the path, see create_path_array
+    motor_1 : str
+        the first additional motor name, the key of its rotations
+    motor_2 : str
+        the second additional motor name, the key of its rotations
+
+    Returns
+    -------
+    dict
+        the path columns, the step fields have one value less than the waypoints
+    """
+    steps: int = max(len(path) - 1, 0)
+    return {
+        "x": path["x"].tolist(),
+        "y": path["y"].tolist(),
+        "distance_degrees": path["distance_degrees"][:steps].tolist(),
+        "angle": path["angle"].tolist(),
+        "angles_difference": path["angles_difference"][:steps].tolist(),
+        motor_1: path["additional_motor_1"].tolist(),
+        motor_2: path["additional_motor_2"].tolist(),
+        "additional_motors_mode": path["additional_motors_mode"].tolist(),
+        "speed": path["speed"].tolist(),
+        "acceleration": path["acceleration"][:steps].tolist(),
+        "arc_degrees": path["arc_degrees"][:steps].tolist(),
+        "action": path["action"].tolist(),
+    }
+
+
+def additional_motors_keys() -> Tuple[str, str]:
+    """Get the keys of the additional motors rotations in the path columns.
+
+    Returns
+    -------
+    Tuple[str, str]
+        the configured medium motors names, "X" for a missing motor
+    """
+    _, medium_motors = motors_extraction()
+    if len(medium_motors) == 2:
+        return tuple(medium_motors)
+    if len(medium_motors) == 1:
+        return medium_motors[0], "X"
+    return "X", "X"
 
 
 def create_path(
@@ -38,59 +208,50 @@ def create_path(
     Returns
     -------
     dict
-        dictiorany of all the path markups.
+        dictiorany of all the path markups, see path_columns.
     """
-    _, medium_motors = motors_extraction()
-    if len(medium_motors) == 2:
-        motor_1, motor_2 = medium_motors
-    elif len(medium_motors) == 1:
-        motor_1 = medium_motors
-        motor_2 = "X"
-    else:
-        motor_1 = motor_2 = "X"
-
-    directions = determine_robot_movement(robot_positions, angles)
-    positions: dict = {
-        "x": [],
-        "y": [],
-        "distance_degrees": [],
-        "angle": [],
-        "angles_difference": [],
-        motor_1: [],
-        motor_2: [],
-        "additional_motors_mode": [],
-        "speed": [],
-        "action": directions,
-    }
-
-    for i in range(len(robot_positions)):
-        positions["x"].append(int(robot_positions[i][0][0]))
-        positions["y"].append(int(robot_positions[i][0][1]))
-        positions["angle"].append(angles[i])
-        positions[motor_1].append(additional_motor_1[i])
-        positions[motor_2].append(additional_motor_2[i])
-        positions["additional_motors_mode"].append(additional_motors_mode[i])
-        positions["speed"].append(robot_speed_dps[i])
-
-    for i in range(len(positions["x"]) - 1):
-        p1 = (positions["x"][i], positions["y"][i])
-        p2 = (positions["x"][i + 1], positions["y"][i + 1])
+    path: np.ndarray = create_path_array(
+        robot_positions,
+        angles,
+        additional_motor_1,
+        additional_motor_2,
+        additional_motors_mode,
+        robot_speed_dps,
+    )
+    return path_columns(path, *additional_motors_keys())
 
-        distance = math.dist(p1, p2)
 
-        positions["distance_degrees"].append((distance))
+def movement_actions(robot_positions: np.ndarray, angles: np.ndarray) -> np.ndarray:
+    """Classify every step of the path in one batched pass.
 
-    for i in range(len(positions["angle"]) - 1):
-        an1 = positions["angle"][i]
-        an2 = positions["angle"][i + 1]
-        angle = an2 - an1
+    The robot heading points from the back side of the box to the side of its first
+    two corners, the side the LARGE motors positive movement drives to. A step that
+    keeps the heading is forward when the top left corner moves along the heading and
+    backward otherwise, any other step changing the angle is a rotation.
 
-        positions["angles_difference"].append((angle))
+    Parameters
+    ----------
+    robot_positions : np.ndarray
+        the robot boxes, with shape (N, 4, 2)
+    angles : np.ndarray
+        the step angles
 
-    positions["distance_degrees"] = convert_pixels_to_degrees(
-        np.array(positions["distance_degrees"])
-    )
-    return positions
+    Returns
+    -------
+    np.ndarray
+        the N actions, None for the first pose, then forward, backward, Move or Rotate
+    """
+    angles = np.asarray(angles)
+    actions: np.ndarray = np.where(angles[1:] == angles[:-1], "Move", "Rotate").astype("U8")
+    heading: np.ndarray = robot_positions[:, 0] - robot_positions[:, 3]
+    # the image y-axis points down, the heading angles are counterclockwise on the mat
+    heading_angle: np.ndarray = np.degrees(np.arctan2(-heading[:, 1], heading[:, 0]))
+    turn: np.ndarray = np.abs((np.diff(heading_angle) + 180) % 360 - 180)
+    straight: np.ndarray = turn < 2
+    displacement: np.ndarray = np.diff(robot_positions[:, 0], axis=0)[straight]
+    projection: np.ndarray = np.einsum("ij,ij->i", displacement, heading[:-1][straight])
+    actions[straight] = np.where(projection > 0, "forward", "backward")
+    return np.concatenate([np.array(["None"], dtype="U8"), actions])
 
 
 def determine_robot_movement(robot_positions: List[np.ndarray], angles: List[int]) -> List[str]:
@@ -106,43 +267,9 @@ def determine_robot_movement(robot_positions: List[np.ndarray], angles: List[int
     Returns
     -------
     List[str]
-        movement direction
+        movement direction, see movement_actions
     """
-    robot_vector = namedtuple("robot_vector", ["top_left_corner", "forward_angle", "action"])
-    vectors_list: List[robot_vector] = []
-    dx = robot_positions[0][3][0] - robot_positions[0][0][0]
-    dy = robot_positions[0][3][1] - robot_positions[0][0][1]
-    try:
-        forward_angle = math.degrees(math.atan(-dy / dx))
-    except Exception:
-        forward_angle = 90 if dy > 0 else -90
-    mode = "None"
-    vector = robot_vector(robot_positions[0][0], int(forward_angle), mode)
-    vectors_list.append(vector)
-    for i in range(1, len(robot_positions)):
-        dx = robot_positions[i][3][0] - robot_positions[i][0][0]
-        dy = robot_positions[i][3][1] - robot_positions[i][0][1]
-        try:
-            forward_angle = math.degrees(math.atan(-dy / dx))
-        except Exception:
-            forward_angle = 90 if dy > 0 else -90
-        mode = "Move" if angles[i] == angles[i - 1] else "Rotate"
-        vector = robot_vector(robot_positions[i][0], int(forward_angle), mode)
-        vectors_list.append(vector)
-
-    for i in range(1, len(vectors_list)):
-        if abs(vectors_list[i].forward_angle - vectors_list[i - 1].forward_angle) < 2:
-            rotation = Rotation.from_euler("z", vectors_list[i - 1].forward_angle, degrees=True)
-
-            before_array = np.append(vectors_list[i - 1].top_left_corner, [0])
-            after_array = np.append(vectors_list[i].top_left_corner, [0])
-
-            step_before = rotation.apply(before_array)
-            step_after = rotation.apply(after_array)
-
-            if step_before[0] < step_after[0]:
-                vectors_list[i] = vectors_list[i]._replace(action="forward")
-            else:
-                vectors_list[i] = vectors_list[i]._replace(action="backward")
-
-    return [vector.action for vector in vectors_list]
+    boxes: np.ndarray = np.asarray(robot_positions, dtype=float).reshape(-1, 4, 2)
+    if not len(boxes):
+        return []
+    return movement_actions(boxes, np.asarray(angles)).tolist()
@@ -0,0 +1,230 @@
+"""This module contains the simplification of the path before it is written."""
+import logging
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from src.calibration import get_mat_calibration
+from src.configs import get_config
+from src.runtime_estimator import (
+    DEFAULT_ROBOT_MODEL,
+    RobotModel,
+    estimate_path_runtime,
+    get_robot_model,
+)
+
+# the top left corners are whole pixels, moves this close to a line are collinear
+COLLINEAR_TOLERANCE_PIXELS: float = 1.0
+
+
+class SimplificationReport(NamedTuple):
+    """The robot commands and estimated runtime before and after simplifying a path."""
+
+    commands_before: int
+    commands_after: int
+    runtime_before_s: float
+    runtime_after_s: float
+
+    @property
+    def removed_commands(self) -> int:
+        """The number of robot commands removed."""
+        return self.commands_before - self.commands_after
+
+    @property
+    def saved_s(self) -> float:
+        """The estimated runtime removed in seconds."""
+        return self.runtime_before_s - self.runtime_after_s
+
+
+def _rdp_keep(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """Get the points kept by the Ramer-Douglas-Peucker simplification of a polyline."""
+    keep: np.ndarray = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    stack: List[Tuple[int, int]] = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        segment: np.ndarray = points[end] - points[start]
+        offsets: np.ndarray = points[start + 1 : end] - points[start]
+        length: float = float(np.hypot(*segment))
+        if length > 0:
+            distances = np.abs(segment[0] * offsets[:, 1] - segment[1] * offsets[:, 0]) / length
+        else:
+            distances = np.hypot(offsets[:, 0], offsets[:, 1])
+        farthest: int = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            keep[start + 1 + farthest] = True
+            stack.extend([(start, start + 1 + farthest), (start + 1 + farthest, end)])
+    return keep
+
+
+def _removable_waypoints(path: np.ndarray, points: np.ndarray, tolerance: float) -> np.ndarray:
+    """Find the waypoints whose step can be joined with the previous step.
+
+    Waypoint w joins step w - 1 (to w) and step w (from w). Removing it merges the
+    two steps into one command that keeps the settings of step w - 1. The additional
+    motors of a waypoint run after its step, so both waypoints must not run them.
+    """
+    removable: np.ndarray = np.zeros(len(path), dtype=bool)
+    if len(path) < 2:
+        return removable
+    steps: np.ndarray = path[:-1]
+    turn: np.ndarray = steps["angles_difference"] != 0
+    move: np.ndarray = ~turn & (steps["distance_degrees"] != 0)
+    still: np.ndarray = (path["additional_motor_1"] == 0) & (path["additional_motor_2"] == 0)
+    noop: np.ndarray = ~turn & ~move & still[:-1]
+    # a leading step that does nothing drops the start waypoint, the next one is the same pose
+    removable[0] = noop[0]
+    if len(path) < 3:
+        return removable
+
+    joinable: np.ndarray = (
+        still[:-2]
+        & still[1:-1]
+        & (steps["additional_motors_mode"][:-1] == steps["additional_motors_mode"][1:])
+    )
+    folded: np.ndarray = turn[:-1] & turn[1:] & joinable
+    removable[1:-1] = noop[1:] | folded
+    mergeable: np.ndarray = (
+        move[:-1]
+        & move[1:]
+        & joinable
+        & (steps["speed"][:-1] == steps["speed"][1:])
+        & (steps["acceleration"][:-1] == steps["acceleration"][1:])
+        # the action of a step is stored on the waypoint it reaches
+        & (path["action"][1:-1] == path["action"][2:])
+        & ~removable[1:-1]
+    )
+    # every run of mergeable waypoints is a polyline of moves, its straight parts merge
+    edges: np.ndarray = np.diff(np.concatenate([[0], mergeable.astype(np.int8), [0]]))
+    for first, last in zip(np.flatnonzero(edges == 1) + 1, np.flatnonzero(edges == -1)):
+        keep: np.ndarray = _rdp_keep(points[first - 1 : last + 2], tolerance)
+        removable[first : last + 1] = ~keep[1:-1]
+    return removable
+
+
+def _join_steps(path: np.ndarray, removable: np.ndarray) -> np.ndarray:
+    """Remove waypoints and merge their step into the previous step."""
+    kept: np.ndarray = np.flatnonzero(~removable)
+    group: np.ndarray = np.cumsum(~removable)[:-1] - 1
+    steps: np.ndarray = path[:-1]
+    # the turns are driven by their angle only, their distance is not written
+    moved: np.ndarray = np.where(steps["angles_difference"] == 0, steps["distance_degrees"], 0)
+    joined: np.ndarray = path[kept]
+    joined["distance_degrees"] = np.bincount(
+        group[group >= 0], weights=moved[group >= 0], minlength=len(kept)
+    ).astype(np.int64)
+    joined["distance_degrees"][-1] = 0
+    joined["angles_difference"][:-1] = np.diff(joined["angle"])
+    joined["distance_pixels"][:-1] = np.hypot(np.diff(joined["x"]), np.diff(joined["y"]))
+    joined["action"][1:] = path["action"][kept[:-1] + 1]
+    return joined
+
+
+def simplify_path(
+    path: np.ndarray,
+    tolerance_mm: Optional[float] = None,
+    points_mm: Optional[np.ndarray] = None,
+    model: RobotModel = DEFAULT_ROBOT_MODEL,
+) -> Tuple[np.ndarray, SimplificationReport]:
+    """Merge the commands of a path that the robot can drive as one.
+
+    Consecutive moves with the same heading, direction, speed and mode merge when
+    their waypoints are on a line and do not run the additional motors, steps that do
+    nothing are dropped and back-to-back turns fold into one turn.
+
+    Parameters
+    ----------
+    path : np.ndarray
+        the path, see path_creation.create_path_array
+    tolerance_mm : Optional[float], optional
+        merge the moves whose waypoints are this close to a line, with the
+        Ramer-Douglas-Peucker algorithm, by default only the collinear moves merge
+    points_mm : Optional[np.ndarray], optional
+        the waypoints top left corners on the mat in mm, with shape (N, 2), by default
+        converted from the path pixels when tolerance_mm is given
+    model : RobotModel, optional
+        the robot timings the runtime is estimated with, by default DEFAULT_ROBOT_MODEL
+
+    Returns
+    -------
+    Tuple[np.ndarray, SimplificationReport]
+        the simplified path and what was removed
+    """
+    if tolerance_mm is None:
+        points: np.ndarray = np.stack([path["x"], path["y"]], axis=1).astype(float)
+        tolerance: float = COLLINEAR_TOLERANCE_PIXELS
+    else:
+        points = points_mm if points_mm is not None else path_points_mm(path)
+        tolerance = tolerance_mm
+    simplified: np.ndarray = path
+    # the original waypoint of every row, to look the points up after a pass
+    rows: np.ndarray = np.arange(len(path))
+    while True:
+        removable: np.ndarray = _removable_waypoints(simplified, points[rows], tolerance)
+        if not removable.any():
+            break
+        simplified = _join_steps(simplified, removable)
+        rows = rows[~removable]
+    report = SimplificationReport(
+        len(path),
+        len(simplified),
+        estimate_path_runtime(path, model).total_s,
+        estimate_path_runtime(simplified, model).total_s,
+    )
+    return simplified, report
+
+
+def path_points_mm(path: np.ndarray) -> np.ndarray:
+    """Get the waypoints top left corners on the mat.
+
+    Parameters
+    ----------
+    path : np.ndarray
+        the path, see path_creation.create_path_array
+
+    Returns
+    -------
+    np.ndarray
+        the points in mm, with shape (N, 2), through the mat calibration when it is
+        configured
+    """
+    from src.converters import get_mat_geometry
+
+    points: np.ndarray = np.stack([path["x"], path["y"]], axis=1).astype(float)
+    calibration = get_mat_calibration()
+    if calibration is not None:
+        return calibration.pixels_to_mm(points)
+    return get_mat_geometry().points_pixel_to_mm(points)
+
+
+def optimize_path(path: np.ndarray) -> np.ndarray:
+    """Simplify the path as set in the configurations file.
+
+    Parameters
+    ----------
+    path : np.ndarray
+        the path, see path_creation.create_path_array
+
+    Returns
+    -------
+    np.ndarray
+        the simplified path, the path itself when ``path_optimization.enabled`` is False
+    """
+    try:
+        enabled: Optional[bool] = get_config("path_optimization.enabled")
+        tolerance_mm: Optional[float] = get_config("path_optimization.tolerance_mm")
+    except KeyError:
+        enabled = tolerance_mm = None
+    if enabled is False:
+        return path
+    path, report = simplify_path(
+        path, None if tolerance_mm is None else float(tolerance_mm), model=get_robot_model()
+    )
+    logging.info(
+        f"path simplified from {report.commands_before} to {report.commands_after} commands, "
+        f"the estimated runtime went from {report.runtime_before_s:.1f} s "
+        f"to {report.runtime_after_s:.1f} s"
+    )
+    return path
@@ -1,11 +1,10 @@
 """This module contains the pixel to degrees ratio calculator."""
 from typing import List, Tuple
 
-import cv2 as cv
 import numpy as np
 
 from src.configs import get_config
-from src.image_reader import image_validation
+from src.image_reader import read_image_size
 
 
 def convert_pixels_to_degrees(distance_pixels_array: np.array) -> List[int]:
@@ -22,17 +21,32 @@ def convert_pixels_to_degrees(distance_pixels_array: np.array) -> List[int]:
         the degrees the robot should move
     """
     mat_width = get_config("mat_dimensions.length_x")
-    wheel_diameter = get_config("robot_dimensions.wheel_diameter")
     image_path = get_config("mat_image_path")
-    img = image_validation(image_path)
-
-    _, width, _ = img.shape
+    _, width = read_image_size(image_path)
     # this equation for calculating the length of the table in mm
     img_scale: float = width / mat_width
 
+    return convert_mm_to_degrees(distance_pixels_array / img_scale)
+
+
+def convert_mm_to_degrees(distance_mm_array: np.array) -> List[int]:
+    """Convert real world distances to wheel degrees.
+
+    Parameters
+    ----------
+    distance_mm_array : np.array
+        the input distances in mm
+
+    Returns
+    -------
+    List[int]
+        the degrees the robot should move
+    """
+    wheel_diameter = get_config("robot_dimensions.wheel_diameter")
+
     # this equation is for calculating how many mm does 1 wheel rotation make
     wheel_scale: float = (wheel_diameter * 3.14) / 360
-    distance_degrees_array = (distance_pixels_array / img_scale) / wheel_scale
+    distance_degrees_array = np.asarray(distance_mm_array) / wheel_scale
     distance_degrees_array = np.around(distance_degrees_array)
     distance_degrees_array = distance_degrees_array.astype(int)
     return list(distance_degrees_array)
@@ -0,0 +1,801 @@
+"""This module contains the state of the planning session."""
+import logging
+from functools import partial
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from src.collision import ObstacleMask
+from src.configs import get_config
+from src.converters import stud_to_mm, stud_to_pixel
+from src.motion_profile import MAX_SPEED_DPS
+from src.route_planner import RoutePlanner
+from src.runtime_estimator import get_robot_model
+from src.spatial_index import WaypointIndex
+from src.visit_order import VisitOrder
+from src.waypoint_store import (
+    DELETE,
+    INSERT,
+    MODIFY,
+    WAYPOINT_DTYPE,
+    WaypointStore,
+    waypoint,
+)
+
+# the first additional motor name when the robot has no MEDIUM motor
+NO_MOTOR: str = "X"
+DEFAULT_SPEED_DPS: int = 500
+SAVE_KEY: int = ord("p")
+QUIT_KEY: int = ord("q")
+# keys that change saved waypoints other than the last one, or save more than one
+EDIT_KEYS: frozenset = frozenset(map(ord, "efbuo/;"))
+# keys that change the selected waypoint
+SELECT_KEYS: frozenset = frozenset(map(ord, "[]"))
+# the largest rotation between two poses checked for collisions while rotating, in degrees
+SWEEP_ANGLE_STEP: int = 5
+# the route grid cells per robot side, the shorter robot side is split in this many cells
+ROUTE_CELLS_PER_SIDE: int = 4
+
+
+class PlannerSettings(NamedTuple):
+    """Configurations used by the planning session."""
+
+    robot_length: int
+    robot_width: int
+    robot_length_x_pixels: int
+    robot_width_y_pixels: int
+    mat_length: int
+    mat_width: int
+    delta_theta: int
+    delta_pixels: int
+    additional_motors_steps: int
+    speed_steps: int
+    large_motors_positive_direction: bool
+    gyro_positive_direction: bool
+
+
+def load_planner_settings() -> PlannerSettings:
+    """Load and validate the planning session configurations.
+
+    Returns
+    -------
+    PlannerSettings
+        the planning session configurations
+
+    Raises
+    ------
+    ValueError
+        If the robot dimensions, mat dimensions, steps or robot movement configurations
+        are not defined in the config file.
+    """
+    robot_length: int = int(get_config("robot_dimensions.length_x") or 0)
+    robot_width: int = int(get_config("robot_dimensions.width_y") or 0)
+    logging.info(f"defined robot length: {robot_length} studs and robot width: {robot_width} studs")
+    if not robot_length or not robot_width:
+        raise ValueError("Robot length or width is not defined in the config file.")
+
+    mat_length: int = int(get_config("mat_dimensions.length_x") or 0)
+    mat_width: int = int(get_config("mat_dimensions.width_y") or 0)
+    logging.info(
+        f"defined mat length (x-axis): {mat_length} mm and mat width (y-axis): {mat_width} mm"
+    )
+    if not mat_length or not mat_width:
+        raise ValueError("Mat length or width is not defined in the config file.")
+
+    delta_theta: int = int(get_config("steps.delta_theta") or 0)
+    delta_pixels: int = int(get_config("steps.delta_pixels") or 0)
+    additional_motors_steps: int = int(get_config("steps.additional_motors_steps") or 0)
+    logging.info(
+        f"defined delta theta: {delta_theta} degrees, delta pixels: {delta_pixels} pixels and additional motors steps: {additional_motors_steps} steps"
+    )
+    if not delta_theta or not delta_pixels or not additional_motors_steps:
+        raise ValueError("Steps are not defined in the config file.")
+
+    large_motors_positive_direction: bool = get_config(
+        "robot_movement_configurations.large_motor_positive_direction"
+    )
+    gyro_positive_direction: bool = get_config(
+        "robot_movement_configurations.gyro_positive_direction"
+    )
+    logging.info(
+        f"defined large motors positive direction: {large_motors_positive_direction} and gyro positive direction: {gyro_positive_direction}"
+    )
+    if large_motors_positive_direction is None or gyro_positive_direction is None:
+        raise ValueError("Robot movement configurations are not defined in the config file.")
+
+    speed_steps: int = int(get_config("steps.speed_steps") or 0)
+    logging.info(f"defined speed steps: {speed_steps}")
+    if not speed_steps:
+        raise ValueError("Speed steps configurations are not defined in the config file.")
+
+    return PlannerSettings(
+        robot_length=robot_length,
+        robot_width=robot_width,
+        robot_length_x_pixels=stud_to_pixel(robot_length),
+        robot_width_y_pixels=stud_to_pixel(robot_width),
+        mat_length=mat_length,
+        mat_width=mat_width,
+        delta_theta=delta_theta,
+        delta_pixels=delta_pixels,
+        additional_motors_steps=additional_motors_steps,
+        speed_steps=speed_steps,
+        large_motors_positive_direction=large_motors_positive_direction,
+        gyro_positive_direction=gyro_positive_direction,
+    )
+
+
+def robot_box(
+    top_left_corner: Sequence[float], length_x_pixels: int, width_y_pixels: int, theta: float
+) -> np.ndarray:
+    """Get the corners of the robot box rotated around its center.
+
+    Parameters
+    ----------
+    top_left_corner : Sequence[float]
+        the top left corner of the robot box before the rotation, in pixels
+    length_x_pixels : int
+        the robot length in pixels
+    width_y_pixels : int
+        the robot width in pixels
+    theta : float
+        the rotation angle in degrees
+
+    Returns
+    -------
+    np.ndarray
+        the box corners, with shape (4, 2), the front side is the first two corners
+    """
+    x, y = top_left_corner
+    box = np.array(
+        [
+            [x, y],
+            [x + length_x_pixels, y],
+            [x + length_x_pixels, y + width_y_pixels],
+            [x, y + width_y_pixels],
+        ]
+    )
+    center = np.mean(box, axis=0)
+    theta_rad = np.deg2rad(theta)
+    rot_matrix = np.array(
+        [[np.cos(theta_rad), -np.sin(theta_rad)], [np.sin(theta_rad), np.cos(theta_rad)]]
+    )
+    return np.dot(box - center, rot_matrix) + center
+
+
+def robot_heading(boxes: np.ndarray) -> np.ndarray:
+    """Get the headings of robot boxes, the angles robot_box rotated them by.
+
+    Parameters
+    ----------
+    boxes : np.ndarray
+        the box corners, with shape (..., 4, 2)
+
+    Returns
+    -------
+    np.ndarray
+        the headings in degrees, 0 is facing the top of the mat and 90 the left side
+    """
+    boxes = np.asarray(boxes, dtype=float)
+    front: np.ndarray = boxes[..., :2, :].mean(axis=-2) - boxes.mean(axis=-2)
+    return np.degrees(np.arctan2(-front[..., 0], -front[..., 1]))
+
+
+def additional_motors_names(medium_motors_list: Sequence[str]) -> Tuple[str, str]:
+    """Get the names shown for the two additional motors.
+
+    Parameters
+    ----------
+    medium_motors_list : Sequence[str]
+        the MEDIUM motors ports
+
+    Returns
+    -------
+    Tuple[str, str]
+        the first and second additional motors names, X for a missing motor
+    """
+    names: List[str] = list(medium_motors_list[:2]) + [NO_MOTOR] * 2
+    return names[0], names[1]
+
+
+def read_key_script(path: str) -> str:
+    """Read a planning session key script.
+
+    Parameters
+    ----------
+    path : str
+        the key script path, every character is a key press, whitespace is ignored
+
+    Returns
+    -------
+    str
+        the key presses
+    """
+    with open(path) as script_file:
+        return "".join(script_file.read().split())
+
+
+class PlannerState:
+    """The planning session state machine, driven by key presses.
+
+    The state does not depend on any window, the planner GUI and the headless mode
+    feed it the same keys.
+    """
+
+    def __init__(
+        self,
+        settings: PlannerSettings,
+        image_height_y: int,
+        motors_names: Tuple[str, str] = (NO_MOTOR, NO_MOTOR),
+        obstacles: Optional[ObstacleMask] = None,
+    ):
+        """Class Constructor.
+
+        Parameters
+        ----------
+        settings : PlannerSettings
+            the planning session configurations, the attribute can be replaced when the
+            configurations change
+        image_height_y : int
+            the mat image height in pixels, the robot starts at the bottom left corner
+        motors_names : Tuple[str, str], optional
+            the first and second additional motors names, by default X and X
+        obstacles : Optional[ObstacleMask], optional
+            the mat obstacles the live robot is checked against, by default None
+        """
+        self.settings = settings
+        self.first_additional_motor, self.second_additional_motor = motors_names
+        self.robot_top_left_corner = np.array([0, image_height_y - settings.robot_width_y_pixels])
+        self.theta: int = 0
+        self.displayed_theta: int = 0
+        self.additional_motor_1: int = 0
+        self.additional_motor_2: int = 0
+        self.additional_motors_mode: str = "S"
+        self.speed_dps: int = DEFAULT_SPEED_DPS
+        self.waypoints = WaypointStore()
+        self.index = WaypointIndex(
+            max(settings.robot_length_x_pixels, settings.robot_width_y_pixels, 1)
+        )
+        self.selected: Optional[int] = None
+        self._drag: Optional[Tuple[int, np.ndarray, np.ndarray]] = None
+        self.obstacles = obstacles
+        self.colliding: bool = False
+        self._routes: Optional[RoutePlanner] = None
+        self._visits: Optional[VisitOrder] = None
+        self.finished: bool = False
+
+    def live_box(self) -> np.ndarray:
+        """Get the live robot box.
+
+        Returns
+        -------
+        np.ndarray
+            the box corners in the mat image pixels, with shape (4, 2)
+        """
+        return robot_box(
+            self.robot_top_left_corner,
+            self.settings.robot_length_x_pixels,
+            self.settings.robot_width_y_pixels,
+            self.theta,
+        )
+
+    def live_labels(self) -> List[str]:
+        """Get the live robot labels.
+
+        Returns
+        -------
+        List[str]
+            the angle, the additional motors, the additional motors mode and the speed
+        """
+        return [
+            str(-self.displayed_theta)
+            if self.settings.gyro_positive_direction
+            else str(self.displayed_theta),
+            self.first_additional_motor + ": " + str(self.additional_motor_1),
+            self.second_additional_motor + ": " + str(self.additional_motor_2),
+            self.additional_motors_mode,
+            "speed" + ": " + str(self.speed_dps),
+        ]
+
+    def waypoint_labels(self, index: int) -> List[str]:
+        """Get the labels of a saved waypoint.
+
+        Parameters
+        ----------
+        index : int
+            the waypoint index
+
+        Returns
+        -------
+        List[str]
+            the angle, the additional motors, the additional motors mode and the speed
+        """
+        record: np.ndarray = self.waypoints.records[index]
+        return [
+            str(record["displayed_theta"]),
+            self.first_additional_motor + ": " + str(record["additional_motor_1"]),
+            self.second_additional_motor + ": " + str(record["additional_motor_2"]),
+            str(record["additional_motors_mode"]),
+            "speed: " + str(record["speed_dps"]),
+        ]
+
+    def move(self, dx: int, dy: int) -> None:
+        """Move the robot by steps of delta pixels.
+
+        Parameters
+        ----------
+        dx : int
+            the horizontal steps
+        dy : int
+            the vertical steps
+        """
+        previous_box: np.ndarray = self.live_box()
+        self.robot_top_left_corner[0] += dx * self.settings.delta_pixels
+        self.robot_top_left_corner[1] += dy * self.settings.delta_pixels
+        self.check_collision([previous_box, self.live_box()])
+
+    def rotate(self, direction: int) -> None:
+        """Rotate the robot by one delta theta step.
+
+        Parameters
+        ----------
+        direction : int
+            1 rotates the robot head left, -1 rotates it right
+        """
+        previous_theta: int = self.theta
+        self.theta += direction * self.settings.delta_theta
+        self.displayed_theta += direction * self.settings.delta_theta
+        if self.obstacles is not None:
+            steps: int = max(int(np.ceil(self.settings.delta_theta / SWEEP_ANGLE_STEP)), 1)
+            self.check_collision(
+                [
+                    robot_box(
+                        self.robot_top_left_corner,
+                        self.settings.robot_length_x_pixels,
+                        self.settings.robot_width_y_pixels,
+                        theta,
+                    )
+                    for theta in np.linspace(previous_theta, self.theta, steps + 1)
+                ]
+            )
+
+    def check_collision(self, boxes: Optional[List[np.ndarray]] = None) -> bool:
+        """Check the live robot against the obstacles.
+
+        Parameters
+        ----------
+        boxes : Optional[List[np.ndarray]], optional
+            the robot boxes swept by the last move in order, by default the live box
+
+        Returns
+        -------
+        bool
+            True when the robot covers an obstacle, also kept in the colliding attribute
+        """
+        if self.obstacles is None:
+            self.colliding = False
+        else:
+            self.colliding = self.obstacles.sweep_hits(boxes or [self.live_box()])
+        return self.colliding
+
+    def reset_displayed_theta(self) -> None:
+        """Measure the displayed angle from the current robot heading."""
+        self.displayed_theta = 0
+
+    def change_additional_motor(self, motor: int, direction: int) -> None:
+        """Change an additional motor rotation by one step.
+
+        Parameters
+        ----------
+        motor : int
+            the additional motor, 1 or 2
+        direction : int
+            1 adds a step, -1 removes a step
+        """
+        steps: int = direction * self.settings.additional_motors_steps
+        if motor == 1:
+            self.additional_motor_1 += steps
+        else:
+            self.additional_motor_2 += steps
+
+    def set_additional_motors_mode(self, mode: str) -> None:
+        """Set the additional motors mode.
+
+        Parameters
+        ----------
+        mode : str
+            P to run the additional motors in parallel with the movement, S to run them
+            in series
+        """
+        self.additional_motors_mode = mode
+
+    def change_speed(self, direction: int) -> None:
+        """Change the robot speed by one step, within 0 and 1000 degrees per second.
+
+        Parameters
+        ----------
+        direction : int
+            1 speeds the robot up, -1 slows it down
+        """
+        if direction > 0 and self.speed_dps < MAX_SPEED_DPS:
+            self.speed_dps += self.settings.speed_steps
+        elif direction < 0 and self.speed_dps > 0:
+            self.speed_dps -= self.settings.speed_steps
+
+    def live_waypoint(self) -> np.ndarray:
+        """Get the waypoint of the live robot.
+
+        Returns
+        -------
+        np.ndarray
+            the live robot waypoint record
+        """
+        return waypoint(
+            self.live_box(),
+            -self.displayed_theta
+            if self.settings.gyro_positive_direction
+            else self.displayed_theta,
+            self.additional_motor_1,
+            self.additional_motor_2,
+            self.additional_motors_mode,
+            self.speed_dps,
+        )
+
+    def _commit(self) -> None:
+        """Reset the additional motors rotations once the live robot is saved."""
+        self.additional_motor_1 = 0
+        self.additional_motor_2 = 0
+
+    def save_waypoint(self) -> None:
+        """Save the live robot pose at the end of the path."""
+        self.waypoints.append(self.live_waypoint())
+        self.index.append(self.waypoints.boxes[-1])
+        self._commit()
+
+    def _route_waypoint(self, center: np.ndarray, theta: int, angle: int, speed: int) -> np.ndarray:
+        """Create a waypoint of the robot centered on a route point."""
+        length: int = self.settings.robot_length_x_pixels
+        width: int = self.settings.robot_width_y_pixels
+        box: np.ndarray = robot_box(center - (length / 2, width / 2), length, width, theta)
+        return waypoint(box, angle, 0, 0, "S", speed)
+
+    def route_waypoints(self) -> List[np.ndarray]:
+        """Plan the route from the last saved waypoint to the live robot.
+
+        The robot turns in place to face every straight part of the route and drives
+        forward along it.
+
+        Returns
+        -------
+        List[np.ndarray]
+            the waypoints between the last saved waypoint and the live robot, empty
+            when there are no obstacles or no route around them
+        """
+        if not len(self.waypoints) or self.obstacles is None:
+            return []
+        if self._routes is None or self._routes.obstacles is not self.obstacles:
+            self._routes = RoutePlanner(self.obstacles)
+        length: int = self.settings.robot_length_x_pixels
+        width: int = self.settings.robot_width_y_pixels
+        start: np.ndarray = self.waypoints[-1]
+        live_box: np.ndarray = self.live_box()
+        corners: Optional[np.ndarray] = self._routes.plan(
+            start["box"].mean(axis=0),
+            live_box.mean(axis=0),
+            np.hypot(length, width) / 2,
+            max(min(length, width) // ROUTE_CELLS_PER_SIDE, 1),
+        )
+        if corners is None:
+            logging.warning("no route around the obstacles, the live robot is saved as is")
+            return []
+        return self._corner_waypoints(start, corners, live_box)
+
+    def _corner_waypoints(
+        self, start: np.ndarray, corners: np.ndarray, goal_box: np.ndarray
+    ) -> List[np.ndarray]:
+        """Create the waypoints that turn to face and drive along the parts of a route."""
+        # the saved angles follow the robot heading, mirrored for a positive gyro
+        sign: int = -1 if self.settings.gyro_positive_direction else 1
+        theta: int = int(round(robot_heading(start["box"])))
+        angle: int = int(start["displayed_theta"])
+        records: List[np.ndarray] = []
+        for previous, corner in zip(corners[:-1], corners[1:]):
+            if np.allclose(previous, corner):
+                continue
+            heading: float = np.degrees(np.arctan2(*(previous - corner)))
+            turn: int = int(round((heading - theta + 180) % 360 - 180))
+            if turn:
+                theta, angle = theta + turn, angle + sign * turn
+                records.append(self._route_waypoint(previous, theta, angle, start["speed_dps"]))
+            records.append(self._route_waypoint(corner, theta, angle, start["speed_dps"]))
+        if records and np.allclose(records[-1]["box"], goal_box):
+            records.pop()
+        return records
+
+    def route_to_live(self) -> None:
+        """Save the live robot pose, reached around the obstacles from the last waypoint.
+
+        The route waypoints and the live robot pose are undone as one edit.
+        """
+        records: List[np.ndarray] = self.route_waypoints() + [self.live_waypoint()]
+        start: int = len(self.waypoints)
+        self.waypoints.insert_many(start, np.array(records, dtype=WAYPOINT_DTYPE))
+        self.index.insert(start, self.waypoints.boxes[start:])
+        self._commit()
+
+    def optimize_visit_order(self) -> None:
+        """Visit the saved waypoints between the first and the last one in the fastest order.
+
+        The waypoints are the mission targets, the robot turns to face the next target,
+        drives forward to it and turns to its heading, these waypoints are saved
+        between the targets. The change is undone as one edit.
+        """
+        if len(self.waypoints) < 4:
+            return
+        targets: np.ndarray = self.waypoints.records.copy()
+        speed: int = int(targets[0]["speed_dps"])
+        if self._visits is None or self._visits.speed_dps != speed:
+            model = get_robot_model()
+            mm_per_pixel: float = (
+                stud_to_mm(self.settings.robot_length) / self.settings.robot_length_x_pixels
+            )
+            self._visits = VisitOrder(
+                model, mm_per_pixel * 360 / (np.pi * model.wheel_diameter_mm), speed
+            )
+        order: List[int] = self._visits.order(
+            targets["box"].mean(axis=1), robot_heading(targets["box"])
+        )
+        # the saved angles follow the robot heading, mirrored for a positive gyro
+        sign: int = -1 if self.settings.gyro_positive_direction else 1
+        visits: List[np.ndarray] = [targets[order[0]]]
+        for index in order[1:]:
+            corners: np.ndarray = np.stack(
+                [visits[-1]["box"].mean(axis=0), targets[index]["box"].mean(axis=0)]
+            )
+            visits.extend(self._corner_waypoints(visits[-1], corners, targets[index]["box"]))
+            # the target turns the shortest way from the last heading, so its saved angle
+            # continues the previous one instead of keeping the turns it was saved after
+            target: np.ndarray = targets[index].copy()
+            turn: float = robot_heading(target["box"]) - robot_heading(visits[-1]["box"])
+            target["displayed_theta"] = visits[-1]["displayed_theta"] + sign * int(
+                round((turn + 180) % 360 - 180)
+            )
+            visits.append(target)
+        self.waypoints.replace(np.array(visits, dtype=WAYPOINT_DTYPE))
+        self.index.rebuild(self.waypoints.boxes)
+        self.selected = None
+
+    def restore_waypoints(self, records: np.ndarray) -> None:
+        """Replace the saved waypoints, without undo history.
+
+        Parameters
+        ----------
+        records : np.ndarray
+            the waypoints, a WAYPOINT_DTYPE array
+        """
+        self.waypoints = WaypointStore(len(records))
+        self.waypoints.extend(records)
+        self.index.rebuild(self.waypoints.boxes)
+        self.selected = None
+
+    def select(self, step: int) -> None:
+        """Select the previous or the next saved waypoint.
+
+        Parameters
+        ----------
+        step : int
+            -1 selects the previous waypoint, the last one when nothing is selected,
+            1 selects the next waypoint, nothing after the last one
+        """
+        if not len(self.waypoints):
+            self.selected = None
+        elif self.selected is None:
+            self.selected = len(self.waypoints) - 1 if step < 0 else 0
+        else:
+            index: int = self.selected + step
+            self.selected = max(index, 0) if index < len(self.waypoints) else None
+
+    def replace_selected(self) -> None:
+        """Replace the selected waypoint with the live robot pose."""
+        if self.selected is not None:
+            self.waypoints.modify(self.selected, self.live_waypoint())
+            self.index.update(self.selected, self.waypoints.boxes[self.selected])
+            self._commit()
+
+    def insert_after_selected(self) -> None:
+        """Insert the live robot pose after the selected waypoint and select it."""
+        if self.selected is None:
+            self.save_waypoint()
+            return
+        self.selected += 1
+        self.waypoints.insert(self.selected, self.live_waypoint())
+        self.index.insert(self.selected, self.waypoints.boxes[self.selected])
+        self._commit()
+
+    def delete_selected(self) -> None:
+        """Delete the selected waypoint and select the one before it."""
+        if self.selected is None:
+            return
+        self.waypoints.delete(self.selected)
+        self.index.delete(self.selected)
+        self.selected = max(self.selected - 1, 0) if len(self.waypoints) else None
+
+    def undo(self) -> None:
+        """Revert the last waypoints edit and select the edited waypoint."""
+        self._select_edited(self.waypoints.undo())
+
+    def redo(self) -> None:
+        """Apply the last reverted waypoints edit again and select the edited waypoint."""
+        self._select_edited(self.waypoints.redo())
+
+    def _select_edited(self, index: Optional[int]) -> None:
+        if index is not None:
+            self._index_change()
+            self.selected = min(index, len(self.waypoints) - 1) if len(self.waypoints) else None
+
+    def _index_change(self) -> None:
+        """Update the spatial index after the last undone or redone edit."""
+        operation, index, count = self.waypoints.last_change
+        if operation == INSERT:
+            self.index.insert(index, self.waypoints.boxes[index : index + count])
+        elif operation == DELETE:
+            self.index.delete(index, count)
+        elif operation == MODIFY:
+            self.index.update(index, self.waypoints.boxes[index])
+        else:
+            self.index.rebuild(self.waypoints.boxes)
+
+    def waypoint_at(self, point: np.ndarray, max_distance: float) -> Optional[int]:
+        """Find the saved waypoint at a point.
+
+        Parameters
+        ----------
+        point : np.ndarray
+            the (x, y) point in the mat image pixels
+        max_distance : float
+            the farthest waypoint center picked when no waypoint contains the point
+
+        Returns
+        -------
+        Optional[int]
+            the waypoint index, None when there is no waypoint at the point
+        """
+        index: Optional[int] = self.index.hit_test(point)
+        return self.index.nearest(point, max_distance) if index is None else index
+
+    def begin_drag(self, index: int, point: np.ndarray) -> None:
+        """Select a saved waypoint and start moving it.
+
+        Parameters
+        ----------
+        index : int
+            the waypoint index
+        point : np.ndarray
+            the grabbed (x, y) point in the mat image pixels
+        """
+        self.selected = index
+        self._drag = (index, self.waypoints[index], np.asarray(point, dtype=float))
+
+    def drag_to(self, point: np.ndarray) -> None:
+        """Move the dragged waypoint with the grabbed point.
+
+        Parameters
+        ----------
+        point : np.ndarray
+            the (x, y) point in the mat image pixels
+        """
+        if self._drag is None:
+            return
+        index, original, grabbed = self._drag
+        record: np.ndarray = original.copy()
+        record["box"] = original["box"] + (np.asarray(point, dtype=float) - grabbed)
+        self.waypoints.overwrite(index, record)
+        self.index.update(index, record["box"])
+
+    def end_drag(self) -> bool:
+        """Drop the dragged waypoint, the move is undone as one edit.
+
+        Returns
+        -------
+        bool
+            True when a waypoint was dragged
+        """
+        if self._drag is None:
+            return False
+        index, original, _ = self._drag
+        self._drag = None
+        moved: np.ndarray = self.waypoints[index]
+        self.waypoints.overwrite(index, original)
+        self.waypoints.modify(index, moved)
+        return True
+
+    def finish(self) -> None:
+        """End the planning session."""
+        self.finished = True
+
+    def handle_key(self, key: int) -> bool:
+        """Apply a key press.
+
+        Parameters
+        ----------
+        key : int
+            the key code
+
+        Returns
+        -------
+        bool
+            True when the key is a planning key
+        """
+        action = PLANNER_KEYS.get(key)
+        if action is None:
+            return False
+        action(self)
+        return True
+
+    def result(self) -> Tuple[list, list, list, list, list, list]:
+        """Get the saved waypoints.
+
+        Returns
+        -------
+        Tuple[list, list, list, list, list, list]
+            the robot boxes, the displayed angles, the first and second additional
+            motors rotations, the additional motors modes and the speeds
+        """
+        return self.waypoints.columns()
+
+
+# keys that drive the planning session
+PLANNER_KEYS: Dict[int, Callable[[PlannerState], None]] = {
+    ord("w"): partial(PlannerState.move, dx=0, dy=-1),
+    ord("s"): partial(PlannerState.move, dx=0, dy=1),
+    ord("a"): partial(PlannerState.move, dx=-1, dy=0),
+    ord("d"): partial(PlannerState.move, dx=1, dy=0),
+    ord(","): partial(PlannerState.rotate, direction=1),
+    ord("."): partial(PlannerState.rotate, direction=-1),
+    ord("y"): PlannerState.reset_displayed_theta,
+    ord("z"): partial(PlannerState.change_additional_motor, motor=1, direction=1),
+    ord("x"): partial(PlannerState.change_additional_motor, motor=1, direction=-1),
+    ord("c"): partial(PlannerState.change_additional_motor, motor=2, direction=1),
+    ord("v"): partial(PlannerState.change_additional_motor, motor=2, direction=-1),
+    ord("r"): partial(PlannerState.set_additional_motors_mode, mode="P"),
+    ord("t"): partial(PlannerState.set_additional_motors_mode, mode="S"),
+    ord("m"): partial(PlannerState.change_speed, direction=1),
+    ord("n"): partial(PlannerState.change_speed, direction=-1),
+    SAVE_KEY: PlannerState.save_waypoint,
+    ord("/"): PlannerState.route_to_live,
+    ord(";"): PlannerState.optimize_visit_order,
+    ord("["): partial(PlannerState.select, step=-1),
+    ord("]"): partial(PlannerState.select, step=1),
+    ord("e"): PlannerState.replace_selected,
+    ord("f"): PlannerState.insert_after_selected,
+    ord("b"): PlannerState.delete_selected,
+    ord("u"): PlannerState.undo,
+    ord("o"): PlannerState.redo,
+    QUIT_KEY: PlannerState.finish,
+}
+
+
+def key_codes(keys: Union[str, Iterable[Union[int, str]]]) -> Iterable[int]:
+    """Convert key presses to key codes.
+
+    Parameters
+    ----------
+    keys : Union[str, Iterable[Union[int, str]]]
+        the key characters or codes
+
+    Yields
+    ------
+    int
+        the key codes
+    """
+    for key in keys:
+        yield ord(key) if isinstance(key, str) else key
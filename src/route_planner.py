@@ -0,0 +1,225 @@
+"""This module contains the route planning of the robot around the mat obstacles."""
+import heapq
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from src.collision import ObstacleMask
+
+# the searched routes kept per occupancy grid
+ROUTE_CACHE_SIZE: int = 256
+# the grid neighbors, their row and column offsets and their lengths in cells
+NEIGHBORS: Tuple[Tuple[int, int, float], ...] = tuple(
+    (row, column, float(np.hypot(row, column)))
+    for row in (-1, 0, 1)
+    for column in (-1, 0, 1)
+    if row or column
+)
+# the extra length of a diagonal step over a straight one
+DIAGONAL_EXTRA: float = float(np.sqrt(2) - 1)
+# the line of sight samples per cell
+SIGHT_SAMPLES: int = 4
+
+Cell = Tuple[int, int]
+
+
+def occupancy_grid(mask: np.ndarray, cell_size: int, clearance: float) -> np.ndarray:
+    """Get the cells the robot center can not be in.
+
+    Parameters
+    ----------
+    mask : np.ndarray
+        the obstacles mask, nonzero pixels are obstacles
+    cell_size : int
+        the cell side in pixels
+    clearance : float
+        the distance in pixels the robot center keeps from the obstacles
+
+    Returns
+    -------
+    np.ndarray
+        the blocked cells, a boolean array with one row per cell_size pixel rows
+    """
+    height, width = mask.shape
+    rows, columns = -(-height // cell_size), -(-width // cell_size)
+    padded: np.ndarray = np.zeros((rows * cell_size, columns * cell_size), dtype=np.uint8)
+    padded[:height, :width] = mask
+    cells: np.ndarray = padded.reshape(rows, cell_size, columns, cell_size).max(axis=(1, 3))
+    # one more cell, the robot center and the obstacle can be anywhere in their cells
+    radius: int = int(np.ceil(clearance / cell_size)) + 1
+    kernel: np.ndarray = cv2.getStructuringElement(
+        cv2.MORPH_ELLIPSE, (2 * radius + 1, 2 * radius + 1)
+    )
+    return cv2.dilate(cells, kernel) > 0
+
+
+class RoutePlanner:
+    """Shortest routes of the robot center around the obstacles of the mat.
+
+    The obstacles are max pooled to a grid and grown by the robot clearance, so the
+    robot can turn in place anywhere on a route. A route is searched with A* on the
+    8-connected grid and its corners are cut where the straight line stays free, so
+    it has the fewest turns. The grid and the searched routes are cached until the
+    obstacles, the clearance or the cell size change.
+    """
+
+    def __init__(self, obstacles: ObstacleMask):
+        """Class Constructor.
+
+        Parameters
+        ----------
+        obstacles : ObstacleMask
+            the mat obstacles, painting them is picked up by their version
+        """
+        self.obstacles = obstacles
+        self._key: Optional[Tuple[int, float, int]] = None
+        self._blocked: np.ndarray = np.zeros((0, 0), dtype=bool)
+        self._routes: Dict[Tuple[Cell, Cell], Optional[List[Cell]]] = {}
+
+    def blocked(self, clearance: float, cell_size: int) -> np.ndarray:
+        """Get the cached occupancy grid.
+
+        Parameters
+        ----------
+        clearance : float
+            the distance in pixels the robot center keeps from the obstacles
+        cell_size : int
+            the cell side in pixels
+
+        Returns
+        -------
+        np.ndarray
+            the blocked cells, see occupancy_grid
+        """
+        key: Tuple[int, float, int] = (self.obstacles.version, clearance, cell_size)
+        if key != self._key:
+            self._blocked = occupancy_grid(self.obstacles.mask, cell_size, clearance)
+            self._routes.clear()
+            self._key = key
+        return self._blocked
+
+    def _visible(self, blocked: np.ndarray, start: Cell, end: Cell) -> bool:
+        """Check if the straight line between two cell centers only crosses free cells."""
+        samples: int = SIGHT_SAMPLES * max(abs(end[0] - start[0]), abs(end[1] - start[1])) + 1
+        rows: np.ndarray = np.rint(np.linspace(start[0], end[0], samples)).astype(int)
+        columns: np.ndarray = np.rint(np.linspace(start[1], end[1], samples)).astype(int)
+        return not blocked[rows, columns].any()
+
+    def _search(self, blocked: np.ndarray, start: Cell, goal: Cell) -> Optional[List[Cell]]:
+        """Search the shortest 8-connected cells path with A*."""
+        rows, columns = blocked.shape
+        free: List[bool] = (~blocked).ravel().tolist()
+        goal_row, goal_column = goal
+        costs: Dict[int, float] = {start[0] * columns + start[1]: 0.0}
+        parents: Dict[int, int] = {}
+        queue: List[Tuple[float, float, int]] = [(0.0, 0.0, start[0] * columns + start[1])]
+        goal_index: int = goal_row * columns + goal_column
+        while queue:
+            _, cost, index = heapq.heappop(queue)
+            if index == goal_index:
+                path: List[Cell] = [goal]
+                while index in parents:
+                    index = parents[index]
+                    path.append(divmod(index, columns))
+                return path[::-1]
+            if cost > costs[index]:
+                continue
+            row, column = divmod(index, columns)
+            for row_step, column_step, length in NEIGHBORS:
+                next_row, next_column = row + row_step, column + column_step
+                if not (0 <= next_row < rows and 0 <= next_column < columns):
+                    continue
+                next_index: int = next_row * columns + next_column
+                # the diagonal steps do not cut the corners of the blocked cells
+                if not free[next_index] or (
+                    row_step
+                    and column_step
+                    and not (
+                        free[row * columns + next_column] and free[next_row * columns + column]
+                    )
+                ):
+                    continue
+                next_cost: float = cost + length
+                if next_cost < costs.get(next_index, float("inf")):
+                    costs[next_index] = next_cost
+                    parents[next_index] = index
+                    row_distance: int = abs(goal_row - next_row)
+                    column_distance: int = abs(goal_column - next_column)
+                    # the octile distance, the length of the shortest path without obstacles
+                    heuristic: float = max(row_distance, column_distance) + DIAGONAL_EXTRA * min(
+                        row_distance, column_distance
+                    )
+                    heapq.heappush(queue, (next_cost + heuristic, next_cost, next_index))
+        return None
+
+    def _shortcut(self, blocked: np.ndarray, path: List[Cell]) -> List[Cell]:
+        """Keep only the cells where the route has to turn."""
+        steps: np.ndarray = np.diff(np.array(path), axis=0)
+        # the route can only turn where the cells path turns
+        turns: np.ndarray = np.flatnonzero((steps[1:] != steps[:-1]).any(axis=1)) + 1
+        candidates: List[Cell] = [path[0], *(path[turn] for turn in turns), path[-1]]
+        corners: List[Cell] = [candidates[0]]
+        index: int = 0
+        while index < len(candidates) - 1:
+            farthest: int = len(candidates) - 1
+            while farthest > index + 1 and not self._visible(
+                blocked, candidates[index], candidates[farthest]
+            ):
+                farthest -= 1
+            corners.append(candidates[farthest])
+            index = farthest
+        return corners
+
+    def plan(
+        self,
+        start: Sequence[float],
+        goal: Sequence[float],
+        clearance: float,
+        cell_size: int,
+    ) -> Optional[np.ndarray]:
+        """Plan the route of the robot center.
+
+        Parameters
+        ----------
+        start : Sequence[float]
+            the (x, y) start point in the mat image pixels
+        goal : Sequence[float]
+            the (x, y) goal point in the mat image pixels
+        clearance : float
+            the distance in pixels the robot center keeps from the obstacles, half of
+            the robot diagonal lets the robot turn anywhere on the route
+        cell_size : int
+            the cell side in pixels
+
+        Returns
+        -------
+        Optional[np.ndarray]
+            the route corners from start to goal in the mat image pixels, with shape
+            (corners, 2), None when the start or the goal is too close to an obstacle
+            or the goal can not be reached
+        """
+        blocked: np.ndarray = self.blocked(clearance, cell_size)
+        limits: np.ndarray = np.array(blocked.shape[::-1]) - 1
+        start_cell, goal_cell = (
+            tuple(np.clip(np.asarray(point) // cell_size, 0, limits).astype(int)[::-1].tolist())
+            for point in (start, goal)
+        )
+        if blocked[start_cell] or blocked[goal_cell]:
+            return None
+        key: Tuple[Cell, Cell] = (start_cell, goal_cell)
+        if key not in self._routes:
+            if self._visible(blocked, start_cell, goal_cell):
+                cells: Optional[List[Cell]] = [start_cell, goal_cell]
+            else:
+                path: Optional[List[Cell]] = self._search(blocked, start_cell, goal_cell)
+                cells = None if path is None else self._shortcut(blocked, path)
+            if len(self._routes) >= ROUTE_CACHE_SIZE:
+                del self._routes[next(iter(self._routes))]
+            self._routes[key] = cells
+        cells = self._routes[key]
+        if cells is None:
+            return None
+        # the corners are the centers of their cells, the route ends on the exact points
+        corners: np.ndarray = np.array(cells[1:-1], dtype=float).reshape(-1, 2)[:, ::-1]
+        return np.vstack([start, (corners + 0.5) * cell_size, goal]).astype(float)
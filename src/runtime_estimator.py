@@ -0,0 +1,181 @@
+"""This module contains the execution time estimation of the written script."""
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+from src.configs import get_config
+from src.converters import stud_to_mm
+from src.motion_profile import move_durations
+
+# the time of the motors reset, the brake and the gyro settling of every command
+DEFAULT_COMMAND_OVERHEAD_S: float = 0.2
+# the proportional gain of PID_turn when it is not configured
+DEFAULT_TURN_KP: float = 1.0
+# the wheel diameter and the distance between the wheels when they are not configured, in mm
+DEFAULT_WHEEL_DIAMETER_MM: float = 56.0
+DEFAULT_TRACK_WIDTH_MM: float = 120.0
+# the highest speed of a LARGE motor
+LARGE_MOTOR_MAX_DPS: float = 1050.0
+# the speed the MEDIUM motors are run at by the written script
+MEDIUM_MOTOR_SPEED_DPS: int = 500
+# the gyro angle error PID_turn stops at
+TURN_TOLERANCE_DEGREES: float = 1.0
+
+
+class RobotModel(NamedTuple):
+    """The robot timings used to estimate the script execution time."""
+
+    command_overhead_s: float
+    turn_kp: float
+    wheel_diameter_mm: float
+    track_width_mm: float
+
+    @property
+    def turn_gain(self) -> float:
+        """The robot turn rate per degree of PID_turn error, in 1 / s."""
+        return self.turn_kp * self.wheel_diameter_mm / self.track_width_mm
+
+    @property
+    def max_turn_rate_dps(self) -> float:
+        """The robot turn rate with both wheels at their highest speed."""
+        return LARGE_MOTOR_MAX_DPS * self.wheel_diameter_mm / self.track_width_mm
+
+
+DEFAULT_ROBOT_MODEL = RobotModel(
+    DEFAULT_COMMAND_OVERHEAD_S, DEFAULT_TURN_KP, DEFAULT_WHEEL_DIAMETER_MM, DEFAULT_TRACK_WIDTH_MM
+)
+
+
+class RuntimeEstimate(NamedTuple):
+    """The estimated execution time of every command of the written script."""
+
+    steps_s: np.ndarray
+    total_s: float
+
+    def slowest(self, count: int = 5) -> List[int]:
+        """Get the slowest commands.
+
+        Parameters
+        ----------
+        count : int, optional
+            the number of commands, by default 5
+
+        Returns
+        -------
+        List[int]
+            the commands indexes, the slowest first
+        """
+        return np.argsort(-self.steps_s, kind="stable")[:count].tolist()
+
+    def summary(self, count: int = 5) -> str:
+        """Describe the total time and the slowest commands.
+
+        Parameters
+        ----------
+        count : int, optional
+            the number of slowest commands, by default 5
+
+        Returns
+        -------
+        str
+            the description, the commands are named like in the written script
+        """
+        slowest: str = ", ".join(
+            f"move_{index + 1} ({self.steps_s[index]:.1f} s)" for index in self.slowest(count)
+        )
+        return f"estimated runtime {self.total_s:.1f} s, slowest commands: {slowest}"
+
+
+def turn_durations(angles_difference: np.ndarray, model: RobotModel) -> np.ndarray:
+    """Get the time PID_turn takes to turn the robot.
+
+    PID_turn drives the wheels in opposite directions at the angle error times kp,
+    so the robot turns at its highest rate while the wheels are saturated and then
+    closes the error exponentially.
+
+    Parameters
+    ----------
+    angles_difference : np.ndarray
+        the turns in degrees
+    model : RobotModel
+        the robot timings
+
+    Returns
+    -------
+    np.ndarray
+        the turns durations in seconds
+    """
+    error: np.ndarray = np.abs(np.asarray(angles_difference, dtype=float))
+    saturated_error: float = LARGE_MOTOR_MAX_DPS / model.turn_kp
+    closing: np.ndarray = np.clip(error, TURN_TOLERANCE_DEGREES, saturated_error)
+    durations: np.ndarray = (error - np.minimum(error, saturated_error)) / model.max_turn_rate_dps
+    durations += np.log(closing / TURN_TOLERANCE_DEGREES) / model.turn_gain
+    return durations
+
+
+def estimate_path_runtime(
+    path: np.ndarray, model: RobotModel = DEFAULT_ROBOT_MODEL
+) -> RuntimeEstimate:
+    """Estimate the execution time of every command of the written script.
+
+    Every waypoint is one command, a move, an arc or a turn followed by the MEDIUM
+    motors of the waypoint. The motors run after the move in the Series mode and with it in
+    the Parallel mode. Every command also resets the motors and settles the robot.
+
+    Parameters
+    ----------
+    path : np.ndarray
+        the path, see path_creation.create_path_array
+    model : RobotModel, optional
+        the robot timings, by default DEFAULT_ROBOT_MODEL
+
+    Returns
+    -------
+    RuntimeEstimate
+        the commands durations and their total in seconds
+    """
+    steps: np.ndarray = path[:-1]
+    # the outer wheel of an arc drives at the step speed
+    arcs: np.ndarray = path["action"][1:] == "arc"
+    wheel_degrees: np.ndarray = np.abs(steps["distance_degrees"]) + np.abs(steps["arc_degrees"]) / 2
+    travel_s: np.ndarray = np.zeros(len(path))
+    travel_s[:-1] = np.where(
+        (steps["angles_difference"] == 0) | arcs,
+        move_durations(wheel_degrees, steps["speed"], steps["acceleration"]),
+        turn_durations(steps["angles_difference"], model),
+    )
+    motors_s: np.ndarray = (
+        np.maximum(np.abs(path["additional_motor_1"]), np.abs(path["additional_motor_2"]))
+        / MEDIUM_MOTOR_SPEED_DPS
+    )
+    steps_s: np.ndarray = model.command_overhead_s + np.where(
+        path["additional_motors_mode"] == "P",
+        np.maximum(travel_s, motors_s),
+        travel_s + motors_s,
+    )
+    return RuntimeEstimate(steps_s, float(steps_s.sum()))
+
+
+def get_robot_model() -> RobotModel:
+    """Get the robot timings from the configurations file.
+
+    Returns
+    -------
+    RobotModel
+        the ``runtime_estimator.command_overhead_s``, the ``pid_constants.kp``, the
+        wheel diameter and the robot width as the distance between the wheels, the
+        defaults for the missing values
+    """
+    try:
+        overhead_s: Optional[float] = get_config("runtime_estimator.command_overhead_s")
+        kp: Optional[float] = get_config("pid_constants.kp")
+        wheel_diameter: Optional[float] = get_config("robot_dimensions.wheel_diameter")
+        width_studs: Optional[int] = get_config("robot_dimensions.width_y")
+    except KeyError:
+        overhead_s = kp = wheel_diameter = width_studs = None
+    return RobotModel(
+        float(overhead_s or DEFAULT_COMMAND_OVERHEAD_S),
+        float(kp or DEFAULT_TURN_KP),
+        float(wheel_diameter or DEFAULT_WHEEL_DIAMETER_MM),
+        float(stud_to_mm(width_studs) if width_studs else DEFAULT_TRACK_WIDTH_MM),
+    )
@@ -0,0 +1,272 @@
+"""This module contains the crash-safe journal of the planning session."""
+import logging
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Optional, Tuple
+
+import numpy as np
+
+from src.configs import get_config
+from src.planner_state import EDIT_KEYS, SAVE_KEY, PlannerState
+from src.waypoint_store import WAYPOINT_DTYPE
+
+DEFAULT_JOURNAL_PATH: str = os.path.join(Path(__file__).parent.parent, ".cache", "session.journal")
+DEFAULT_COMPACT_EVERY: int = 1024
+JOURNAL_MAGIC: bytes = b"EV3PJRNL"
+JOURNAL_VERSION: int = 2
+# magic, version, record size, mat image height and width
+HEADER_FORMAT: str = "<8sHHII"
+HEADER_SIZE: int = struct.calcsize(HEADER_FORMAT)
+
+# a key that changed the live robot
+KEY_EVENT: int = 0
+# a key that saved a waypoint, the waypoint field holds it
+SAVE_EVENT: int = 1
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("event", "u1"),
+        ("key", "<i4"),
+        ("corner", "<i8", (2,)),
+        ("theta", "<i8"),
+        ("displayed_theta", "<i8"),
+        ("motors", "<i8", (2,)),
+        ("mode", "S1"),
+        ("speed", "<i8"),
+        ("waypoint", WAYPOINT_DTYPE),
+    ]
+)
+
+
+def _state_record(state: PlannerState, event: int, key: int) -> np.ndarray:
+    """Snapshot the live robot of the state in a record."""
+    record = np.zeros((), dtype=RECORD_DTYPE)
+    record["event"] = event
+    record["key"] = key
+    record["corner"] = state.robot_top_left_corner
+    record["theta"] = state.theta
+    record["displayed_theta"] = state.displayed_theta
+    record["motors"] = (state.additional_motor_1, state.additional_motor_2)
+    record["mode"] = state.additional_motors_mode
+    record["speed"] = state.speed_dps
+    return record
+
+
+def _save_record(state: PlannerState, index: int, key: int = SAVE_KEY) -> np.ndarray:
+    """Snapshot the live robot and a saved waypoint of the state in a record."""
+    record: np.ndarray = _state_record(state, SAVE_EVENT, key)
+    record["waypoint"] = state.waypoints.records[index]
+    return record
+
+
+class SessionJournal:
+    """Append-only binary journal of the planning session.
+
+    Every handled key appends a fixed size record with the resulting live robot, the
+    keys that save a waypoint also hold the saved waypoint. The file is flushed on
+    every record and synced to the disk on every saved waypoint. A torn last record
+    is dropped, so the session is recovered up to the last complete key. Recovering
+    reads every record in one array and rebuilds the state without replaying the
+    keys. The journal is rewritten with one record per waypoint periodically and
+    after every edit of the saved waypoints, the undo history is not journaled.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        image_size: Tuple[int, int],
+        compact_every: int = DEFAULT_COMPACT_EVERY,
+    ):
+        """Class Constructor.
+
+        Parameters
+        ----------
+        path : str
+            the journal file path
+        image_size : Tuple[int, int]
+            the mat image height and width, a journal of another mat size is discarded
+        compact_every : int, optional
+            the records appended between compactions, by default 1024
+        """
+        self.path = path
+        self.image_size = image_size
+        self.compact_every = compact_every
+        self.appended: int = 0
+        self._file: Optional[BinaryIO] = None
+        self._header: bytes = struct.pack(
+            HEADER_FORMAT, JOURNAL_MAGIC, JOURNAL_VERSION, RECORD_DTYPE.itemsize, *image_size
+        )
+
+    def __enter__(self) -> "SessionJournal":
+        """Open the journal on entering the context."""
+        return self.open()
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the journal on leaving the context."""
+        self.close()
+
+    def read(self) -> np.ndarray:
+        """Read the complete records of the journal.
+
+        Returns
+        -------
+        np.ndarray
+            the records, empty when there is no journal of this mat size
+        """
+        try:
+            with open(self.path, "rb") as journal_file:
+                header: bytes = journal_file.read(HEADER_SIZE)
+                if header != self._header:
+                    logging.warning(
+                        f"ignoring the session journal {self.path}, it is not a journal of this mat"
+                    )
+                    return np.zeros(0, dtype=RECORD_DTYPE)
+                # a torn last record is not read
+                size: int = os.fstat(journal_file.fileno()).st_size - HEADER_SIZE
+                return np.fromfile(
+                    journal_file, dtype=RECORD_DTYPE, count=size // RECORD_DTYPE.itemsize
+                )
+        except FileNotFoundError:
+            return np.zeros(0, dtype=RECORD_DTYPE)
+
+    def recover(self, state: PlannerState) -> int:
+        """Rebuild the state of an interrupted session.
+
+        Parameters
+        ----------
+        state : PlannerState
+            the new session state, its live robot and saved waypoints are replaced
+
+        Returns
+        -------
+        int
+            the number of recovered records, 0 when there is nothing to recover
+        """
+        records: np.ndarray = self.read()
+        if not len(records):
+            return 0
+        state.restore_waypoints(records[records["event"] == SAVE_EVENT]["waypoint"])
+
+        last: np.ndarray = records[-1]
+        state.robot_top_left_corner = last["corner"].copy()
+        state.theta = int(last["theta"])
+        state.displayed_theta = int(last["displayed_theta"])
+        state.additional_motor_1, state.additional_motor_2 = last["motors"].tolist()
+        state.additional_motors_mode = last["mode"].decode()
+        state.speed_dps = int(last["speed"])
+        return len(records)
+
+    def open(self) -> "SessionJournal":
+        """Open the journal for appending, dropping a torn last record.
+
+        Returns
+        -------
+        SessionJournal
+            the journal itself
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        records: int = len(self.read())
+        if not records:
+            self._file = open(self.path, "wb")
+            self._file.write(self._header)
+            self._file.flush()
+            return self
+        self._file = open(self.path, "r+b")
+        self._file.truncate(HEADER_SIZE + records * RECORD_DTYPE.itemsize)
+        self._file.seek(0, os.SEEK_END)
+        return self
+
+    def append(self, key: int, state: PlannerState) -> None:
+        """Record a handled key.
+
+        Parameters
+        ----------
+        key : int
+            the handled key code
+        state : PlannerState
+            the state after the key
+        """
+        if key in EDIT_KEYS:
+            # the edited waypoints are written by rewriting the journal
+            self.compact(state)
+            return
+        if key == SAVE_KEY:
+            record: np.ndarray = _save_record(state, -1)
+        else:
+            record = _state_record(state, KEY_EVENT, key)
+        self._file.write(record.tobytes())
+        self._file.flush()
+        if key == SAVE_KEY:
+            os.fsync(self._file.fileno())
+        self.appended += 1
+        if self.appended >= self.compact_every:
+            self.compact(state)
+
+    def compact(self, state: PlannerState) -> None:
+        """Rewrite the journal with one record per saved waypoint.
+
+        Parameters
+        ----------
+        state : PlannerState
+            the current session state
+        """
+        records = [_save_record(state, index) for index in range(len(state.waypoints))]
+        records.append(_state_record(state, KEY_EVENT, -1))
+        directory: str = os.path.dirname(os.path.abspath(self.path))
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(file_descriptor, "wb") as journal_file:
+                journal_file.write(self._header)
+                journal_file.write(np.stack(records).tobytes())
+                journal_file.flush()
+                os.fsync(journal_file.fileno())
+            os.replace(temporary_path, self.path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self.path, "ab")
+        self.appended = 0
+
+    def close(self) -> None:
+        """Close the journal, it is kept for recovery."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self) -> None:
+        """Close and remove the journal of a finished session."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def get_session_journal(image_size: Tuple[int, int]) -> Optional[SessionJournal]:
+    """Get the session journal configured in the configurations file.
+
+    Parameters
+    ----------
+    image_size : Tuple[int, int]
+        the mat image height and width
+
+    Returns
+    -------
+    Optional[SessionJournal]
+        the session journal, None when ``session_journal.enabled`` is False
+    """
+    try:
+        enabled: Optional[bool] = get_config("session_journal.enabled")
+        path: Optional[str] = get_config("session_journal.path")
+        compact_every: Optional[int] = get_config("session_journal.compact_every")
+    except KeyError:
+        enabled = path = compact_every = None
+    if enabled is False:
+        return None
+    return SessionJournal(
+        path or DEFAULT_JOURNAL_PATH, image_size, int(compact_every or DEFAULT_COMPACT_EVERY)
+    )
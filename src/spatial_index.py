@@ -0,0 +1,221 @@
+"""This module contains the spatial index of the saved waypoints."""
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+Cell = Tuple[int, int]
+
+
+def point_in_boxes(point: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+    """Check which convex boxes contain a point.
+
+    Parameters
+    ----------
+    point : np.ndarray
+        the (x, y) point
+    boxes : np.ndarray
+        the boxes corners in order, with shape (boxes, 4, 2)
+
+    Returns
+    -------
+    np.ndarray
+        True for every box that contains the point, on its border included
+    """
+    edges: np.ndarray = np.roll(boxes, -1, axis=1) - boxes
+    to_point: np.ndarray = point - boxes
+    cross: np.ndarray = edges[..., 0] * to_point[..., 1] - edges[..., 1] * to_point[..., 0]
+    return (cross >= 0).all(axis=1) | (cross <= 0).all(axis=1)
+
+
+class WaypointIndex:
+    """Uniform grid hash over the footprints of the saved waypoints.
+
+    Every waypoint is registered in the grid cells its bounding box covers, a hit
+    test only checks the waypoints registered in the cell of the point and a nearest
+    waypoint query only visits the cells around it, so both do not depend on the path
+    length. Moving or appending a waypoint updates its cells, inserting and deleting
+    waypoints renumber the waypoints after them without computing their cells again.
+    """
+
+    def __init__(self, cell_size: float):
+        """Class Constructor.
+
+        Parameters
+        ----------
+        cell_size : float
+            the grid cell side in pixels, about the robot size
+        """
+        self.cell_size = float(cell_size)
+        self.cells: Dict[Cell, Set[int]] = defaultdict(set)
+        self.boxes: np.ndarray = np.zeros((0, 4, 2))
+        self._footprints: List[List[Cell]] = []
+
+    def __len__(self) -> int:
+        return len(self._footprints)
+
+    def _footprint(self, box: np.ndarray) -> List[Cell]:
+        x0, y0 = np.floor(box.min(axis=0) / self.cell_size).astype(int)
+        x1, y1 = np.floor(box.max(axis=0) / self.cell_size).astype(int)
+        return [(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+
+    def _register(self, index: int, box: np.ndarray) -> None:
+        footprint: List[Cell] = self._footprint(box)
+        for cell in footprint:
+            self.cells[cell].add(index)
+        self._footprints[index] = footprint
+
+    def _unregister(self, index: int) -> None:
+        for cell in self._footprints[index]:
+            self.cells[cell].discard(index)
+            if not self.cells[cell]:
+                del self.cells[cell]
+
+    def rebuild(self, boxes: np.ndarray) -> None:
+        """Index every waypoint again.
+
+        Parameters
+        ----------
+        boxes : np.ndarray
+            the waypoints boxes, with shape (waypoints, 4, 2)
+        """
+        self.cells = defaultdict(set)
+        self.boxes = np.array(boxes, dtype=float).reshape(-1, 4, 2)
+        self._footprints = [[] for _ in range(len(self.boxes))]
+        for index, box in enumerate(self.boxes):
+            self._register(index, box)
+
+    def _reserve(self, size: int) -> None:
+        if size <= len(self.boxes):
+            return
+        # grow the boxes geometrically like the waypoints store
+        grown: np.ndarray = np.zeros((max(size, 2 * len(self.boxes), 16), 4, 2))
+        grown[: len(self._footprints)] = self.boxes[: len(self._footprints)]
+        self.boxes = grown
+
+    def _renumber(self, index: int, offset: int) -> None:
+        for cell in self._footprints[index]:
+            self.cells[cell].discard(index)
+            self.cells[cell].add(index + offset)
+
+    def append(self, box: np.ndarray) -> None:
+        """Index a waypoint saved at the end of the path.
+
+        Parameters
+        ----------
+        box : np.ndarray
+            the waypoint box, with shape (4, 2)
+        """
+        self.insert(len(self._footprints), box)
+
+    def insert(self, index: int, boxes: np.ndarray) -> None:
+        """Index waypoints inserted before a waypoint.
+
+        Parameters
+        ----------
+        index : int
+            the index of the first inserted waypoint
+        boxes : np.ndarray
+            the inserted waypoints boxes, with shape (4, 2) or (waypoints, 4, 2)
+        """
+        boxes = np.asarray(boxes, dtype=float).reshape(-1, 4, 2)
+        size: int = len(self._footprints)
+        count: int = len(boxes)
+        self._reserve(size + count)
+        # from the last waypoint, so a renumbered index is free in its cells
+        for moved in range(size - 1, index - 1, -1):
+            self._renumber(moved, count)
+        self.boxes[index + count : size + count] = self.boxes[index:size].copy()
+        self.boxes[index : index + count] = boxes
+        self._footprints[index:index] = [[] for _ in range(count)]
+        for offset, box in enumerate(boxes):
+            self._register(index + offset, box)
+
+    def delete(self, index: int, count: int = 1) -> None:
+        """Remove deleted waypoints from the index.
+
+        Parameters
+        ----------
+        index : int
+            the index of the first deleted waypoint
+        count : int, optional
+            the number of consecutive deleted waypoints, by default 1
+        """
+        size: int = len(self._footprints)
+        for deleted in range(index, index + count):
+            self._unregister(deleted)
+        # from the first waypoint, so a renumbered index is free in its cells
+        for moved in range(index + count, size):
+            self._renumber(moved, -count)
+        self.boxes[index : size - count] = self.boxes[index + count : size].copy()
+        del self._footprints[index : index + count]
+
+    def update(self, index: int, box: np.ndarray) -> None:
+        """Index a moved waypoint.
+
+        Parameters
+        ----------
+        index : int
+            the waypoint index
+        box : np.ndarray
+            the new waypoint box, with shape (4, 2)
+        """
+        self._unregister(index)
+        self.boxes[index] = box
+        self._register(index, self.boxes[index])
+
+    def _cell(self, point: np.ndarray) -> Cell:
+        x, y = np.floor(np.asarray(point) / self.cell_size).astype(int)
+        return int(x), int(y)
+
+    def hit_test(self, point: np.ndarray) -> Optional[int]:
+        """Get the waypoint under a point.
+
+        Parameters
+        ----------
+        point : np.ndarray
+            the (x, y) point in the mat image pixels
+
+        Returns
+        -------
+        Optional[int]
+            the index of the last saved waypoint that contains the point, None when
+            no waypoint contains it
+        """
+        candidates: Set[int] = self.cells.get(self._cell(point), set())
+        if not candidates:
+            return None
+        indices: np.ndarray = np.fromiter(candidates, dtype=int, count=len(candidates))
+        inside: np.ndarray = point_in_boxes(np.asarray(point, dtype=float), self.boxes[indices])
+        return int(indices[inside].max()) if inside.any() else None
+
+    def nearest(self, point: np.ndarray, max_distance: float) -> Optional[int]:
+        """Get the waypoint with the nearest center.
+
+        Parameters
+        ----------
+        point : np.ndarray
+            the (x, y) point in the mat image pixels
+        max_distance : float
+            the farthest center considered, in pixels
+
+        Returns
+        -------
+        Optional[int]
+            the index of the nearest waypoint, None when no center is close enough
+        """
+        point = np.asarray(point, dtype=float)
+        center_x, center_y = self._cell(point)
+        # a center is in a cell of its footprint, so the cells within the distance of
+        # the point cover every center close enough
+        rings: int = int(np.ceil(max_distance / self.cell_size))
+        candidates: Set[int] = set()
+        for x in range(center_x - rings, center_x + rings + 1):
+            for y in range(center_y - rings, center_y + rings + 1):
+                candidates |= self.cells.get((x, y), set())
+        if not candidates:
+            return None
+        indices: np.ndarray = np.fromiter(candidates, dtype=int, count=len(candidates))
+        distances: np.ndarray = np.linalg.norm(self.boxes[indices].mean(axis=1) - point, axis=1)
+        best: int = int(np.argmin(distances))
+        return int(indices[best]) if distances[best] <= max_distance else None
@@ -1,24 +1,47 @@
 """This module contains the utility functions for the project."""
 import logging
 from collections import namedtuple
-from typing import Optional, Tuple, Union
-
-from pydantic import BaseModel
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Optional, Tuple, Union
 
 from src.configs import get_config
 
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
 logger = logging.getLogger(__name__)
 
 
-class PIDConfigs(BaseModel):
-    """PIDConfigs object."""
+@lru_cache(maxsize=None)
+def _pid_configs_model() -> type:
+    """Build the PIDConfigs model, pydantic is only imported once PID configs are built.
+
+    Returns
+    -------
+    type
+        the PIDConfigs model class
+    """
+    from pydantic import BaseModel
+
+    class PIDConfigs(BaseModel):
+        """PIDConfigs object."""
+
+        kp: float
+        ki: float
+        kd: float
+        accepted_error: float
+        sensor: str
+        sensor_port: int
+
+    PIDConfigs.__module__ = __name__
+    return PIDConfigs
+
 
-    kp: float
-    ki: float
-    kd: float
-    accepted_error: float
-    sensor: str
-    sensor_port: int
+def __getattr__(name: str) -> Any:
+    """Get the module attributes that are built on first access."""
+    if name == "PIDConfigs":
+        return _pid_configs_model()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def extract_pid_constants(
@@ -26,7 +49,7 @@ def extract_pid_constants(
     constants: Optional[Tuple[float]] = None,
     accepted_error: Optional[float] = None,
     sensor_port: Optional[int] = None,
-) -> PIDConfigs:
+) -> "BaseModel":
     """PID control using the gyro sensor.
 
     Parameters
@@ -121,7 +144,7 @@ def extract_pid_constants(
     sensor_port: int = int(sensor_port)
     logger.info(f"sensor port: {sensor_port} from config file")
 
-    pid_configs = PIDConfigs(
+    pid_configs = _pid_configs_model()(
         **{
             "kp": kp.value,
             "ki": ki.value,
@@ -0,0 +1,261 @@
+"""This module contains the visit order optimization of the mission targets."""
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from src.motion_profile import move_durations
+from src.runtime_estimator import RobotModel, turn_durations
+
+# the most targets between the start and the end visited in the exact order
+EXACT_TARGETS: int = 12
+# the cost matrices kept
+COSTS_CACHE_SIZE: int = 16
+# the longest run of targets moved by Or-opt
+OR_OPT_LENGTH: int = 3
+# the smallest improvement of a move in seconds, so rounding errors do not loop
+IMPROVEMENT_S: float = 1e-9
+
+
+def _wrap(angles: np.ndarray) -> np.ndarray:
+    """Wrap angles in degrees to [-180, 180)."""
+    return (angles + 180) % 360 - 180
+
+
+def leg_costs(
+    centers: np.ndarray,
+    headings: np.ndarray,
+    model: RobotModel,
+    degrees_per_pixel: float,
+    speed_dps: int,
+) -> np.ndarray:
+    """Get the time to drive from every pose to every other pose.
+
+    The robot turns in place to face the next pose, drives forward to it and turns
+    to its heading, every non empty part is one command.
+
+    Parameters
+    ----------
+    centers : np.ndarray
+        the robot centers in the mat image pixels, with shape (N, 2)
+    headings : np.ndarray
+        the robot headings in degrees, see planner_state.robot_heading
+    model : RobotModel
+        the robot timings
+    degrees_per_pixel : float
+        the wheel degrees of a mat image pixel
+    speed_dps : int
+        the robot speed
+
+    Returns
+    -------
+    np.ndarray
+        the costs in seconds, with shape (N, N), the row is the pose driven from
+    """
+    offsets: np.ndarray = centers[None, :, :] - centers[:, None, :]
+    distances: np.ndarray = np.hypot(offsets[..., 0], offsets[..., 1])
+    moving: np.ndarray = distances > 0
+    travel: np.ndarray = np.degrees(np.arctan2(-offsets[..., 0], -offsets[..., 1]))
+    # without a move the robot only turns from one heading to the other
+    travel = np.where(moving, travel, headings[:, None])
+    first_turn: np.ndarray = np.rint(_wrap(travel - headings[:, None]))
+    last_turn: np.ndarray = np.rint(_wrap(headings[None, :] - travel))
+    commands: np.ndarray = (first_turn != 0).astype(int) + moving + (last_turn != 0)
+    return (
+        turn_durations(first_turn, model)
+        + move_durations(distances * degrees_per_pixel, np.full_like(distances, speed_dps), 0)
+        + turn_durations(last_turn, model)
+        + commands * model.command_overhead_s
+    )
+
+
+def order_cost(costs: np.ndarray, order: Sequence[int]) -> float:
+    """Get the time of visiting poses in order.
+
+    Parameters
+    ----------
+    costs : np.ndarray
+        the legs costs, see leg_costs
+    order : Sequence[int]
+        the poses indexes in the visit order
+
+    Returns
+    -------
+    float
+        the sum of the legs costs
+    """
+    order = np.asarray(order)
+    return float(costs[order[:-1], order[1:]].sum())
+
+
+def exact_order(costs: np.ndarray) -> List[int]:
+    """Find the fastest visit order with the Held-Karp dynamic programming.
+
+    Parameters
+    ----------
+    costs : np.ndarray
+        the legs costs, see leg_costs, the first pose is the start and the last one
+        is the end
+
+    Returns
+    -------
+    List[int]
+        the poses indexes in the visit order
+    """
+    size: int = len(costs)
+    targets: int = size - 2
+    if targets < 2:
+        return list(range(size))
+    subsets: np.ndarray = np.arange(1 << targets)
+    counts: np.ndarray = np.array([bin(subset).count("1") for subset in subsets])
+    inner: np.ndarray = costs[1:-1, 1:-1]
+    # the fastest time from the start through a subset of targets ending at a target
+    times: np.ndarray = np.full((len(subsets), targets), np.inf)
+    parents: np.ndarray = np.full((len(subsets), targets), -1)
+    times[1 << np.arange(targets), np.arange(targets)] = costs[0, 1:-1]
+    for count in range(2, targets + 1):
+        layer: np.ndarray = subsets[counts == count]
+        for target in range(targets):
+            ending: np.ndarray = layer[(layer >> target) & 1 == 1]
+            previous: np.ndarray = times[ending ^ (1 << target)] + inner[:, target]
+            parents[ending, target] = previous.argmin(axis=1)
+            times[ending, target] = previous.min(axis=1)
+    subset: int = len(subsets) - 1
+    target: int = int((times[subset] + costs[1:-1, -1]).argmin())
+    visits: List[int] = []
+    while target >= 0:
+        visits.append(target + 1)
+        subset, target = subset ^ (1 << target), int(parents[subset, target])
+    return [0, *visits[::-1], size - 1]
+
+
+def _two_opt(costs: np.ndarray, order: List[int]) -> bool:
+    """Reverse the first run of targets that makes the order faster."""
+    best: float = order_cost(costs, order)
+    for first in range(1, len(order) - 2):
+        for last in range(first + 1, len(order) - 1):
+            candidate: List[int] = order[:first] + order[first : last + 1][::-1] + order[last + 1 :]
+            if order_cost(costs, candidate) < best - IMPROVEMENT_S:
+                order[:] = candidate
+                return True
+    return False
+
+
+def _or_opt(costs: np.ndarray, order: List[int]) -> bool:
+    """Move the first run of up to OR_OPT_LENGTH targets that makes the order faster."""
+    for length in range(1, OR_OPT_LENGTH + 1):
+        for first in range(1, len(order) - length):
+            before, after = order[first - 1], order[first + length]
+            head, tail = order[first], order[first + length - 1]
+            removed: float = costs[before, head] + costs[tail, after] - costs[before, after]
+            rest: List[int] = order[:first] + order[first + length :]
+            for position in range(1, len(rest)):
+                previous, following = rest[position - 1], rest[position]
+                added: float = (
+                    costs[previous, head] + costs[tail, following] - costs[previous, following]
+                )
+                if added < removed - IMPROVEMENT_S:
+                    order[:] = rest[:position] + order[first : first + length] + rest[position:]
+                    return True
+    return False
+
+
+def heuristic_order(costs: np.ndarray) -> List[int]:
+    """Find a fast visit order with the nearest neighbor and local search.
+
+    The nearest neighbor order is improved with 2-opt and Or-opt moves until no move
+    makes it faster.
+
+    Parameters
+    ----------
+    costs : np.ndarray
+        the legs costs, see leg_costs, the first pose is the start and the last one
+        is the end
+
+    Returns
+    -------
+    List[int]
+        the poses indexes in the visit order
+    """
+    size: int = len(costs)
+    order: List[int] = [0]
+    remaining: List[int] = list(range(1, size - 1))
+    while remaining:
+        nearest: int = min(remaining, key=lambda target: costs[order[-1], target])
+        remaining.remove(nearest)
+        order.append(nearest)
+    order.append(size - 1)
+    while _or_opt(costs, order) or _two_opt(costs, order):
+        pass
+    return order
+
+
+class VisitOrder:
+    """Fastest visit order of the mission targets between a fixed start and end.
+
+    The order of a few targets is exact, the order of more targets is found with
+    local search. The legs costs are cached per poses.
+    """
+
+    def __init__(self, model: RobotModel, degrees_per_pixel: float, speed_dps: int):
+        """Class Constructor.
+
+        Parameters
+        ----------
+        model : RobotModel
+            the robot timings
+        degrees_per_pixel : float
+            the wheel degrees of a mat image pixel
+        speed_dps : int
+            the robot speed
+        """
+        self.model = model
+        self.degrees_per_pixel = degrees_per_pixel
+        self.speed_dps = speed_dps
+        self._costs: Dict[bytes, np.ndarray] = {}
+
+    def costs(self, centers: np.ndarray, headings: np.ndarray) -> np.ndarray:
+        """Get the cached legs costs of poses.
+
+        Parameters
+        ----------
+        centers : np.ndarray
+            the robot centers in the mat image pixels, with shape (N, 2)
+        headings : np.ndarray
+            the robot headings in degrees
+
+        Returns
+        -------
+        np.ndarray
+            the costs, see leg_costs
+        """
+        centers = np.asarray(centers, dtype=float)
+        headings = np.asarray(headings, dtype=float)
+        key: bytes = centers.tobytes() + headings.tobytes()
+        if key not in self._costs:
+            if len(self._costs) >= COSTS_CACHE_SIZE:
+                del self._costs[next(iter(self._costs))]
+            self._costs[key] = leg_costs(
+                centers, headings, self.model, self.degrees_per_pixel, self.speed_dps
+            )
+        return self._costs[key]
+
+    def order(self, centers: np.ndarray, headings: np.ndarray) -> List[int]:
+        """Find the fastest visit order of poses.
+
+        Parameters
+        ----------
+        centers : np.ndarray
+            the robot centers in the mat image pixels, with shape (N, 2), the first
+            pose is the start and the last one is the end
+        headings : np.ndarray
+            the robot headings in degrees
+
+        Returns
+        -------
+        List[int]
+            the poses indexes in the visit order
+        """
+        costs: np.ndarray = self.costs(centers, headings)
+        if len(costs) - 2 <= EXACT_TARGETS:
+            return exact_order(costs)
+        return heuristic_order(costs)
@@ -0,0 +1,336 @@
+"""This module contains the storage of the saved waypoints."""
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+import numpy as np
+
+WAYPOINT_DTYPE = np.dtype(
+    [
+        ("box", "<f8", (4, 2)),
+        ("displayed_theta", "<i8"),
+        ("additional_motor_1", "<i8"),
+        ("additional_motor_2", "<i8"),
+        ("additional_motors_mode", "U1"),
+        ("speed_dps", "<i8"),
+    ]
+)
+DEFAULT_CAPACITY: int = 64
+DEFAULT_HISTORY: int = 1000
+
+# the history entries, an insert is undone by a delete at the same index, their record
+# is one waypoint or an array of consecutive waypoints
+INSERT: str = "insert"
+DELETE: str = "delete"
+MODIFY: str = "modify"
+# the history entry of replacing every waypoint, its record is every waypoint
+REPLACE: str = "replace"
+
+Delta = Tuple[str, int, np.ndarray]
+
+
+def waypoint(
+    box: np.ndarray,
+    displayed_theta: int,
+    additional_motor_1: int,
+    additional_motor_2: int,
+    additional_motors_mode: str,
+    speed_dps: int,
+) -> np.ndarray:
+    """Create a waypoint record.
+
+    Parameters
+    ----------
+    box : np.ndarray
+        the robot box corners in the mat image pixels, with shape (4, 2)
+    displayed_theta : int
+        the displayed robot angle
+    additional_motor_1 : int
+        the first additional motor rotation in degrees
+    additional_motor_2 : int
+        the second additional motor rotation in degrees
+    additional_motors_mode : str
+        P when the additional motors run in parallel with the movement, S in series
+    speed_dps : int
+        the robot speed in degrees per second
+
+    Returns
+    -------
+    np.ndarray
+        the waypoint, a WAYPOINT_DTYPE scalar record
+    """
+    record = np.zeros((), dtype=WAYPOINT_DTYPE)
+    record["box"] = box
+    record["displayed_theta"] = displayed_theta
+    record["additional_motor_1"] = additional_motor_1
+    record["additional_motor_2"] = additional_motor_2
+    record["additional_motors_mode"] = additional_motors_mode
+    record["speed_dps"] = speed_dps
+    return record
+
+
+class WaypointStore:
+    """Saved waypoints in a NumPy structured array, with undo and redo.
+
+    The array grows geometrically so appending is amortized O(1), inserting and
+    deleting shift the following waypoints with one block copy. Every edit pushes
+    a delta holding the index and the single waypoint it changed, undoing and redoing
+    apply the deltas without copying the path.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, history: int = DEFAULT_HISTORY):
+        """Class Constructor.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            the initial number of waypoints allocated, by default 64
+        history : int, optional
+            the maximum number of edits that can be undone, by default 1000
+        """
+        self._data: np.ndarray = np.zeros(max(capacity, 1), dtype=WAYPOINT_DTYPE)
+        self._size: int = 0
+        self._undo: Deque[Delta] = deque(maxlen=history)
+        self._redo: List[Delta] = []
+        # the operation, the index and the number of waypoints of the last undone or
+        # redone edit, as it was applied to the waypoints
+        self.last_change: Optional[Tuple[str, int, int]] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        return self.records[index].copy()
+
+    @property
+    def records(self) -> np.ndarray:
+        """The saved waypoints, a view that is invalidated by the next edit."""
+        return self._data[: self._size]
+
+    @property
+    def boxes(self) -> np.ndarray:
+        """The saved robot boxes, with shape (waypoints, 4, 2)."""
+        return self.records["box"]
+
+    def _reserve(self, size: int) -> None:
+        if size <= len(self._data):
+            return
+        data: np.ndarray = np.zeros(max(size, 2 * len(self._data)), dtype=WAYPOINT_DTYPE)
+        data[: self._size] = self.records
+        self._data = data
+
+    def _check_index(self, index: int, size: int) -> int:
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError(f"waypoint index {index} out of range for {size} waypoints")
+        return index
+
+    def _insert(self, index: int, record: np.ndarray) -> None:
+        count: int = np.size(record)
+        self._reserve(self._size + count)
+        self._data[index + count : self._size + count] = self._data[index : self._size]
+        self._data[index : index + count] = record
+        self._size += count
+
+    def _delete(self, index: int, count: Optional[int] = None) -> np.ndarray:
+        if count is None:
+            record: np.ndarray = self._data[index].copy()
+        else:
+            record = self._data[index : index + count].copy()
+        removed: int = 1 if count is None else count
+        self._data[index : self._size - removed] = self._data[index + removed : self._size]
+        self._size -= removed
+        return record
+
+    def _modify(self, index: int, record: np.ndarray) -> np.ndarray:
+        previous: np.ndarray = self._data[index].copy()
+        self._data[index] = record
+        return previous
+
+    def _replace(self, records: np.ndarray) -> np.ndarray:
+        previous: np.ndarray = self.records.copy()
+        self._size = 0
+        self._reserve(len(records))
+        self._data[: len(records)] = records
+        self._size = len(records)
+        return previous
+
+    def _push(self, delta: Delta) -> None:
+        self._undo.append(delta)
+        self._redo.clear()
+
+    def append(self, record: np.ndarray) -> None:
+        """Save a waypoint at the end of the path.
+
+        Parameters
+        ----------
+        record : np.ndarray
+            the waypoint, see waypoint
+        """
+        self.insert(self._size, record)
+
+    def extend(self, records: np.ndarray) -> None:
+        """Save waypoints at the end of the path, without undo history.
+
+        Parameters
+        ----------
+        records : np.ndarray
+            the waypoints, a WAYPOINT_DTYPE array
+        """
+        self._reserve(self._size + len(records))
+        self._data[self._size : self._size + len(records)] = records
+        self._size += len(records)
+
+    def insert(self, index: int, record: np.ndarray) -> None:
+        """Save a waypoint before an index.
+
+        Parameters
+        ----------
+        index : int
+            the index of the new waypoint, the length of the path appends it
+        record : np.ndarray
+            the waypoint, see waypoint
+        """
+        if index != self._size:
+            index = self._check_index(index, self._size)
+        self._insert(index, record)
+        self._push((INSERT, index, np.asarray(record, dtype=WAYPOINT_DTYPE).copy()))
+
+    def insert_many(self, index: int, records: np.ndarray) -> None:
+        """Save consecutive waypoints before an index, undone as one edit.
+
+        Parameters
+        ----------
+        index : int
+            the index of the first new waypoint, the length of the path appends them
+        records : np.ndarray
+            the waypoints, a WAYPOINT_DTYPE array
+        """
+        if index != self._size:
+            index = self._check_index(index, self._size)
+        records = np.array(records, dtype=WAYPOINT_DTYPE).reshape(-1)
+        self._insert(index, records)
+        self._push((INSERT, index, records))
+
+    def delete(self, index: int) -> np.ndarray:
+        """Delete a waypoint.
+
+        Parameters
+        ----------
+        index : int
+            the waypoint index
+
+        Returns
+        -------
+        np.ndarray
+            the deleted waypoint
+        """
+        index = self._check_index(index, self._size)
+        record: np.ndarray = self._delete(index)
+        self._push((DELETE, index, record))
+        return record
+
+    def modify(self, index: int, record: np.ndarray) -> None:
+        """Replace a waypoint.
+
+        Parameters
+        ----------
+        index : int
+            the waypoint index
+        record : np.ndarray
+            the new waypoint, see waypoint
+        """
+        index = self._check_index(index, self._size)
+        self._push((MODIFY, index, self._modify(index, record)))
+
+    def replace(self, records: np.ndarray) -> None:
+        """Replace every waypoint, undone as one edit.
+
+        Parameters
+        ----------
+        records : np.ndarray
+            the new waypoints, a WAYPOINT_DTYPE array
+        """
+        self._push((REPLACE, 0, self._replace(records)))
+
+    def overwrite(self, index: int, record: np.ndarray) -> None:
+        """Replace a waypoint without undo history, for the intermediate steps of an edit.
+
+        Parameters
+        ----------
+        index : int
+            the waypoint index
+        record : np.ndarray
+            the new waypoint, see waypoint
+        """
+        self._modify(self._check_index(index, self._size), record)
+
+    def _apply(self, delta: Delta, undo: bool) -> Delta:
+        """Apply a delta or its inverse, and get the delta that reverts it."""
+        operation, index, record = delta
+        if operation == MODIFY:
+            self.last_change = MODIFY, index, 1
+            return MODIFY, index, self._modify(index, record)
+        if operation == REPLACE:
+            self.last_change = REPLACE, 0, len(record)
+            return REPLACE, index, self._replace(record)
+        if (operation == INSERT) == undo:
+            count: Optional[int] = None if np.ndim(record) == 0 else len(record)
+            self.last_change = DELETE, index, np.size(record)
+            return DELETE, index, self._delete(index, count)
+        self._insert(index, record)
+        self.last_change = INSERT, index, np.size(record)
+        return INSERT, index, record
+
+    def undo(self) -> Optional[int]:
+        """Revert the last edit.
+
+        Returns
+        -------
+        Optional[int]
+            the index of the reverted waypoint, None when there is nothing to undo
+        """
+        if not self._undo:
+            return None
+        operation, index, record = self._undo.pop()
+        _, _, previous = self._apply((operation, index, record), undo=True)
+        self._redo.append(
+            (operation, index, previous if operation in (MODIFY, REPLACE) else record)
+        )
+        return index
+
+    def redo(self) -> Optional[int]:
+        """Apply the last reverted edit again.
+
+        Returns
+        -------
+        Optional[int]
+            the index of the edited waypoint, None when there is nothing to redo
+        """
+        if not self._redo:
+            return None
+        operation, index, record = self._redo.pop()
+        _, _, previous = self._apply((operation, index, record), undo=False)
+        self._undo.append(
+            (operation, index, previous if operation in (MODIFY, REPLACE) else record)
+        )
+        return index
+
+    def columns(self) -> Tuple[list, list, list, list, list, list]:
+        """Get the waypoints as the lists returned by the planner.
+
+        Returns
+        -------
+        Tuple[list, list, list, list, list, list]
+            the robot boxes, the displayed angles, the first and second additional
+            motors rotations, the additional motors modes and the speeds
+        """
+        records: np.ndarray = self.records
+        return (
+            list(records["box"].copy()),
+            records["displayed_theta"].tolist(),
+            records["additional_motor_1"].tolist(),
+            records["additional_motor_2"].tolist(),
+            records["additional_motors_mode"].tolist(),
+            records["speed_dps"].tolist(),
+        )
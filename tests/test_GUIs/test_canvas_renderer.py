@@ -0,0 +1,144 @@
+"""This module contains the unit tests for the incremental Tk canvas renderer."""
+import unittest
+from collections import Counter
+
+import numpy as np
+import numpy.testing as npt
+
+from src.GUIs.canvas_renderer import CanvasRenderer, tk_color
+from src.GUIs.overlay import BOX_COLOR, SELECTED_COLOR
+
+
+class FakeCanvas:
+    """Record the canvas items and count the item operations."""
+
+    def __init__(self):
+        self.items = {}
+        self.operations = Counter()
+        self._next = 1
+
+    def _create(self, kind, *coords, **options):
+        self.operations["create"] += 1
+        item = self._next
+        self._next += 1
+        self.items[item] = {"kind": kind, "coords": list(coords), **options}
+        return item
+
+    def create_polygon(self, *coords, **options):
+        return self._create("polygon", *coords, **options)
+
+    def create_oval(self, *coords, **options):
+        return self._create("oval", *coords, **options)
+
+    def create_text(self, *coords, **options):
+        return self._create("text", *coords, **options)
+
+    def create_line(self, *coords, **options):
+        return self._create("line", *coords, **options)
+
+    def coords(self, item, *coords):
+        self.operations["coords"] += 1
+        self.items[item]["coords"] = list(coords)
+
+    def itemconfigure(self, item, **options):
+        self.operations["configure"] += 1
+        self.items[item].update(options)
+
+    def delete(self, item):
+        self.operations["delete"] += 1
+        del self.items[item]
+
+    def tag_raise(self, item):
+        pass
+
+    def kinds(self):
+        return Counter(item["kind"] for item in self.items.values())
+
+
+def robot_box(x: float, y: float) -> np.ndarray:
+    return np.array([[x, y], [x + 100, y], [x + 100, y + 60], [x, y + 60]], dtype=float)
+
+
+class TestCanvasRenderer(unittest.TestCase):
+    """This class contains the unit tests for the incremental Tk canvas renderer."""
+
+    def setUp(self):
+        """Draw 50 waypoints on a canvas at half the mat size."""
+        self.canvas = FakeCanvas()
+        self.renderer = CanvasRenderer(self.canvas, scale=0.5)
+        self.boxes = [robot_box(20 * index, 10 * index) for index in range(50)]
+        self.labels = [[str(index), "B: 0", "X: 0", "S", "speed: 500"] for index in range(50)]
+        self.renderer.set_waypoints(self.boxes, self.labels)
+        self.canvas.operations.clear()
+
+    def assert_drawn(self, boxes):
+        """Test the canvas holds one pose per box and one connector between boxes."""
+        kinds = self.canvas.kinds()
+        self.assertEqual(kinds["polygon"], len(boxes))
+        self.assertEqual(kinds["line"], len(boxes) - 1)
+        polygons = [self.canvas.items[items[0]]["coords"] for items in self.renderer._poses]
+        npt.assert_allclose(np.reshape(polygons, (-1, 4, 2)), np.stack(boxes) * 0.5)
+        for index in range(1, len(boxes)):
+            line = self.canvas.items[self.renderer._connectors[index]]["coords"]
+            npt.assert_allclose(line[:2], (boxes[index - 1][0] + boxes[index - 1][1]) / 4)
+            npt.assert_allclose(line[2:], (boxes[index][0] + boxes[index][1]) / 4)
+
+    def test_add(self):
+        """Test saving a waypoint only creates its items."""
+        self.boxes.append(robot_box(900, 900))
+        self.labels.append(["0", "B: 0", "X: 0", "S", "speed: 500"])
+        self.renderer.add_waypoint(self.boxes[-1], self.labels[-1])
+        self.assertEqual(self.canvas.operations["create"], 5)
+        self.assert_drawn(self.boxes)
+
+    def test_modify(self):
+        """Test replacing a waypoint moves its items and its connectors only."""
+        self.boxes[20] = robot_box(500, 50)
+        self.renderer.set_waypoints(self.boxes, self.labels)
+        self.assertEqual(self.canvas.operations["create"], 0)
+        self.assertLessEqual(self.canvas.operations["coords"], 6)
+        self.assert_drawn(self.boxes)
+
+    def test_insert_delete(self):
+        """Test inserting and deleting a waypoint in the middle of the path."""
+        self.boxes.insert(10, robot_box(700, 100))
+        self.labels.insert(10, ["x", "B: 0", "X: 0", "S", "speed: 500"])
+        self.renderer.set_waypoints(self.boxes, self.labels)
+        self.assertEqual(self.canvas.operations["create"], 5)
+        self.assertEqual(self.canvas.operations["delete"], 0)
+        self.assert_drawn(self.boxes)
+        del self.boxes[0:2], self.labels[0:2]
+        self.renderer.set_waypoints(self.boxes, self.labels)
+        self.assertEqual(self.canvas.operations["delete"], 10)
+        self.assert_drawn(self.boxes)
+
+    def test_labels_change(self):
+        """Test a waypoint with new labels is updated."""
+        self.labels[5] = ["5", "B: 20", "X: 0", "P", "speed: 500"]
+        self.renderer.set_waypoints(self.boxes, self.labels)
+        others = self.canvas.items[self.renderer._poses[5][3]]
+        self.assertEqual(others["text"], "B: 20\nX: 0\nP\nspeed: 500")
+
+    def test_select(self):
+        """Test changing the selection only recolors two waypoints."""
+        self.renderer.set_waypoints(self.boxes, self.labels, selected=3)
+        self.renderer.set_waypoints(self.boxes, self.labels, selected=4)
+        self.assertEqual(self.canvas.operations["configure"], 3)
+        outlines = [self.canvas.items[items[0]]["outline"] for items in self.renderer._poses]
+        self.assertEqual(outlines[4], tk_color(SELECTED_COLOR))
+        self.assertEqual(outlines[3], tk_color(BOX_COLOR))
+
+    def test_live_robot(self):
+        """Test the live robot items are created once and moved."""
+        for x in range(0, 100, 10):
+            self.renderer.render(robot_box(x, 0), self.labels[0], True)
+        self.assertEqual(self.canvas.operations["create"], 4)
+        self.assertEqual(self.canvas.kinds()["polygon"], 51)
+
+    def test_tk_color(self):
+        """Test the BGR colors are converted to RGB."""
+        self.assertEqual(tk_color((255, 0, 16)), "#1000ff")
+
+
+if __name__ == "__main__":
+    unittest.main()
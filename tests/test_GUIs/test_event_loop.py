@@ -0,0 +1,71 @@
+"""This module contains the unit tests for the frame scheduling."""
+import unittest
+
+from src.GUIs.event_loop import NO_KEY, FrameScheduler, LoopMeasurement
+
+
+class FakeClock:
+    """A clock advanced by the tests."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestFrameScheduler(unittest.TestCase):
+    """This class contains the unit tests for the frame scheduler."""
+
+    def setUp(self):
+        """Create a 64 frames per second scheduler."""
+        self.clock = FakeClock()
+        self.scheduler = FrameScheduler(max_fps=64, idle_timeout=0.5, clock=self.clock)
+
+    def test_idle(self):
+        """Test the scheduler blocks for the idle timeout when nothing changed."""
+        self.assertTrue(self.scheduler.should_render())
+        self.scheduler.rendered()
+        self.assertFalse(self.scheduler.should_render())
+        self.assertEqual(self.scheduler.wait_time_ms(), 500)
+
+    def test_frame_rate_cap(self):
+        """Test a change is drawn once the frame interval has passed."""
+        self.scheduler.rendered()
+        self.clock.now += 0.0078125
+        self.scheduler.request_redraw()
+        self.assertFalse(self.scheduler.should_render())
+        self.assertEqual(self.scheduler.wait_time_ms(), 8)
+        self.clock.now += 0.0078125
+        self.assertTrue(self.scheduler.should_render())
+        self.scheduler.rendered()
+        self.assertEqual(self.scheduler.frames, 2)
+
+    def test_invalid_fps(self):
+        """Test a non positive frame rate is rejected."""
+        with self.assertRaises(ValueError):
+            FrameScheduler(max_fps=0)
+
+
+class TestLoopMeasurement(unittest.TestCase):
+    """This class contains the unit tests for the loop measurement."""
+
+    def test_report(self):
+        """Test the latency is measured from the first key to the next frame."""
+        measurement = LoopMeasurement()
+        measurement.wait_started()
+        measurement.wait_ended(NO_KEY)
+        measurement.wait_started()
+        measurement.wait_ended(ord("w"))
+        measurement.wait_started()
+        measurement.wait_ended(ord("w"))
+        measurement.displayed()
+        measurement.displayed()
+        report = measurement.report()
+        self.assertEqual(report["inputs"], 1)
+        self.assertGreaterEqual(report["latency_p50_ms"], 0)
+        self.assertIn("idle_cpu_percent", report)
+
+
+if __name__ == "__main__":
+    unittest.main()
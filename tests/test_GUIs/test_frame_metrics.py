@@ -0,0 +1,57 @@
+"""This module contains the unit tests for the frame timings."""
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import numpy.testing as npt
+
+from src.GUIs.frame_metrics import PHASES, FrameMetrics
+
+
+class TestFrameMetrics(unittest.TestCase):
+    """This class contains the unit tests for the frame timings."""
+
+    def setUp(self):
+        """Fill a 4 frames ring buffer with 6 frames of known timings."""
+        self.metrics = FrameMetrics(capacity=4)
+        for frame in range(6):
+            self.metrics._row[:] = np.arange(len(PHASES)) * (frame + 1) / 1000
+            self.metrics.commit()
+
+    def test_ring_buffer(self):
+        """Test only the last frames are kept."""
+        recorded = self.metrics.recorded()
+        self.assertEqual(recorded.shape, (4, len(PHASES) + 1))
+        npt.assert_allclose(sorted(recorded[:, 1]), [3, 4, 5, 6])
+        npt.assert_allclose(recorded[:, -1], recorded[:, :-1].sum(axis=1))
+
+    def test_percentiles(self):
+        """Test the percentiles of every phase and of the whole frame."""
+        percentiles = self.metrics.percentiles()
+        self.assertEqual(list(percentiles), list(PHASES) + ["frame"])
+        self.assertAlmostEqual(percentiles["image"][0], 4.5)
+        self.assertEqual(len(self.metrics.hud_lines()), len(PHASES) + 2)
+
+    def test_dump(self):
+        """Test the histogram counts every stored frame."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metrics.json")
+            self.metrics.dump(path, bin_ms=2.0)
+            with open(path) as metrics_file:
+                histogram = json.load(metrics_file)
+        self.assertEqual(histogram["frames"], 4)
+        for counts in histogram["counts"].values():
+            self.assertEqual(sum(counts), 4)
+        self.assertEqual(histogram["bin_edges_ms"][1], 2.0)
+
+    def test_empty(self):
+        """Test the summary of no frames."""
+        metrics = FrameMetrics()
+        self.assertEqual(metrics.percentiles()["frame"], [0.0, 0.0, 0.0])
+        self.assertEqual(metrics.histogram()["frames"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
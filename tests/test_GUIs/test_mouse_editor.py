@@ -0,0 +1,58 @@
+"""This module contains the unit tests for the mouse editing of the saved waypoints."""
+import unittest
+
+import cv2
+
+from src.GUIs.mouse_editor import MouseEditor
+from src.GUIs.viewport import Viewport
+from src.planner_state import PlannerState, key_codes
+from tests.test_planner_state import SETTINGS
+
+
+class TestMouseEditor(unittest.TestCase):
+    """This class contains the unit tests for the mouse editing of the saved waypoints."""
+
+    def setUp(self):
+        """Save two waypoints on a mat shown at full size."""
+        self.state = PlannerState(SETTINGS, 500, ("B", "X"))
+        for key in key_codes("pdddddddddddp"):
+            self.state.handle_key(key)
+        self.changes = []
+        self.drops = []
+        self.editor = MouseEditor(
+            self.state,
+            Viewport((500, 1000), (1000, 500)),
+            lambda: self.changes.append(self.state.selected),
+            lambda: self.drops.append(len(self.changes)),
+        )
+
+    def test_drag(self):
+        """Test a click selects a waypoint and a drag moves it as one edit."""
+        self.editor(cv2.EVENT_LBUTTONDOWN, 150, 470, 0)
+        self.assertEqual(self.state.selected, 1)
+        self.editor(cv2.EVENT_MOUSEMOVE, 200, 400, 0)
+        self.editor(cv2.EVENT_LBUTTONUP, 250, 370, 0)
+        self.assertEqual(self.state.waypoints.boxes[1][0].tolist(), [210, 340])
+        self.assertEqual(self.drops, [3])
+        self.state.undo()
+        self.assertEqual(self.state.waypoints.boxes[1][0].tolist(), [110, 440])
+
+    def test_miss(self):
+        """Test a click far from every waypoint and a move without a drag are ignored."""
+        self.editor(cv2.EVENT_LBUTTONDOWN, 800, 100, 0)
+        self.editor(cv2.EVENT_MOUSEMOVE, 150, 470, 0)
+        self.editor(cv2.EVENT_LBUTTONUP, 150, 470, 0)
+        self.assertEqual((self.changes, self.drops), ([], []))
+        self.assertIsNone(self.state.selected)
+
+    def test_nearest(self):
+        """Test a click next to a waypoint picks it, the distance scales with the zoom."""
+        self.editor.viewport = Viewport((500, 1000), (500, 250))
+        self.editor(cv2.EVENT_LBUTTONDOWN, 2, 214, 0)
+        self.assertIsNone(self.state.selected)
+        self.editor(cv2.EVENT_LBUTTONDOWN, 25, 218, 0)
+        self.assertEqual(self.state.selected, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
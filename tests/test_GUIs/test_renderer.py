@@ -0,0 +1,87 @@
+"""This module contains the unit tests for the layered renderer."""
+import unittest
+
+import numpy as np
+import numpy.testing as npt
+
+from src.collision import ObstacleMask
+from src.GUIs.overlay import OBSTACLE_COLOR
+from src.GUIs.renderer import PlannerRenderer
+from src.GUIs.viewport import ImagePyramid, Viewport
+
+
+def robot_box(x: float, y: float) -> np.ndarray:
+    return np.array([[x, y], [x + 100, y], [x + 100, y + 60], [x, y + 60]], dtype=float)
+
+
+class TestPlannerRenderer(unittest.TestCase):
+    """This class contains the unit tests for the layered renderer."""
+
+    def setUp(self):
+        """Create a renderer of a 400x300 window over a 1200x900 image."""
+        image = np.full((900, 1200, 3), 255, dtype=np.uint8)
+        image[::50] = 128
+        self.pyramid = ImagePyramid(image)
+        self.viewport = Viewport(image.shape[:2], (400, 300))
+        self.renderer = PlannerRenderer(self.pyramid, self.viewport)
+        self.labels = ["0", "B: 0", "C: 0", "S", "speed: 500"]
+
+    def fresh_frame(self, live_box: np.ndarray) -> np.ndarray:
+        """Render the same state with an empty cache."""
+        renderer = PlannerRenderer(self.pyramid, self.viewport)
+        renderer.set_waypoints(self.renderer.boxes, self.renderer.labels)
+        return renderer.render(live_box, self.labels, True).copy()
+
+    def test_live_robot_leaves_no_trace(self):
+        """Test moving the live robot restores the region it covered."""
+        for x in range(0, 600, 60):
+            frame = self.renderer.render(robot_box(x, 400), self.labels, True)
+        npt.assert_array_equal(frame, self.fresh_frame(robot_box(540, 400)))
+
+    def test_incremental_waypoints(self):
+        """Test committed waypoints are drawn the same as a full redraw."""
+        for x in range(0, 900, 150):
+            self.renderer.render(robot_box(x, 300), self.labels, True)
+            self.renderer.add_waypoint(robot_box(x, 300), self.labels)
+        frame = self.renderer.render(robot_box(1000, 700), self.labels, True)
+        npt.assert_array_equal(frame, self.fresh_frame(robot_box(1000, 700)))
+
+    def test_moved_waypoint(self):
+        """Test dragging a waypoint redraws it, its connectors and its neighbors in order."""
+        for x in range(0, 900, 150):
+            self.renderer.add_waypoint(robot_box(x, 300), self.labels)
+        self.renderer.render(robot_box(1000, 700), self.labels, True)
+        for y in range(300, 600, 40):
+            self.renderer.move_waypoint(2, robot_box(330, y))
+            frame = self.renderer.render(robot_box(1000, 700), self.labels, True)
+        npt.assert_array_equal(frame, self.fresh_frame(robot_box(1000, 700)))
+        self.renderer.move_waypoint(5, robot_box(600, 100))
+        frame = self.renderer.render(robot_box(1000, 700), self.labels, True)
+        npt.assert_array_equal(frame, self.fresh_frame(robot_box(1000, 700)))
+
+    def test_view_change_rebuilds(self):
+        """Test zooming and changing the direction redraw the waypoints."""
+        self.renderer.render(robot_box(0, 0), self.labels, True)
+        self.renderer.add_waypoint(robot_box(500, 500), self.labels)
+        self.renderer.add_waypoint(robot_box(700, 300), self.labels)
+        self.viewport.zoom_by(2.0, anchor=np.array([600.0, 450.0]))
+        frame = self.renderer.render(robot_box(0, 0), self.labels, False)
+        renderer = PlannerRenderer(self.pyramid, self.viewport)
+        renderer.set_waypoints(self.renderer.boxes, self.renderer.labels)
+        npt.assert_array_equal(frame, renderer.render(robot_box(0, 0), self.labels, False))
+
+    def test_obstacles(self):
+        """Test painted obstacles are tinted on the next frame."""
+        self.renderer.obstacles = ObstacleMask((900, 1200))
+        frame = self.renderer.render(robot_box(0, 0), self.labels, True).copy()
+        self.renderer.obstacles.paint((900, 624), 30)
+        tinted = self.renderer.render(robot_box(0, 0), self.labels, True)
+        # the window shows the mat at a third of its size
+        y, x = 208, 300
+        self.assertLess(tinted[y, x, 0], frame[y, x, 0])
+        self.assertEqual(tinted[y, x, 2], OBSTACLE_COLOR[2])
+        npt.assert_array_equal(tinted[:100, 300:], frame[:100, 300:])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+"""This module contains the unit tests for the viewport."""
+import unittest
+
+import numpy as np
+import numpy.testing as npt
+
+from src.GUIs.viewport import ImagePyramid, Viewport
+
+
+class TestImagePyramid(unittest.TestCase):
+    """This class contains the unit tests for the image pyramid."""
+
+    def test_levels(self):
+        """Test the levels halve the image down to the minimum size."""
+        pyramid = ImagePyramid(np.zeros((1001, 2000, 3), dtype=np.uint8), min_size=200)
+        self.assertEqual(
+            [level.shape[:2] for level in pyramid.levels],
+            [(1001, 2000), (501, 1000), (251, 500)],
+        )
+        self.assertEqual(pyramid.level_for(1.0), 0)
+        self.assertEqual(pyramid.level_for(0.5), 1)
+        self.assertEqual(pyramid.level_for(0.3), 1)
+        self.assertEqual(pyramid.level_for(0.1), 2)
+
+
+class TestViewport(unittest.TestCase):
+    """This class contains the unit tests for the viewport."""
+
+    def setUp(self):
+        """Create a viewport of a 400x300 window over a 4000x2000 image."""
+        self.image = np.zeros((2000, 4000, 3), dtype=np.uint8)
+        self.image[:, 2000:] = 255
+        self.pyramid = ImagePyramid(self.image)
+        self.viewport = Viewport(self.image.shape[:2], (400, 300))
+
+    def test_fit(self):
+        """Test the whole image is shown by default."""
+        self.assertAlmostEqual(self.viewport.zoom, 0.1)
+        npt.assert_allclose(self.viewport.to_view([[0, 0], [4000, 2000]]), [[0, 50], [400, 250]])
+
+    def test_round_trip(self):
+        """Test mapping points to the window and back."""
+        self.viewport.zoom_by(3.0)
+        self.viewport.pan(1, -1)
+        points = np.array([[[10.0, 20.0], [3000.0, 1500.0]]])
+        npt.assert_allclose(self.viewport.to_image(self.viewport.to_view(points)), points)
+
+    def test_zoom_keeps_anchor(self):
+        """Test zooming keeps the anchor point under the same window point."""
+        anchor = np.array([1000.0, 500.0])
+        before = self.viewport.to_view(anchor)
+        self.viewport.zoom_by(2.0, anchor=anchor)
+        npt.assert_allclose(self.viewport.to_view(anchor), before)
+
+    def test_render_window_size(self):
+        """Test the rendered image has the window size at any zoom level."""
+        for _ in range(12):
+            frame = self.viewport.render(self.pyramid)
+            self.assertEqual(frame.shape, (300, 400, 3))
+            self.viewport.zoom_in()
+        self.assertLessEqual(self.viewport.zoom, 8.0)
+
+    def test_render_visible_region(self):
+        """Test the rendered window shows the visible part of the image."""
+        self.viewport.zoom_by(10.0)
+        self.viewport.center = np.array([2000.0, 1000.0])
+        frame = self.viewport.render(self.pyramid)
+        self.assertTrue((frame[:, :190] == 0).all())
+        self.assertTrue((frame[:, 210:] == 255).all())
+        self.assertEqual(self.viewport.visible_region(), (1800, 850, 2201, 1151))
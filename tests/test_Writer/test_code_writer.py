@@ -0,0 +1,46 @@
+"""This module contains the unit tests for the code writer."""
+import unittest
+from unittest.mock import patch
+
+from src.Writer.code_writer import CodeEditor
+
+
+@patch("src.Writer.code_writer.get_config", return_value=1)
+@patch("src.Writer.code_writer.sensors_extraction", return_value={"gyro_1": "INPUT_1"})
+@patch("src.Writer.code_writer.motors_extraction", return_value=(["B", "C"], ["A", "D"]))
+class TestCodeEditor(unittest.TestCase):
+    """This class contains the unit tests for the code writer."""
+
+    def test_arc_in_parallel_mode(self, *_):
+        """Test an arc with the MEDIUM motors in parallel still blocks until it ends."""
+        points = {
+            "x": [0, 0, 0, 0],
+            "y": [300, 200, 100, 0],
+            "distance_degrees": [300, 471, 300],
+            "angle": [0, 0, 90, 90],
+            "angles_difference": [0, 90, 0],
+            "A": [0, 0, 0, 0],
+            "D": [0, 0, 0, 0],
+            "additional_motors_mode": ["P", "P", "P", "P"],
+            "speed": [100, 100, 100, 100],
+            "acceleration": [0, 0, 0],
+            "arc_degrees": [0, 386, 0],
+            "action": ["None", "forward", "arc", "forward"],
+        }
+        editor = CodeEditor()
+        editor.add_imports_and_variables()
+        editor.add_function()
+        editor.write_main_code(points)
+        compile(editor.code, "code.py", "exec")
+        self.assertIn(
+            "\narc_turn(speed=100, degrees=471, arc_degrees=386, brake=True)\n", editor.code
+        )
+        routine: str = editor.code[editor.code.index("def arc_turn") :]
+        routine = routine[: routine.index("\ndef ")]
+        self.assertIn("degrees=degreesC, brake=brake, block=True)", routine)
+        self.assertIn("motorB.wait_until_not_moving()", routine)
+        self.assertEqual(editor.code.count("block=False, kp=1)"), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
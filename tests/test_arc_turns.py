@@ -0,0 +1,82 @@
+"""Unit testing for arc turns module."""
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import numpy.testing as npt
+
+from src.arc_turns import ArcGeometry, apply_arc_turns, arc_turn_steps, get_arc_geometry
+from src.runtime_estimator import DEFAULT_ROBOT_MODEL, RobotModel, estimate_path_runtime
+from tests.test_path_optimization import make_path
+
+GEOMETRY = ArcGeometry(radius_degrees=60, track_degrees=40)
+
+
+def corner_path(motors=None):
+    """Build a path that drives up, turns left in place and drives left."""
+    return make_path([(300, 300, 0), (300, 100, 0), (300, 100, 90), (100, 100, 90)], motors)
+
+
+class TestArcTurns(unittest.TestCase):
+    """Unit testing for arc turns module."""
+
+    def test_arc_turn_steps(self):
+        """Test only the turns between two forward moves without motors are arcs."""
+        npt.assert_array_equal(arc_turn_steps(corner_path()), [False, True, False])
+        npt.assert_array_equal(arc_turn_steps(corner_path([0, 90, 0, 0])), False)
+        npt.assert_array_equal(arc_turn_steps(corner_path([0, 0, 0, 90])), [False, True, False])
+        backward = make_path([(300, 300, 0), (300, 500, 0), (300, 500, 90), (100, 500, 90)])
+        npt.assert_array_equal(arc_turn_steps(backward), False)
+        self.assertEqual(len(arc_turn_steps(corner_path()[:2])), 1)
+
+    def test_apply_arc_turns(self):
+        """Test the arc is tangent to both moves and cuts the corner."""
+        path = corner_path()
+        arced = apply_arc_turns(path, GEOMETRY)
+        npt.assert_array_equal(arced["action"], ["None", "forward", "arc", "forward"])
+        # a quarter turn of radius 60 cuts 60 degrees off both moves
+        npt.assert_array_equal(arced["distance_degrees"], [140, 94, 140, 0])
+        npt.assert_array_equal(arced["arc_degrees"], [0, 63, 0, 0])
+        self.assertEqual(arced["y"][1], path["y"][1] + 60)
+        self.assertEqual(arced["x"][2], path["x"][2] - 60)
+        npt.assert_array_equal(path["arc_degrees"], 0)
+
+    def test_short_moves_and_sharp_turns(self):
+        """Test the radius is reduced on short moves and the turns too sharp are kept."""
+        path = make_path([(300, 300, 0), (300, 100, 0), (300, 100, 90), (260, 100, 90)])
+        arced = apply_arc_turns(path, ArcGeometry(60, 10))
+        npt.assert_array_equal(arced["distance_degrees"][[0, 2]], [180, 20])
+        kept = apply_arc_turns(path, GEOMETRY)
+        npt.assert_array_equal(kept, path)
+
+    def test_move_between_arcs(self):
+        """Test a move between two arcs is shortened by both."""
+        path = make_path(
+            [(300, 300, 0), (300, 100, 0), (300, 100, 90), (100, 100, 90), (100, 100, 0)]
+            + [(100, -100, 0)]
+        )
+        arced = apply_arc_turns(path, GEOMETRY)
+        npt.assert_array_equal(arced["action"][1:], ["forward", "arc", "forward", "arc", "forward"])
+        npt.assert_array_equal(arced["distance_degrees"][[0, 2, 4]], [140, 80, 140])
+        npt.assert_array_equal(arced["arc_degrees"][[1, 3]], [63, -63])
+
+    def test_arcs_are_faster(self):
+        """Test the arc takes less time than stopping to turn in place."""
+        path = corner_path()
+        arced = apply_arc_turns(path, GEOMETRY)
+        self.assertLess(
+            estimate_path_runtime(arced, DEFAULT_ROBOT_MODEL).total_s,
+            estimate_path_runtime(path, DEFAULT_ROBOT_MODEL).total_s,
+        )
+
+    def test_get_arc_geometry(self):
+        """Test the radius and the robot width are converted to wheel degrees."""
+        model = RobotModel(0.2, 1.0, 360 / np.pi, 120.0)
+        with patch("src.arc_turns.get_config", return_value=None):
+            self.assertIsNone(get_arc_geometry(model))
+        with patch("src.arc_turns.get_config", return_value=80):
+            self.assertEqual(get_arc_geometry(model), ArcGeometry(80, 120))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""Unit testing for the calibration module."""
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from src.calibration import MatCalibration, get_mat_calibration
+
+# a mat photo taken from the front, the far edge of the mat looks shorter
+IMAGE_CORNERS = np.array([[200.0, 100.0], [1260.0, 100.0], [1461.0, 810.0], [0.0, 810.0]])
+MAT_CORNERS = np.array([[0.0, 0.0], [2362.0, 0.0], [2362.0, 1143.0], [0.0, 1143.0]])
+
+
+class TestMatCalibration(unittest.TestCase):
+    """Test cases for the mat calibration."""
+
+    def setUp(self):
+        """Calibrate the mat photo with its corners."""
+        self.calibration = MatCalibration(IMAGE_CORNERS, MAT_CORNERS)
+
+    def test_corners_are_mapped(self):
+        """Test the reference points are mapped to the mat corners."""
+        np.testing.assert_allclose(
+            self.calibration.pixels_to_mm(IMAGE_CORNERS), MAT_CORNERS, atol=1e-6
+        )
+        np.testing.assert_allclose(
+            self.calibration.mm_to_pixels(MAT_CORNERS), IMAGE_CORNERS, atol=1e-6
+        )
+
+    def test_batched_shape(self):
+        """Test arrays of any leading shape are mapped at once."""
+        points = np.random.default_rng(0).uniform(0, 800, size=(10, 4, 2))
+        mapped = self.calibration.pixels_to_mm(points)
+        self.assertEqual(mapped.shape, points.shape)
+        np.testing.assert_allclose(self.calibration.mm_to_pixels(mapped), points, atol=1e-6)
+
+    def test_path_lengths_follow_the_perspective(self):
+        """Test equal pixel distances on the near and far edges are different lengths."""
+        far_edge = np.array([[200.0, 100.0], [1260.0, 100.0]])
+        near_edge = np.array([[0.0, 810.0], [1461.0, 810.0]])
+        np.testing.assert_allclose(self.calibration.path_lengths_mm(far_edge), [2362.0])
+        np.testing.assert_allclose(self.calibration.path_lengths_mm(near_edge), [2362.0])
+
+    def test_not_enough_points(self):
+        """Test a calibration needs four points."""
+        with self.assertRaises(ValueError):
+            MatCalibration(IMAGE_CORNERS[:3], MAT_CORNERS[:3])
+
+    @patch("src.calibration.get_config", return_value=None)
+    def test_no_calibration_configured(self, *_):
+        """Test no calibration is returned without reference points."""
+        self.assertIsNone(get_mat_calibration())
+
+    @patch(
+        "src.calibration.get_config",
+        side_effect=lambda key: IMAGE_CORNERS.tolist()
+        if key == "mat_calibration.image_points"
+        else 2362
+        if key == "mat_dimensions.length_x"
+        else 1143
+        if key == "mat_dimensions.width_y"
+        else None,
+    )
+    def test_calibration_defaults_to_mat_corners(self, *_):
+        """Test the mat points default to the mat corners."""
+        calibration = get_mat_calibration()
+        np.testing.assert_allclose(calibration.mat_points, MAT_CORNERS)
+        self.assertIs(calibration, get_mat_calibration())
@@ -0,0 +1,102 @@
+"""This module contains the unit tests for the collision checking."""
+import os
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+
+from src.collision import ObstacleMask
+from src.planner_state import PlannerState, key_codes, robot_box
+from tests.test_planner_state import SETTINGS
+
+
+class TestObstacleMask(unittest.TestCase):
+    """This class contains the unit tests for the obstacles mask."""
+
+    def setUp(self):
+        """Put a 20x20 obstacle at (400, 200) on a 500x1000 mat."""
+        mask = np.zeros((500, 1000), dtype=bool)
+        mask[200:220, 400:420] = True
+        self.obstacles = ObstacleMask((500, 1000), mask)
+
+    def test_hits(self):
+        """Test only the footprints covering the obstacle hit it."""
+        self.assertTrue(self.obstacles.hits(robot_box((350, 150), 100, 60, 0)))
+        self.assertFalse(self.obstacles.hits(robot_box((250, 150), 100, 60, 0)))
+        self.assertTrue(self.obstacles.hits(robot_box((380, 220), 100, 60, 45)))
+        self.assertFalse(self.obstacles.hits(robot_box((-200, -200), 100, 60, 0)))
+
+    def test_sweep(self):
+        """Test a move jumping over the obstacle hits it."""
+        start = robot_box((250, 180), 100, 60, 0)
+        end = robot_box((450, 180), 100, 60, 0)
+        self.assertFalse(self.obstacles.hits(start) or self.obstacles.hits(end))
+        self.assertTrue(self.obstacles.sweep_hits([start, end]))
+        self.assertFalse(self.obstacles.sweep_hits([start, robot_box((250, 300), 100, 60, 0)]))
+
+    def test_paint(self):
+        """Test painted obstacles are hit and erased ones are not."""
+        box = robot_box((0, 0), 100, 60, 0)
+        self.assertFalse(self.obstacles.hits(box))
+        self.obstacles.paint((50, 30), 5)
+        self.assertTrue(self.obstacles.hits(box))
+        self.obstacles.paint((50, 30), 6, obstacle=False)
+        self.assertFalse(self.obstacles.hits(box))
+        self.assertTrue(self.obstacles.modified)
+        self.assertEqual(self.obstacles.version, 2)
+
+    def test_save_load(self):
+        """Test a saved mask is read back, stretched to the mat size."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "obstacles.png")
+            self.obstacles.save(path)
+            self.assertFalse(self.obstacles.modified)
+            np.testing.assert_array_equal(
+                ObstacleMask.load(path, (500, 1000)).mask, self.obstacles.mask
+            )
+            cv2.imwrite(path, cv2.resize(self.obstacles.mask, (500, 250)))
+            self.assertTrue(ObstacleMask.load(path, (500, 1000)).mask[210, 410])
+            with self.assertRaises(FileExistsError):
+                ObstacleMask.load(os.path.join(directory, "missing.png"), (500, 1000))
+
+
+class TestPlannerCollision(unittest.TestCase):
+    """This class contains the unit tests for the collisions of the live robot."""
+
+    def setUp(self):
+        """Put an obstacle right of the robot start pose."""
+        mask = np.zeros((500, 1000), dtype=bool)
+        mask[450:500, 200:210] = True
+        self.state = PlannerState(SETTINGS, 500, ("B", "X"), ObstacleMask((500, 1000), mask))
+
+    def press(self, keys: str) -> None:
+        for key in key_codes(keys):
+            self.state.handle_key(key)
+
+    def test_move(self):
+        """Test the robot collides while it covers the obstacle."""
+        self.press("d" * 9)
+        self.assertFalse(self.state.colliding)
+        self.press("d")
+        self.assertTrue(self.state.colliding)
+        self.press("w" * 7)
+        self.assertFalse(self.state.colliding)
+
+    def test_rotate(self):
+        """Test the robot collides after rotating over an obstacle."""
+        self.press("dddd" + "w" * 5 + ",,,,,,")
+        self.assertFalse(self.state.colliding)
+        self.state.obstacles.paint(self.state.live_box().mean(axis=0), 4)
+        self.assertTrue(self.state.check_collision())
+        self.press(",")
+        self.assertTrue(self.state.colliding)
+
+    def test_without_obstacles(self):
+        """Test a state without obstacles never collides."""
+        state = PlannerState(SETTINGS, 500, ("B", "X"))
+        self.assertFalse(state.check_collision())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""This module contains tests for config_watcher.py module."""
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from src.config_watcher import ConfigWatcher
+from src.configs import ConfigStore
+from src.GUIs.main_screen import LiveSettings
+
+
+class TestConfigWatcher(unittest.TestCase):
+    """This class contains tests for the configurations watcher."""
+
+    def setUp(self):
+        """Create a temporary configurations file."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "configurations.yaml")
+        self._write("steps:\n  delta_pixels: 10\n  delta_theta: 5\n")
+        self.store = ConfigStore(self.path)
+        self.changes: list = []
+        self.changed = threading.Event()
+
+    def tearDown(self):
+        """Remove the temporary configurations file."""
+        self.directory.cleanup()
+
+    def _write(self, text: str) -> None:
+        with open(self.path, "w", encoding="utf-8") as cfgs_file:
+            cfgs_file.write(text)
+
+    def _callback(self, changed: set) -> None:
+        self.changes.append(changed)
+        self.changed.set()
+
+    def _assert_reloads(self, watcher: ConfigWatcher) -> None:
+        with watcher:
+            self._write("steps:\n  delta_pixels: 20\n")
+            self._write("steps:\n  delta_pixels: 30\n  delta_theta: 5\n")
+            self.assertTrue(self.changed.wait(5))
+        self.assertEqual(self.changes, [{"steps", "steps.delta_pixels"}])
+        self.assertEqual(self.store.get("steps.delta_pixels"), 30)
+
+    def test_reload_with_inotify(self):
+        """Test the changes are reloaded once using inotify."""
+        watcher = ConfigWatcher(self._callback, store=self.store, debounce=0.1)
+        self._assert_reloads(watcher)
+
+    @patch("src.config_watcher._inotify_watch", return_value=None)
+    def test_reload_with_polling(self, *_):
+        """Test the changes are reloaded once when polling the file."""
+        watcher = ConfigWatcher(self._callback, store=self.store, debounce=0.1, poll_interval=0.05)
+        self._assert_reloads(watcher)
+        self.assertFalse(watcher.uses_inotify)
+
+    @patch("src.config_watcher._inotify_watch", return_value=None)
+    def test_unchanged_values_are_not_reported(self, *_):
+        """Test rewriting the same values does not call the callback."""
+        watcher = ConfigWatcher(self._callback, store=self.store, debounce=0.05, poll_interval=0.05)
+        with watcher:
+            self._write("steps:\n  delta_theta: 5\n  delta_pixels: 10\n")
+            stat = os.stat(self.path)
+            os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            self.assertFalse(self.changed.wait(0.5))
+        self.assertEqual(watcher.reloads, 1)
+
+    @patch("src.GUIs.main_screen.load_planner_settings", return_value="reloaded")
+    def test_live_settings(self, load_planner_settings):
+        """Test only the configurations the session follows rebuild the settings."""
+        settings = LiveSettings("initial")
+        settings.on_configs_changed({"mat_image_path", "gui.max_fps"})
+        self.assertEqual(settings.current, "initial")
+        load_planner_settings.assert_not_called()
+        settings.on_configs_changed({"steps", "steps.delta_pixels"})
+        self.assertEqual(settings.current, "reloaded")
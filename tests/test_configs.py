@@ -1,13 +1,23 @@
 """This module contains tests for configs.py module."""
+import os
+import tempfile
 import unittest
 from unittest.mock import patch
 
-from src.configs import get_config
+from src.configs import ConfigStore, config_store, get_config
 
 
 class TestConfigs(unittest.TestCase):
     """This class contains tests for configs.py module."""
 
+    def setUp(self):
+        """Drop the configurations parsed by previous tests."""
+        config_store.invalidate()
+
+    def tearDown(self):
+        """Drop the configurations parsed by the test."""
+        config_store.invalidate()
+
     @patch(
         "src.configs.load_yaml",
         return_value={"test1": "test1", "test2": 10, "test3": True, "test4": [1, 2, 3]},
@@ -23,3 +33,64 @@ class TestConfigs(unittest.TestCase):
         """Test get_config function with KeyError."""
         with self.assertRaises(KeyError):
             get_config("test5")
+
+    @patch(
+        "src.configs.load_yaml",
+        return_value={"section": {"value": 1, "nested": {"deep": 2}}},
+    )
+    def test_get_config_dotted_path(self, mock_load_yaml):
+        """Test get_config function with nested configuration names."""
+        self.assertEqual(get_config("section.value"), 1)
+        self.assertEqual(get_config("section.nested.deep"), 2)
+        self.assertEqual(get_config("section.nested"), {"deep": 2})
+        with self.assertRaises(KeyError):
+            get_config("section.missing")
+
+
+class TestConfigStore(unittest.TestCase):
+    """This class contains tests for the ConfigStore cache."""
+
+    def setUp(self):
+        """Create a temporary configurations file."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "configurations.yaml")
+        with open(self.path, "w", encoding="utf-8") as cfgs_file:
+            cfgs_file.write("steps:\n  delta_pixels: 10\n")
+
+    def tearDown(self):
+        """Remove the temporary configurations file."""
+        self.directory.cleanup()
+
+    def test_parsed_once(self):
+        """Test the file is parsed once for repeated lookups."""
+        store = ConfigStore(self.path)
+        for _ in range(10):
+            self.assertEqual(store.get("steps.delta_pixels"), 10)
+        cache_info = store.cache_info()
+        self.assertEqual(cache_info.loads, 1)
+        self.assertEqual(cache_info.misses, 1)
+        self.assertEqual(cache_info.hits, 9)
+
+    def test_reparsed_on_change(self):
+        """Test the file is parsed again once its size or modification time changes."""
+        store = ConfigStore(self.path)
+        self.assertEqual(store.get("steps.delta_pixels"), 10)
+        with open(self.path, "w", encoding="utf-8") as cfgs_file:
+            cfgs_file.write("steps:\n  delta_pixels: 200\n")
+        self.assertEqual(store.get("steps.delta_pixels"), 200)
+        self.assertEqual(store.cache_info().loads, 2)
+
+    def test_sections_are_copies(self):
+        """Test mutating a returned section does not change the store."""
+        store = ConfigStore(self.path)
+        store.get("steps")["delta_pixels"] = 0
+        self.assertEqual(store.get("steps"), {"delta_pixels": 10})
+        self.assertEqual(store.get("steps.delta_pixels"), 10)
+
+    def test_invalidate(self):
+        """Test invalidating the store forces a new parse."""
+        store = ConfigStore(self.path)
+        store.get("steps")
+        store.invalidate()
+        store.get("steps")
+        self.assertEqual(store.cache_info().loads, 2)
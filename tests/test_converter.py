@@ -19,9 +19,7 @@ class TestConvertPixelsToDegrees(unittest.TestCase):
         if key == "mat_dimensions.length_x"
         else None,
     )
-    @patch(
-        "src.pixels_to_degrees_ratio.image_validation", return_value=np.zeros(shape=(100, 100, 3))
-    )
+    @patch("src.pixels_to_degrees_ratio.read_image_size", return_value=(100, 100))
     def test_convert_pixels_to_degrees(self, *_):
         """Test the converter."""
         distance_list: np.array = np.array([100.0, 200.0, 300.0])
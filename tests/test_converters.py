@@ -5,7 +5,9 @@ from unittest.mock import patch
 import numpy as np
 
 from src.converters import (
+    MatGeometry,
     extract_image_dims,
+    get_mat_geometry,
     mm_to_pixel,
     mm_to_stud,
     pixel_to_mm,
@@ -56,7 +58,7 @@ class TestConverters(unittest.TestCase):
     @patch("src.converters.extract_image_dims", return_value=((810, 1461), (1143, 2020)))
     def test_pixel_to_mm(self, mock_extract_image_dims):
         """test_pixel_to_mm."""
-        self.assertEqual(np.round(pixel_to_mm(8), 4), 4.8838)
+        self.assertEqual(np.round(pixel_to_mm(8), 4), 13.1047)
 
     @patch("src.converters.extract_image_dims", return_value=((810, 1461), (1143, 2020)))
     def test_stud_to_pixel(self, mock_extract_image_dims):
@@ -66,4 +68,60 @@ class TestConverters(unittest.TestCase):
     @patch("src.converters.extract_image_dims", return_value=((810, 1461), (1143, 2020)))
     def test_pixel_to_stud(self, mock_extract_image_dims):
         """test_pixel_to_stud."""
-        self.assertEqual(pixel_to_stud(30), 2)
+        self.assertEqual(pixel_to_stud(30), 6)
+
+
+class TestMatGeometry(unittest.TestCase):
+    """Test cases for the mat geometry."""
+
+    def setUp(self):
+        """Create the geometry of a 1461x810 image of a 1143x2020 mm mat."""
+        self.geometry = MatGeometry((810, 1461), (1143, 2020))
+
+    def test_distances_match_scalar_converters(self):
+        """Test the vectorized distances match the scalar converters."""
+        with patch("src.converters.extract_image_dims", return_value=((810, 1461), (1143, 2020))):
+            distances = np.array([0, 8, 10, 30, 1000])
+            np.testing.assert_allclose(
+                self.geometry.mm_to_pixel(distances), [mm_to_pixel(d) for d in distances]
+            )
+            np.testing.assert_allclose(
+                self.geometry.pixel_to_mm(distances), [pixel_to_mm(d) for d in distances]
+            )
+            np.testing.assert_array_equal(
+                self.geometry.stud_to_pixel(distances), [stud_to_pixel(d) for d in distances]
+            )
+            np.testing.assert_array_equal(
+                self.geometry.pixel_to_stud(distances), [pixel_to_stud(d) for d in distances]
+            )
+
+    def test_pixel_distances_to_mm(self):
+        """Test the pixel distances are multiplied by the averaged mm per pixel ratio."""
+        distances = np.array([0, 8, 30])
+        np.testing.assert_allclose(
+            self.geometry.pixel_to_mm(distances), distances * (1143 / 1461 + 2020 / 810) / 2
+        )
+        np.testing.assert_allclose(self.geometry.pixel_to_mm(8), 13.1047, atol=1e-4)
+        np.testing.assert_array_equal(self.geometry.pixel_to_stud(distances), [0, 1, 6])
+
+    def test_points_round_trip(self):
+        """Test the per axis points converters."""
+        points = np.array([[[0.0, 0.0], [1461.0, 810.0]], [[730.5, 405.0], [10.0, 20.0]]])
+        points_mm = self.geometry.points_pixel_to_mm(points)
+        np.testing.assert_allclose(points_mm[0, 1], [1143, 2020])
+        np.testing.assert_allclose(self.geometry.points_mm_to_pixel(points_mm), points)
+
+    @patch(
+        "src.converters.get_config",
+        side_effect=lambda key: "src/GUIs/assets/mat-grid.png"
+        if key == "mat_image_path"
+        else 2020
+        if key == "mat_dimensions.width_y"
+        else 1143
+        if key == "mat_dimensions.length_x"
+        else None,
+    )
+    def test_geometry_is_shared(self, *_):
+        """Test the geometry is computed once per mat image and dimensions."""
+        self.assertIs(get_mat_geometry(), get_mat_geometry())
+        self.assertEqual(get_mat_geometry().image_dims, (810, 1461))
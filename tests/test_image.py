@@ -1,12 +1,16 @@
 """This module contains tests for image_reader.py module."""
 import os
+import tempfile
 import unittest
+from unittest.mock import patch
 
 import cv2 as cv
 import numpy as np
 import numpy.testing as npt
+from PIL import Image
 
 from src import image_reader
+from src.image_cache import ImageCache
 
 
 class TestImage(unittest.TestCase):
@@ -16,4 +20,69 @@ class TestImage(unittest.TestCase):
         """This function contains tests for image reading."""
         path = os.path.join("tests", "fixtures", "cargo1.jpg")
         img: np.ndarray = cv.imread(path)
-        npt.assert_array_equal(img, image_reader.image_validation(path))
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ImageCache(directory)
+            npt.assert_array_equal(img, image_reader.image_validation(path, cache))
+            self.assertEqual(len(cache.entries()), 1)
+
+
+class TestImageSize(unittest.TestCase):
+    """This class contains tests for reading the image dimensions."""
+
+    def setUp(self):
+        """Create a temporary directory for the generated images."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.image = np.zeros((37, 53, 3), dtype=np.uint8)
+
+    def tearDown(self):
+        """Remove the generated images."""
+        self.directory.cleanup()
+
+    def _assert_probed_like_decoded(self, path: str) -> None:
+        self.assertEqual(image_reader.probe_image_size(path), cv.imread(path).shape[:2])
+
+    def test_fixtures(self):
+        """Test the header dimensions of the project images."""
+        self._assert_probed_like_decoded(os.path.join("tests", "fixtures", "cargo1.jpg"))
+        self._assert_probed_like_decoded(os.path.join("src", "GUIs", "assets", "mat-grid.png"))
+
+    def test_formats(self):
+        """Test the header dimensions of PNG, JPEG and BMP images."""
+        for extension in ["png", "jpg", "bmp"]:
+            path = os.path.join(self.directory.name, f"image.{extension}")
+            cv.imwrite(path, self.image)
+            self._assert_probed_like_decoded(path)
+
+    def test_exif_orientation(self):
+        """Test a JPEG rotated by its EXIF orientation is reported as decoded."""
+        path = os.path.join(self.directory.name, "rotated.jpg")
+        exif = Image.Exif()
+        exif[0x0112] = 6
+        Image.fromarray(self.image).save(path, exif=exif)
+        self.assertEqual(image_reader.probe_image_size(path), (53, 37))
+        self._assert_probed_like_decoded(path)
+
+    def test_unknown_format_is_decoded(self):
+        """Test the image is decoded when the format is unknown."""
+        path = os.path.join(self.directory.name, "image.tiff")
+        cv.imwrite(path, self.image)
+        self.assertIsNone(image_reader.probe_image_size(path))
+        cache = ImageCache(os.path.join(self.directory.name, "cache"))
+        with patch("src.image_reader.get_image_cache", return_value=cache):
+            self.assertEqual(image_reader.read_image_size(path), (37, 53))
+
+    def test_size_is_cached(self):
+        """Test the header is only read once per file version."""
+        path = os.path.join(self.directory.name, "image.png")
+        cv.imwrite(path, self.image)
+        with patch(
+            "src.image_reader.probe_image_size", wraps=image_reader.probe_image_size
+        ) as probe:
+            image_reader.read_image_size(path)
+            image_reader.read_image_size(path)
+        self.assertEqual(probe.call_count, 1)
+
+    def test_missing_image(self):
+        """Test reading the dimensions of a missing image."""
+        with self.assertRaises(FileExistsError):
+            image_reader.read_image_size(os.path.join(self.directory.name, "missing.png"))
@@ -0,0 +1,77 @@
+"""This module contains tests for image_cache.py module."""
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import cv2 as cv
+import numpy as np
+import numpy.testing as npt
+
+from src.image_cache import ImageCache
+
+FIXTURE: str = os.path.join("tests", "fixtures", "cargo1.jpg")
+
+
+class TestImageCache(unittest.TestCase):
+    """This class contains tests for the decoded images cache."""
+
+    def setUp(self):
+        """Create a temporary cache directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ImageCache(os.path.join(self.directory.name, "cache"))
+
+    def tearDown(self):
+        """Remove the temporary cache directory."""
+        self.directory.cleanup()
+
+    def _image(self, name: str, value: int) -> str:
+        path = os.path.join(self.directory.name, name)
+        cv.imwrite(path, np.full((40, 60, 3), value, dtype=np.uint8))
+        return path
+
+    def test_load_matches_decoder(self):
+        """Test the cached image is the decoded image, memory mapped once stored."""
+        expected = cv.imread(FIXTURE)
+        first = self.cache.load(FIXTURE)
+        second = self.cache.load(FIXTURE)
+        npt.assert_array_equal(first, expected)
+        npt.assert_array_equal(second, expected)
+        self.assertIsInstance(second, np.memmap)
+        self.assertFalse(second.flags.writeable)
+        self.assertEqual((self.cache.misses, self.cache.hits), (1, 1))
+
+    def test_keyed_by_content(self):
+        """Test a copy of an image at another path is served from the cache."""
+        copy_path = os.path.join(self.directory.name, "copy.jpg")
+        shutil.copyfile(FIXTURE, copy_path)
+        self.cache.load(FIXTURE)
+        self.cache.load(copy_path)
+        self.assertEqual((self.cache.misses, self.cache.hits), (1, 1))
+        self.assertEqual(len(self.cache.entries()), 1)
+
+    def test_unreadable_image(self):
+        """Test an unreadable file is not cached."""
+        path = os.path.join(self.directory.name, "image.png")
+        with open(path, "wb") as image_file:
+            image_file.write(b"not an image")
+        self.assertIsNone(self.cache.load(path))
+        self.assertEqual(self.cache.entries(), [])
+
+    def test_least_recently_used_are_evicted(self):
+        """Test the least recently used arrays are removed above the size cap."""
+        array_size = 40 * 60 * 3 + 128
+        self.cache.max_size_bytes = 2 * array_size
+        first, second, third = (self._image(f"{i}.png", i) for i in range(3))
+        self.cache.load(first)
+        time.sleep(0.01)
+        self.cache.load(second)
+        time.sleep(0.01)
+        self.cache.load(first)
+        time.sleep(0.01)
+        self.cache.load(third)
+        self.assertEqual(len(self.cache.entries()), 2)
+        self.cache.load(first)
+        self.cache.load(third)
+        self.assertEqual((self.cache.misses, self.cache.hits), (3, 3))
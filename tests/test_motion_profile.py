@@ -0,0 +1,66 @@
+"""Unit testing for motion profile module."""
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import numpy.testing as npt
+
+from src.motion_profile import (
+    MotionLimits,
+    apply_motion_profile,
+    cruise_speeds,
+    get_motion_limits,
+    move_durations,
+)
+from src.path_creation import PATH_DTYPE
+
+LIMITS = MotionLimits(max_speed_dps=800, max_acceleration_dps2=1600)
+
+
+class TestMotionProfile(unittest.TestCase):
+    """Unit testing for motion profile module."""
+
+    def test_move_durations(self):
+        """Test the flat, trapezoidal and triangular moves durations."""
+        durations = move_durations(
+            [1000, 1000, 100, -100], [500, 800, 800, 800], [0, 1600, 1600, 0]
+        )
+        # 800 dps is reached after 200 degrees, so 1000 degrees cruise for 600 degrees
+        npt.assert_allclose(durations, [2, 0.5 + 0.75 + 0.5, 2 * np.sqrt(100 / 1600), 0.125])
+
+    def test_cruise_speeds(self):
+        """Test the short moves cruise slower and the long ones at the maximum speed."""
+        npt.assert_array_equal(
+            cruise_speeds(np.array([100, -100, 400, 5000]), LIMITS), [400, 400, 800, 800]
+        )
+
+    def test_apply_motion_profile(self):
+        """Test only the moves are ramped."""
+        path = np.zeros(4, dtype=PATH_DTYPE)
+        path["distance_degrees"] = [100, 0, 2000, 0]
+        path["angles_difference"] = [0, 90, 0, 0]
+        path["speed"] = [1000, 300, 1000, 300]
+        profiled = apply_motion_profile(path, LIMITS)
+        npt.assert_array_equal(profiled["speed"], [400, 300, 800, 300])
+        npt.assert_array_equal(profiled["acceleration"], [1600, 0, 1600, 0])
+        npt.assert_array_equal(path["acceleration"], 0)
+
+    def test_saved_speed_kept(self):
+        """Test a move saved at a low speed keeps its speed and only gets the ramps."""
+        path = np.zeros(3, dtype=PATH_DTYPE)
+        path["distance_degrees"] = [2000, 100, 0]
+        path["speed"] = [200, 200, 200]
+        profiled = apply_motion_profile(path, LIMITS)
+        npt.assert_array_equal(profiled["speed"], [200, 200, 200])
+        npt.assert_array_equal(profiled["acceleration"], [1600, 1600, 0])
+
+    def test_get_motion_limits(self):
+        """Test the limits are read from the configurations file."""
+        with patch("src.motion_profile.get_config", return_value=None):
+            self.assertIsNone(get_motion_limits())
+        with patch("src.motion_profile.get_config", side_effect=[2000, None]):
+            self.assertEqual(get_motion_limits(), MotionLimits(1000, 2000))
+
+
+if __name__ == "__main__":
+    unittest.main()
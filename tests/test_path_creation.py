@@ -4,8 +4,18 @@ from unittest.mock import patch
 
 import cv2
 import numpy as np
+import numpy.testing as npt
 
-from src.path_creation import create_path
+from benchmarks.path_creation import generated_path, measure_movement, measure_scaling
+from src.calibration import MatCalibration
+from src.path_creation import (
+    PATH_DTYPE,
+    create_path,
+    determine_robot_movement,
+    path_columns,
+    path_steps,
+)
+from src.planner_state import robot_box
 
 
 class TestPathCreation(unittest.TestCase):
@@ -50,11 +60,14 @@ class TestPathCreation(unittest.TestCase):
             "angle": [0, 0, 90, 90, 201, 201],
             "A": [0, -100, 0, 110, 0, 0],
             "D": [0, 0, 0, 0, 0, 0],
-            "action": ["None", "backward", "Rotate", "forward", "Rotate", "backward"],
+            # every move is toward the side of the first two corners
+            "action": ["None", "forward", "Rotate", "forward", "Rotate", "forward"],
             "additional_motors_mode": ["P", "P", "P", "S", "S", "S"],
             "angles_difference": [0, 90, 0, 111, 0],
             "distance_degrees": [945, 476, 779, 556, 833],
             "speed": [500, 300, 300, 500, 300, 300],
+            "acceleration": [0, 0, 0, 0, 0],
+            "arc_degrees": [0, 0, 0, 0, 0],
         }
 
         result = create_path(
@@ -66,3 +79,87 @@ class TestPathCreation(unittest.TestCase):
             robot_speed_dps,
         )
         self.assertEqual(result, expected)
+
+    @patch("src.path_creation.motors_extraction", return_value=(None, ["A", "D"]))
+    @patch(
+        "src.path_creation.get_mat_calibration",
+        return_value=MatCalibration(
+            [[0, 0], [100, 0], [100, 100], [0, 100]], [[0, 0], [200, 0], [200, 100], [0, 100]]
+        ),
+    )
+    @patch(
+        "src.pixels_to_degrees_ratio.get_config",
+        side_effect=lambda key: 100 / 3.14 if key == "robot_dimensions.wheel_diameter" else None,
+    )
+    def test_create_path_with_calibration(self, *_):
+        """Test the distances are measured on the calibrated mat plane."""
+        robot_positions = np.array(
+            [
+                [[10.0, 50.0], [20.0, 50.0], [20.0, 60.0], [10.0, 60.0]],
+                [[30.0, 50.0], [40.0, 50.0], [40.0, 60.0], [30.0, 60.0]],
+                [[30.0, 20.0], [40.0, 20.0], [40.0, 30.0], [30.0, 30.0]],
+            ]
+        )
+        result = create_path(
+            robot_positions, [0, 0, 0], [0, 0, 0], [0, 0, 0], ["S", "S", "S"], [500, 500, 500]
+        )
+        # 20 pixels are 40 mm along the x-axis and 30 pixels are 30 mm along the y-axis
+        self.assertEqual(result["distance_degrees"], [144, 108])
+
+    def test_path_steps(self):
+        """Test the structured path matches the dictionary of lists."""
+        arguments = generated_path(200)
+        path = path_steps(*arguments)
+        self.assertEqual(path.dtype, PATH_DTYPE)
+        self.assertEqual(len(path), 200)
+        npt.assert_array_equal(path["x"], arguments[0][:, 0, 0].astype(int))
+        npt.assert_allclose(
+            path["distance_pixels"][:-1],
+            [
+                np.hypot(path["x"][i + 1] - path["x"][i], path["y"][i + 1] - path["y"][i])
+                for i in range(199)
+            ],
+        )
+        self.assertEqual(path["distance_pixels"][-1], 0)
+        columns = path_columns(path, "A", "D")
+        self.assertEqual(len(columns["angles_difference"]), 199)
+        self.assertEqual(columns["angles_difference"], np.diff(arguments[1]).tolist())
+        self.assertEqual(columns["speed"], [500] * 200)
+        self.assertIsInstance(columns["x"][0], int)
+
+    def test_empty_path(self):
+        """Test a path without waypoints has no steps."""
+        path = path_steps(np.zeros((0, 4, 2)), [], [], [], [], [])
+        self.assertEqual(path_columns(path, "A", "D")["distance_degrees"], [])
+
+    def test_scaling_benchmark(self):
+        """Test the benchmark reports every path length."""
+        reports = measure_scaling([10, 100], repeat=1)
+        self.assertEqual([report.steps for report in reports], [10, 100])
+        self.assertTrue(all(report.total_ms > 0 for report in reports))
+
+    def test_movement_in_every_quadrant(self):
+        """Test moving along and against the heading at every angle."""
+        for theta in range(0, 360, 15):
+            box = robot_box((500, 500), 100, 60, theta)
+            heading = box[0] - box[3]
+            step = 20 * heading / np.linalg.norm(heading)
+            actions = determine_robot_movement(
+                [box, box + step, box, box - step * 0.1], [theta] * 4
+            )
+            self.assertEqual(actions, ["None", "forward", "backward", "backward"], theta)
+
+    def test_rotation(self):
+        """Test changing the heading is a rotation and a new angle in place is a move."""
+        boxes = [robot_box((0, 0), 100, 60, 0), robot_box((0, 0), 100, 60, 30)]
+        self.assertEqual(determine_robot_movement(boxes, [0, 30]), ["None", "Rotate"])
+        self.assertEqual(determine_robot_movement(boxes[:1], [0]), ["None"])
+        self.assertEqual(determine_robot_movement([], []), [])
+
+    def test_movement_batch(self):
+        """Test the moves of a long path are classified in one batch."""
+        boxes = np.tile(robot_box((0, 0), 100, 60, 30), (10_000, 1, 1))
+        boxes += np.arange(10_000)[:, None, None]
+        actions = determine_robot_movement(boxes, np.zeros(10_000, dtype=int))
+        self.assertEqual(actions, ["None"] + ["backward"] * 9_999)
+        self.assertGreater(measure_movement(100, repeat=1), 0)
@@ -0,0 +1,95 @@
+"""Unit testing for path optimization module."""
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import numpy.testing as npt
+
+from src.path_creation import path_steps
+from src.path_optimization import optimize_path, simplify_path
+from src.planner_state import robot_box
+
+
+def make_path(poses, motors=None, speed=100):
+    """Build a path from (x, y, angle) poses, with one degree per pixel."""
+    boxes = [robot_box(np.array([x, y]), 20, 10, angle) for x, y, angle in poses]
+    motors = motors or [0] * len(poses)
+    path = path_steps(
+        boxes,
+        [angle for _, _, angle in poses],
+        motors,
+        [0] * len(poses),
+        ["S"] * len(poses),
+        [speed] * len(poses),
+    )
+    path["distance_degrees"] = np.round(path["distance_pixels"])
+    return path
+
+
+class TestPathOptimization(unittest.TestCase):
+    """Unit testing for path optimization module."""
+
+    def test_merge_collinear_moves(self):
+        """Test the moves on one line merge into one move of their total distance."""
+        path = make_path([(100, 100, 0), (100, 80, 0), (100, 60, 0), (100, 40, 0)])
+        simplified, report = simplify_path(path)
+        npt.assert_array_equal(simplified["y"], [100, 40])
+        self.assertEqual(simplified["distance_degrees"][0], 60)
+        self.assertEqual(simplified["action"][1], "forward")
+        self.assertEqual((report.commands_before, report.commands_after), (4, 2))
+        self.assertEqual(report.removed_commands, 2)
+        # two commands overheads, the merged move takes as long as its parts
+        self.assertAlmostEqual(report.saved_s, 0.4)
+
+    def test_keep_motors_and_direction_changes(self):
+        """Test the waypoints running a motor or reversing are kept."""
+        motors = make_path(
+            [(100, 100, 0), (100, 80, 0), (100, 60, 0), (100, 40, 0)], motors=[0, 90, 0, 0]
+        )
+        npt.assert_array_equal(simplify_path(motors)[0]["y"], [100, 80, 60, 40])
+        reverse = make_path([(100, 100, 0), (100, 80, 0), (100, 90, 0), (100, 100, 0)])
+        simplified, _ = simplify_path(reverse)
+        npt.assert_array_equal(simplified["y"], [100, 80, 100])
+        npt.assert_array_equal(simplified["action"], ["None", "forward", "backward"])
+        npt.assert_array_equal(simplified["distance_degrees"], [20, 20, 0])
+
+    def test_fold_turns_and_drop_noops(self):
+        """Test the back-to-back turns fold and the turns that cancel are dropped."""
+        path = make_path(
+            [(100, 100, 0), (100, 100, 0), (100, 100, 5), (100, 100, 15), (100, 80, 15)]
+        )
+        simplified, _ = simplify_path(path)
+        npt.assert_array_equal(simplified["angle"], [0, 15, 15])
+        npt.assert_array_equal(simplified["angles_difference"], [15, 0, 0])
+        cancelled = make_path([(100, 100, 0), (100, 80, 0), (100, 80, 10), (100, 80, 0)])
+        cancelled = np.concatenate([cancelled, make_path([(100, 80, 0), (100, 60, 0)])[1:]])
+        cancelled[-2]["distance_degrees"] = 20
+        simplified, report = simplify_path(cancelled)
+        npt.assert_array_equal(simplified["y"], [100, 60])
+        self.assertEqual(simplified["distance_degrees"][0], 40)
+        self.assertEqual(report.commands_after, 2)
+
+    def test_tolerance_mm(self):
+        """Test the moves close to a line merge only within the tolerance."""
+        path = make_path([(100, 100, 0), (103, 80, 0), (100, 60, 0)])
+        self.assertEqual(len(simplify_path(path)[0]), 3)
+        points_mm = np.stack([path["x"], path["y"]], axis=1) * 2.0
+        self.assertEqual(len(simplify_path(path, 5, points_mm)[0]), 3)
+        simplified, _ = simplify_path(path, 7, points_mm)
+        npt.assert_array_equal(simplified["y"], [100, 60])
+        self.assertEqual(simplified["distance_degrees"][0], 40)
+
+    def test_single_waypoint(self):
+        """Test a path of one waypoint is kept."""
+        path = make_path([(100, 100, 0)])
+        self.assertEqual(simplify_path(path)[1].commands_after, 1)
+
+    @patch("src.path_optimization.get_config", side_effect=[False, None])
+    def test_disabled(self, _):
+        """Test the path is not simplified when it is disabled."""
+        path = make_path([(100, 100, 0), (100, 80, 0), (100, 60, 0)])
+        self.assertIs(optimize_path(path), path)
+
+
+if __name__ == "__main__":
+    unittest.main()
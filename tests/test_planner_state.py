@@ -0,0 +1,229 @@
+"""This module contains the unit tests for the planning session state."""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import numpy.testing as npt
+
+from src.collision import ObstacleMask
+from src.GUIs.main_screen import run_headless
+from src.path_creation import movement_actions
+from src.planner_state import (
+    PlannerSettings,
+    PlannerState,
+    additional_motors_names,
+    key_codes,
+    read_key_script,
+    robot_box,
+    robot_heading,
+)
+from src.spatial_index import WaypointIndex
+
+SETTINGS = PlannerSettings(
+    robot_length=10,
+    robot_width=6,
+    robot_length_x_pixels=100,
+    robot_width_y_pixels=60,
+    mat_length=2000,
+    mat_width=1000,
+    delta_theta=15,
+    delta_pixels=10,
+    additional_motors_steps=20,
+    speed_steps=50,
+    large_motors_positive_direction=True,
+    gyro_positive_direction=True,
+)
+
+
+class TestPlannerState(unittest.TestCase):
+    """This class contains the unit tests for the planning session state."""
+
+    def setUp(self):
+        """Start a session on a 500 pixels high mat."""
+        self.state = PlannerState(SETTINGS, 500, ("B", "X"))
+
+    def press(self, keys: str) -> None:
+        for key in key_codes(keys):
+            self.state.handle_key(key)
+
+    def test_robot_box(self):
+        """Test the box rotates around its center."""
+        box = robot_box((0, 0), 100, 60, 90)
+        npt.assert_allclose(box.mean(axis=0), [50, 30])
+        npt.assert_allclose(box[0], [20, 80], atol=1e-9)
+        npt.assert_allclose(robot_box((0, 0), 100, 60, 0), [[0, 0], [100, 0], [100, 60], [0, 60]])
+
+    def test_start_pose(self):
+        """Test the robot starts at the bottom left corner of the mat."""
+        npt.assert_allclose(self.state.live_box()[[0, 2]], [[0, 440], [100, 500]])
+
+    def test_session(self):
+        """Test a key sequence gives the saved waypoints."""
+        self.press("wwp,,zzrmpdddxtnnnpq")
+        boxes, angles, motor_1, motor_2, modes, speeds = self.state.result()
+        self.assertEqual(len(boxes), 3)
+        self.assertEqual(angles, [0, -30, -30])
+        self.assertEqual(motor_1, [0, 40, -20])
+        self.assertEqual(motor_2, [0, 0, 0])
+        self.assertEqual(modes, ["S", "P", "S"])
+        self.assertEqual(speeds, [500, 550, 400])
+        npt.assert_allclose(boxes[0][0], [0, 420])
+        self.assertTrue(self.state.finished)
+        self.assertEqual(self.state.waypoint_labels(1), ["-30", "B: 40", "X: 0", "P", "speed: 550"])
+
+    def test_edit_keys(self):
+        """Test selecting, replacing, inserting, deleting and undoing waypoints."""
+        self.press("pwpwp")
+        self.press("[[")
+        self.assertEqual(self.state.selected, 1)
+        self.press("dde")
+        self.assertEqual(self.state.waypoints.boxes[1][0].tolist(), [20, 420])
+        self.press("f")
+        self.assertEqual(self.state.selected, 2)
+        self.assertEqual(len(self.state.waypoints), 4)
+        self.press("b")
+        self.assertEqual(self.state.selected, 1)
+        self.press("uuu")
+        self.assertEqual(len(self.state.waypoints), 3)
+        self.assertEqual(self.state.waypoints.boxes[1][0].tolist(), [0, 430])
+        self.press("o")
+        self.assertEqual(self.state.waypoints.boxes[1][0].tolist(), [20, 420])
+        self.press("]]")
+        self.assertIsNone(self.state.selected)
+        # the index follows the edits without being rebuilt
+        with patch.object(self.state.index, "rebuild") as rebuild:
+            self.press("pdd/" + "[" * 3 + "fbbuuuo")
+        rebuild.assert_not_called()
+        rebuilt = WaypointIndex(self.state.index.cell_size)
+        rebuilt.rebuild(self.state.waypoints.boxes)
+        self.assertEqual(self.state.index.cells, rebuilt.cells)
+
+    def test_drag(self):
+        """Test dragging a waypoint moves it as one undoable edit."""
+        self.press("pwwwwwp")
+        self.assertEqual(self.state.waypoint_at(np.array([50, 480]), 10), 0)
+        self.assertEqual(self.state.waypoint_at(np.array([50, 420]), 10), 1)
+        self.assertIsNone(self.state.waypoint_at(np.array([500, 100]), 10))
+        self.state.begin_drag(1, np.array([50, 400]))
+        self.state.drag_to(np.array([300, 200]))
+        self.state.drag_to(np.array([350, 180]))
+        self.assertTrue(self.state.end_drag())
+        self.assertEqual(self.state.selected, 1)
+        self.assertEqual(self.state.waypoints.boxes[1][0].tolist(), [300, 170])
+        self.assertEqual(self.state.waypoint_at(np.array([350, 200]), 10), 1)
+        self.press("u")
+        self.assertEqual(self.state.waypoints.boxes[1][0].tolist(), [0, 390])
+        self.assertEqual(self.state.waypoint_at(np.array([50, 420]), 10), 1)
+        self.assertFalse(self.state.end_drag())
+
+    def test_route(self):
+        """Test the live robot is reached around the obstacles by forward moves and turns."""
+        mask = np.zeros((500, 1000), dtype=np.uint8)
+        mask[150:, 300:340] = 1
+        self.state.obstacles = ObstacleMask((500, 1000), mask)
+        self.press("p" + "d" * 60 + "/")
+        boxes, angles, *_ = self.state.result()
+        self.assertGreater(len(boxes), 3)
+        npt.assert_allclose(boxes[-1], self.state.live_box())
+        self.assertFalse(self.state.obstacles.sweep_hits(boxes))
+        actions = movement_actions(np.array(boxes), np.array(angles))
+        self.assertEqual(set(actions[1:]), {"forward", "Rotate"})
+        # the saved angles follow the headings, mirrored by the positive gyro
+        fronts = np.array(boxes)[:, :2].mean(axis=1) - np.array(boxes).mean(axis=1)
+        headings = np.degrees(np.arctan2(-fronts[:, 0], -fronts[:, 1]))
+        npt.assert_allclose((headings + np.array(angles) + 180) % 360 - 180, 0, atol=1e-6)
+        # the route and the live robot are undone at once
+        self.press("u")
+        self.assertEqual(len(self.state.waypoints), 1)
+        self.press("o")
+        self.assertEqual(len(self.state.waypoints), len(boxes))
+
+    def test_optimize_visit_order(self):
+        """Test the targets are visited in the fastest order and the change is undone at once."""
+        self.press("p" + "w" * 30 + "p" + "s" * 20 + "p" + "d" * 40 + "p")
+        targets = self.state.waypoints.boxes.mean(axis=1)
+        self.press(";")
+        boxes, angles, *_ = self.state.result()
+        centers = np.array(boxes).mean(axis=1)
+        visited = [
+            np.flatnonzero(np.all(np.isclose(centers, target), axis=1)) for target in targets
+        ]
+        # the far target is visited after the near one, only turns and forward moves
+        self.assertLess(visited[2].min(), visited[1].min())
+        npt.assert_allclose(boxes[-1], self.state.waypoints.boxes[-1])
+        actions = movement_actions(np.array(boxes), np.array(angles))
+        self.assertNotIn("backward", actions)
+        headings = robot_heading(np.array(boxes))
+        npt.assert_allclose((headings + np.array(angles) + 180) % 360 - 180, 0, atol=1e-6)
+        self.assertTrue(np.all(np.abs(np.diff(angles)) <= 180))
+        self.press("u")
+        npt.assert_allclose(self.state.waypoints.boxes.mean(axis=1), targets)
+
+    def test_optimize_visit_order_turns(self):
+        """Test the targets saved after full turns are reached by the shortest turns."""
+        self.press("p" + "," * 24 + "w" * 30 + "p" + "s" * 20 + "p" + "d" * 40 + "p")
+        self.assertEqual(self.state.result()[1], [0, -360, -360, -360])
+        self.press(";")
+        boxes, angles, *_ = self.state.result()
+        self.assertTrue(np.all(np.abs(np.diff(angles)) <= 180))
+        headings = robot_heading(np.array(boxes))
+        npt.assert_allclose((headings + np.array(angles) + 180) % 360 - 180, 0, atol=1e-6)
+
+    def test_unknown_key(self):
+        """Test keys outside the planning keys are not handled."""
+        self.assertFalse(self.state.handle_key(ord("0")))
+        # the view keys are left to the window
+        self.assertFalse(self.state.handle_key(ord("=")))
+        self.assertFalse(self.state.handle_key(-1))
+
+    def test_additional_motors_names(self):
+        """Test the missing MEDIUM motors are shown as X."""
+        self.assertEqual(additional_motors_names([]), ("X", "X"))
+        self.assertEqual(additional_motors_names(["A"]), ("A", "X"))
+        self.assertEqual(additional_motors_names(["A", "D"]), ("A", "D"))
+
+    def test_read_key_script(self):
+        """Test whitespace is ignored in key scripts."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "session.keys")
+            with open(path, "w") as script_file:
+                script_file.write("www p\n,, p\nq\n")
+            self.assertEqual(read_key_script(path), "wwwp,,pq")
+
+
+class TestRunHeadless(unittest.TestCase):
+    """This class contains the unit tests for the headless planning session."""
+
+    def test_render_matches_state(self):
+        """Test rendering offscreen does not change the session result."""
+        image = np.full((500, 1000, 3), 255, dtype=np.uint8)
+        keys = "wwwp,,ddp+ijkl-0zzrmp[[dde]fbuo"
+        rendered = run_headless(keys, image, SETTINGS, ("B", "X"), render=True)
+        plain = run_headless(keys, image, SETTINGS, ("B", "X"))
+        npt.assert_allclose(np.stack(rendered[0]), np.stack(plain[0]))
+        self.assertEqual(rendered[1:], plain[1:])
+        self.assertEqual(plain[1], [0, -30, -30])
+
+    def test_obstacles(self):
+        """Test the mat obstacles are read and routed around like in the main window."""
+        image = np.full((500, 1000, 3), 255, dtype=np.uint8)
+        mask = np.zeros((500, 1000), dtype=np.uint8)
+        mask[150:, 300:340] = 1
+        obstacles = ObstacleMask((500, 1000), mask)
+        with patch("src.GUIs.main_screen.get_obstacle_mask", return_value=obstacles) as get_mask:
+            boxes, *_ = run_headless("p" + "d" * 60 + "/", image, SETTINGS, ("B", "X"))
+        get_mask.assert_called_once_with((500, 1000))
+        self.assertGreater(len(boxes), 3)
+        self.assertFalse(obstacles.sweep_hits(boxes))
+
+    def test_quit(self):
+        """Test the keys after q are ignored."""
+        image = np.zeros((500, 1000, 3), dtype=np.uint8)
+        result = run_headless([ord("p"), "q", "p"], image, SETTINGS, ("B", "X"))
+        self.assertEqual(len(result[0]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""This module contains the unit tests for the route planning."""
+import unittest
+
+import cv2
+import numpy as np
+import numpy.testing as npt
+
+from benchmarks.route_planner import (
+    CELL_SIZE,
+    CLEARANCE,
+    GOAL,
+    START,
+    competition_mat,
+    measure_planning,
+)
+from src.collision import ObstacleMask
+from src.route_planner import RoutePlanner, occupancy_grid
+
+
+def route_clearance(obstacles: ObstacleMask, corners: np.ndarray) -> float:
+    """Get the smallest distance between the route and the obstacles, in pixels."""
+    distances = cv2.distanceTransform((obstacles.mask == 0).astype(np.uint8), cv2.DIST_L2, 5)
+    points = np.concatenate(
+        [np.linspace(start, end, 200) for start, end in zip(corners[:-1], corners[1:])]
+    )
+    rows, columns = np.rint(points[:, ::-1]).astype(int).T
+    return float(distances[rows, columns].min())
+
+
+class TestRoutePlanner(unittest.TestCase):
+    """This class contains the unit tests for the route planning."""
+
+    def setUp(self):
+        """Build a 1000 by 500 pixels mat with a wall that has a gap at the bottom."""
+        mask = np.zeros((500, 1000), dtype=np.uint8)
+        mask[:350, 480:520] = 1
+        self.obstacles = ObstacleMask((500, 1000), mask)
+        self.planner = RoutePlanner(self.obstacles)
+
+    def test_occupancy_grid(self):
+        """Test the obstacles are grown by the clearance and the cells around them."""
+        mask = np.zeros((100, 100), dtype=np.uint8)
+        mask[50, 50] = 1
+        blocked = occupancy_grid(mask, 10, 20)
+        self.assertEqual(blocked.shape, (10, 10))
+        self.assertTrue(blocked[5, 5] and blocked[5, 8] and blocked[2, 5])
+        self.assertFalse(blocked[5, 9] or blocked[0, 0])
+
+    def test_straight_route(self):
+        """Test a free straight line is the route."""
+        corners = self.planner.plan((100, 450), (900, 450), 50, 10)
+        npt.assert_allclose(corners, [[100, 450], [900, 450]])
+
+    def test_route_around_wall(self):
+        """Test the route goes through the gap and keeps the clearance."""
+        corners = self.planner.plan((100, 100), (900, 100), 50, 10)
+        npt.assert_allclose(corners[[0, -1]], [[100, 100], [900, 100]])
+        self.assertGreater(len(corners), 2)
+        self.assertGreater(corners[:, 1].max(), 350 + 50)
+        self.assertGreaterEqual(route_clearance(self.obstacles, corners), 50)
+        # the shortcut route is close to the shortest one around the wall end
+        length = np.hypot(*np.diff(corners, axis=0).T).sum()
+        self.assertLess(length, 1.1 * 2 * np.hypot(400, 300))
+
+    def test_unreachable(self):
+        """Test there is no route to a blocked or a walled off goal."""
+        self.assertIsNone(self.planner.plan((100, 100), (500, 100), 50, 10))
+        self.obstacles.paint((500, 420), 100)
+        self.assertIsNone(self.planner.plan((100, 100), (900, 100), 50, 10))
+
+    def test_cache(self):
+        """Test the routes are cached until the obstacles change."""
+        corners = self.planner.plan((100, 100), (900, 100), 50, 10)
+        grid = self.planner.blocked(50, 10)
+        npt.assert_allclose(self.planner.plan((101, 102), (899, 98), 50, 10)[1:-1], corners[1:-1])
+        self.assertIs(self.planner.blocked(50, 10), grid)
+        self.obstacles.paint((100, 300), 10)
+        self.assertIsNot(self.planner.blocked(50, 10), grid)
+
+    def test_competition_mat(self):
+        """Test a route winds between the walls of a competition size mat."""
+        obstacles = competition_mat()
+        corners = RoutePlanner(obstacles).plan(START, GOAL, CLEARANCE, CELL_SIZE)
+        self.assertIsNotNone(corners)
+        npt.assert_allclose(corners[[0, -1]], [START, GOAL])
+        self.assertGreaterEqual(route_clearance(obstacles, corners), CLEARANCE)
+        self.assertGreater(measure_planning(repeat=1), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
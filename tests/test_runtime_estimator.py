@@ -0,0 +1,66 @@
+"""Unit testing for runtime estimator module."""
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import numpy.testing as npt
+
+from benchmarks.runtime_estimator import measure_estimate, moves_and_turns
+from src.path_creation import PATH_DTYPE
+from src.runtime_estimator import (
+    RobotModel,
+    estimate_path_runtime,
+    get_robot_model,
+    turn_durations,
+)
+
+# turns at 10 degrees per second per degree of error and 2100 degrees per second at most
+MODEL = RobotModel(command_overhead_s=0.2, turn_kp=20, wheel_diameter_mm=60, track_width_mm=120)
+
+
+class TestRuntimeEstimator(unittest.TestCase):
+    """Unit testing for runtime estimator module."""
+
+    def test_turn_durations(self):
+        """Test the turns close the error exponentially after the saturated part."""
+        durations = turn_durations(np.array([0, 1, -10, 100]), MODEL)
+        npt.assert_allclose(
+            durations, [0, 0, np.log(10) / 10, (100 - 52.5) / 525 + np.log(52.5) / 10]
+        )
+
+    def test_estimate_path_runtime(self):
+        """Test the moves, turns, MEDIUM motors modes and overheads add up."""
+        path = np.zeros(4, dtype=PATH_DTYPE)
+        path["distance_degrees"] = [1000, 0, 500, 0]
+        path["angles_difference"] = [0, 10, 0, 0]
+        path["speed"] = 500
+        path["additional_motor_1"] = [0, 1000, 1000, 250]
+        path["additional_motor_2"] = [0, 0, -1500, 0]
+        path["additional_motors_mode"] = ["S", "S", "P", "S"]
+        estimate = estimate_path_runtime(path, MODEL)
+        npt.assert_allclose(estimate.steps_s, [2.2, 0.2 + np.log(10) / 10 + 2, 3.2, 0.7])
+        self.assertAlmostEqual(estimate.total_s, estimate.steps_s.sum())
+        self.assertEqual(estimate.slowest(2), [2, 1])
+        self.assertEqual(
+            estimate.summary(2),
+            "estimated runtime 8.5 s, slowest commands: move_3 (3.2 s), move_2 (2.4 s)",
+        )
+
+    def test_get_robot_model(self):
+        """Test the robot width is the distance between the wheels."""
+        values = {"pid_constants.kp": 5, "robot_dimensions.wheel_diameter": 62.4}
+        values["robot_dimensions.width_y"] = 15
+        with patch("src.runtime_estimator.get_config", side_effect=values.get):
+            self.assertEqual(get_robot_model(), RobotModel(0.2, 5.0, 62.4, 120.0))
+
+    def test_long_path(self):
+        """Test every command of a long path is estimated like in a short path."""
+        estimate = estimate_path_runtime(moves_and_turns(10_000), MODEL)
+        short = estimate_path_runtime(moves_and_turns(3), MODEL)
+        npt.assert_allclose(estimate.steps_s[:-2], np.tile(short.steps_s[:2], 4_999))
+        self.assertAlmostEqual(estimate.total_s, estimate.steps_s.sum())
+        self.assertGreater(measure_estimate(100, repeat=1), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""This module contains the unit tests for the session journal."""
+import os
+import tempfile
+import unittest
+
+import numpy.testing as npt
+
+from src.planner_state import PlannerState, key_codes
+from src.session_journal import HEADER_SIZE, RECORD_DTYPE, SessionJournal
+from tests.test_planner_state import SETTINGS
+
+IMAGE_SIZE = (500, 1000)
+
+
+class TestSessionJournal(unittest.TestCase):
+    """This class contains the unit tests for the session journal."""
+
+    def setUp(self):
+        """Create the journal in a temporary directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "session.journal")
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.directory.cleanup()
+
+    def play(self, keys: str, compact_every: int = 1024) -> PlannerState:
+        """Play keys while journaling them, the journal is left open like on a crash."""
+        state = PlannerState(SETTINGS, IMAGE_SIZE[0], ("B", "X"))
+        journal = SessionJournal(self.path, IMAGE_SIZE, compact_every).open()
+        for key in key_codes(keys):
+            if state.handle_key(key):
+                journal.append(key, state)
+        journal.close()
+        return state
+
+    def recovered(self, image_size=IMAGE_SIZE) -> PlannerState:
+        state = PlannerState(SETTINGS, image_size[0], ("B", "X"))
+        SessionJournal(self.path, image_size).recover(state)
+        return state
+
+    def assert_same_state(self, state: PlannerState, expected: PlannerState) -> None:
+        npt.assert_allclose(state.waypoints.boxes, expected.waypoints.boxes)
+        self.assertEqual(state.result()[1:], expected.result()[1:])
+        npt.assert_array_equal(state.robot_top_left_corner, expected.robot_top_left_corner)
+        self.assertEqual(
+            (state.theta, state.displayed_theta, state.additional_motor_1, state.speed_dps),
+            (
+                expected.theta,
+                expected.displayed_theta,
+                expected.additional_motor_1,
+                expected.speed_dps,
+            ),
+        )
+
+    def test_recover(self):
+        """Test the recovered session is the interrupted one."""
+        expected = self.play("wwwp,,zzrmpddd.xtnp..zz")
+        state = self.recovered()
+        self.assert_same_state(state, expected)
+        self.assertEqual(state.result()[4], ["S", "P", "S"])
+
+    def test_torn_record(self):
+        """Test a partly written last record is dropped and overwritten."""
+        expected = self.play("wwp")
+        self.play("d")
+        with open(self.path, "r+b") as journal_file:
+            journal_file.truncate(os.path.getsize(self.path) - 10)
+        self.assertEqual(len(SessionJournal(self.path, IMAGE_SIZE).read()), 3)
+        self.assert_same_state(self.recovered(), expected)
+        with SessionJournal(self.path, IMAGE_SIZE) as journal:
+            journal.append(ord("d"), expected)
+        self.assertEqual(os.path.getsize(self.path), HEADER_SIZE + 4 * RECORD_DTYPE.itemsize)
+
+    def test_compaction(self):
+        """Test the compacted journal holds one record per waypoint and the live robot."""
+        expected = self.play("wp" * 10 + "ddd", compact_every=8)
+        records = SessionJournal(self.path, IMAGE_SIZE).read()
+        # the second compaction keeps 8 waypoints and the live robot, then 7 keys follow
+        self.assertEqual(len(records), 16)
+        self.assert_same_state(self.recovered(), expected)
+
+    def test_edits(self):
+        """Test the edited waypoints are recovered."""
+        expected = self.play("wpwpwp[[bwe]]fu")
+        self.assertEqual(len(expected.waypoints), 2)
+        self.assert_same_state(self.recovered(), expected)
+
+    def test_other_mat(self):
+        """Test the journal of another mat size is ignored."""
+        self.play("wwp")
+        self.assertEqual(len(self.recovered((400, 800)).waypoints), 0)
+
+    def test_discard(self):
+        """Test the journal of a finished session is removed."""
+        journal = SessionJournal(self.path, IMAGE_SIZE).open()
+        journal.discard()
+        self.assertFalse(os.path.exists(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+"""This module contains the unit tests for the spatial index of the saved waypoints."""
+import unittest
+
+import numpy as np
+
+from src.planner_state import robot_box
+from src.spatial_index import WaypointIndex, point_in_boxes
+
+
+def random_boxes(count: int, seed: int = 0) -> np.ndarray:
+    generator = np.random.default_rng(seed)
+    return np.stack(
+        [
+            robot_box(generator.uniform(0, 1900, 2), 100, 60, int(generator.integers(0, 360)))
+            for _ in range(count)
+        ]
+    )
+
+
+class TestWaypointIndex(unittest.TestCase):
+    """This class contains the unit tests for the spatial index of the saved waypoints."""
+
+    def setUp(self):
+        """Index random waypoints on a 2000 pixels wide mat."""
+        self.boxes = random_boxes(300)
+        self.index = WaypointIndex(100)
+        self.index.rebuild(self.boxes)
+        self.points = np.random.default_rng(1).uniform(0, 2000, (200, 2))
+
+    def brute_hit_test(self, point):
+        inside = np.flatnonzero(point_in_boxes(point, self.boxes))
+        return int(inside.max()) if len(inside) else None
+
+    def brute_nearest(self, point, max_distance):
+        distances = np.linalg.norm(self.boxes.mean(axis=1) - point, axis=1)
+        best = int(np.argmin(distances))
+        return best if distances[best] <= max_distance else None
+
+    def test_point_in_boxes(self):
+        """Test the border is inside and both corner orders are handled."""
+        box = robot_box((0, 0), 100, 60, 0)
+        boxes = np.stack([box, box[::-1]])
+        self.assertEqual(point_in_boxes(np.array([50, 30]), boxes).tolist(), [True, True])
+        self.assertEqual(point_in_boxes(np.array([100, 60]), boxes).tolist(), [True, True])
+        self.assertEqual(point_in_boxes(np.array([101, 30]), boxes).tolist(), [False, False])
+
+    def test_hit_test(self):
+        """Test the hit test matches checking every waypoint."""
+        for point in self.points:
+            self.assertEqual(self.index.hit_test(point), self.brute_hit_test(point))
+
+    def test_nearest(self):
+        """Test the nearest waypoint matches checking every waypoint."""
+        for point in self.points:
+            for max_distance in (30, 250):
+                self.assertEqual(
+                    self.index.nearest(point, max_distance), self.brute_nearest(point, max_distance)
+                )
+
+    def test_append_and_update(self):
+        """Test the appended and moved waypoints are found at their new place."""
+        index = WaypointIndex(100)
+        for box in self.boxes:
+            index.append(box)
+        self.assertEqual(len(index), len(self.boxes))
+        self.boxes[5] = robot_box((5000, 5000), 100, 60, 0)
+        index.update(5, self.boxes[5])
+        self.assertEqual(index.hit_test(np.array([5050, 5030])), 5)
+        for point in self.points:
+            self.assertEqual(index.hit_test(point), self.brute_hit_test(point))
+
+    def test_insert_and_delete(self):
+        """Test the waypoints after an insert or a delete are renumbered."""
+        inserted = random_boxes(3, seed=2)
+        self.index.insert(10, inserted)
+        self.index.insert(0, inserted[0])
+        self.boxes = np.concatenate([inserted[:1], self.boxes[:10], inserted, self.boxes[10:]])
+        self.assertEqual(len(self.index), len(self.boxes))
+        for point in self.points:
+            self.assertEqual(self.index.hit_test(point), self.brute_hit_test(point))
+        self.index.delete(5, 20)
+        self.index.delete(0)
+        self.boxes = np.concatenate([self.boxes[1:5], self.boxes[25:]])
+        self.assertEqual(len(self.index), len(self.boxes))
+        for point in self.points:
+            self.assertEqual(self.index.hit_test(point), self.brute_hit_test(point))
+            self.assertEqual(self.index.nearest(point, 250), self.brute_nearest(point, 250))
+        # the cells hold the same waypoints as indexing them again
+        rebuilt = WaypointIndex(100)
+        rebuilt.rebuild(self.boxes)
+        self.assertEqual(self.index.cells, rebuilt.cells)
+
+    def test_empty(self):
+        """Test an empty index finds nothing."""
+        index = WaypointIndex(100)
+        self.assertIsNone(index.hit_test(np.array([10, 10])))
+        self.assertIsNone(index.nearest(np.array([10, 10]), 1000))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+"""This module contains the startup regression tests."""
+import unittest
+
+from benchmarks.startup_time import (
+    imported_packages,
+    measure_import_time,
+    parse_importtime,
+)
+
+
+class TestStartupTime(unittest.TestCase):
+    """This class contains the startup regression tests."""
+
+    def test_parse_importtime(self):
+        """Test parsing the -X importtime output."""
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        100 |   yaml.error\n"
+            "import time:       250 |        350 | yaml\n"
+        )
+        imports = parse_importtime(stderr)
+        self.assertEqual([record.module for record in imports], ["yaml.error", "yaml"])
+        self.assertEqual([record.depth for record in imports], [1, 0])
+        self.assertEqual(imports[-1].cumulative_us, 350)
+
+    def test_heavy_imports_are_deferred(self):
+        """Test importing the planner and the path creation defers scipy and pydantic."""
+        for module in ["src.GUIs.main_screen", "src.path_creation", "src.utils", "src.main"]:
+            packages = imported_packages(measure_import_time(module))
+            self.assertNotIn("scipy", packages, module)
+            self.assertNotIn("pydantic", packages, module)
+
+    def test_main_defers_opencv(self):
+        """Test importing the entry point does not import OpenCV before the window opens."""
+        packages = imported_packages(measure_import_time("src.main"))
+        self.assertNotIn("cv2", packages)
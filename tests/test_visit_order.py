@@ -0,0 +1,81 @@
+"""Unit testing for visit order module."""
+import itertools
+import unittest
+
+import numpy as np
+import numpy.testing as npt
+
+from src.runtime_estimator import DEFAULT_ROBOT_MODEL
+from src.visit_order import (
+    VisitOrder,
+    exact_order,
+    heuristic_order,
+    leg_costs,
+    order_cost,
+)
+
+
+def brute_force_cost(costs: np.ndarray) -> float:
+    """Get the time of the fastest visit order by trying every order."""
+    end = len(costs) - 1
+    return min(
+        order_cost(costs, [0, *middle, end]) for middle in itertools.permutations(range(1, end))
+    )
+
+
+def random_poses(seed: int, count: int):
+    """Create random robot centers and headings on a 2000 x 1000 pixels mat."""
+    generator = np.random.default_rng(seed)
+    centers = generator.uniform((0, 0), (2000, 1000), size=(count, 2))
+    return centers, generator.uniform(-180, 180, size=count)
+
+
+class TestVisitOrder(unittest.TestCase):
+    """Unit testing for visit order module."""
+
+    def test_leg_costs(self):
+        """Test the legs turn to face the next pose, drive to it and turn to its heading."""
+        centers = np.array([[100.0, 100.0], [100.0, 0.0], [100.0, 0.0]])
+        costs = leg_costs(centers, np.array([0.0, 0.0, 90.0]), DEFAULT_ROBOT_MODEL, 1.0, 100)
+        # straight ahead is one move of 100 degrees
+        self.assertAlmostEqual(costs[0, 1], 1 + DEFAULT_ROBOT_MODEL.command_overhead_s)
+        self.assertGreater(costs[0, 2], costs[0, 1] + DEFAULT_ROBOT_MODEL.command_overhead_s)
+        # driving backward is turning around twice
+        self.assertGreater(costs[1, 0], costs[0, 1] + 2 * DEFAULT_ROBOT_MODEL.command_overhead_s)
+        npt.assert_array_equal(np.diag(costs), 0)
+
+    def test_exact_order(self):
+        """Test the Held-Karp order is the fastest order."""
+        for seed in range(5):
+            costs = leg_costs(*random_poses(seed, 8), DEFAULT_ROBOT_MODEL, 2.0, 500)
+            order = exact_order(costs)
+            self.assertEqual((order[0], order[-1]), (0, 7))
+            self.assertEqual(sorted(order), list(range(8)))
+            self.assertAlmostEqual(order_cost(costs, order), brute_force_cost(costs))
+
+    def test_heuristic_order(self):
+        """Test the local search order is close to the fastest order."""
+        for seed in range(5):
+            costs = leg_costs(*random_poses(seed, 9), DEFAULT_ROBOT_MODEL, 2.0, 500)
+            order = heuristic_order(costs)
+            self.assertEqual((order[0], order[-1]), (0, 8))
+            self.assertEqual(sorted(order), list(range(9)))
+            self.assertLessEqual(order_cost(costs, order), 1.1 * brute_force_cost(costs))
+
+    def test_few_targets(self):
+        """Test the order of one target or none is kept."""
+        self.assertEqual(exact_order(np.zeros((3, 3))), [0, 1, 2])
+        self.assertEqual(heuristic_order(np.zeros((2, 2))), [0, 1])
+
+    def test_cached_costs(self):
+        """Test the costs of the same poses are computed once."""
+        visits = VisitOrder(DEFAULT_ROBOT_MODEL, 2.0, 500)
+        centers, headings = random_poses(0, 6)
+        self.assertIs(visits.costs(centers, headings), visits.costs(centers.copy(), headings))
+        self.assertEqual(
+            visits.order(centers, headings), exact_order(visits.costs(centers, headings))
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
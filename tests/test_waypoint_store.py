@@ -0,0 +1,94 @@
+"""This module contains the unit tests for the waypoints storage."""
+import unittest
+
+import numpy as np
+import numpy.testing as npt
+
+from src.waypoint_store import DELETE, INSERT, WaypointStore, waypoint
+
+
+def numbered(number: int) -> np.ndarray:
+    """Create a waypoint identified by its speed."""
+    return waypoint(np.full((4, 2), number), number, 0, 0, "S", number)
+
+
+class TestWaypointStore(unittest.TestCase):
+    """This class contains the unit tests for the waypoints storage."""
+
+    def setUp(self):
+        """Create a store of 5 waypoints that has grown past its capacity."""
+        self.store = WaypointStore(capacity=2)
+        for number in range(5):
+            self.store.append(numbered(number))
+
+    def speeds(self) -> list:
+        return self.store.records["speed_dps"].tolist()
+
+    def test_append(self):
+        """Test the store grows geometrically."""
+        self.assertEqual(self.speeds(), [0, 1, 2, 3, 4])
+        self.assertEqual(len(self.store._data), 8)
+        npt.assert_array_equal(self.store.boxes[4], np.full((4, 2), 4))
+
+    def test_edits(self):
+        """Test inserting, deleting and modifying in the middle of the path."""
+        self.store.insert(2, numbered(10))
+        self.assertEqual(self.speeds(), [0, 1, 10, 2, 3, 4])
+        deleted = self.store.delete(0)
+        self.assertEqual(int(deleted["speed_dps"]), 0)
+        self.store.modify(-1, numbered(20))
+        self.assertEqual(self.speeds(), [1, 10, 2, 3, 20])
+        with self.assertRaises(IndexError):
+            self.store.delete(5)
+
+    def test_undo_redo(self):
+        """Test undoing and redoing every kind of edit."""
+        states = [self.speeds()]
+        self.store.insert(1, numbered(10))
+        states.append(self.speeds())
+        self.store.modify(3, numbered(20))
+        states.append(self.speeds())
+        self.store.delete(0)
+        states.append(self.speeds())
+        self.store.replace(np.array([numbered(number) for number in range(8, 0, -1)]))
+        states.append(self.speeds())
+        for expected in reversed(states[:-1]):
+            self.store.undo()
+            self.assertEqual(self.speeds(), expected)
+        for expected in states[1:]:
+            self.store.redo()
+            self.assertEqual(self.speeds(), expected)
+        self.assertIsNone(self.store.redo())
+
+    def test_insert_many(self):
+        """Test consecutive waypoints are saved and undone as one edit."""
+        self.store.insert_many(2, np.array([numbered(10), numbered(11)]))
+        self.assertEqual(self.speeds(), [0, 1, 10, 11, 2, 3, 4])
+        self.assertEqual(self.store.undo(), 2)
+        self.assertEqual(self.speeds(), [0, 1, 2, 3, 4])
+        self.assertEqual(self.store.last_change, (DELETE, 2, 2))
+        self.store.redo()
+        self.assertEqual(self.speeds(), [0, 1, 10, 11, 2, 3, 4])
+        self.assertEqual(self.store.last_change, (INSERT, 2, 2))
+        self.store.insert_many(len(self.store), np.array([numbered(n) for n in range(20, 25)]))
+        self.assertEqual(self.speeds()[-6:], [4, 20, 21, 22, 23, 24])
+
+    def test_new_edit_clears_redo(self):
+        """Test an edit after an undo drops the reverted edits."""
+        self.store.delete(1)
+        self.store.undo()
+        self.store.append(numbered(7))
+        self.assertIsNone(self.store.redo())
+        self.assertEqual(self.speeds(), [0, 1, 2, 3, 4, 7])
+
+    def test_columns(self):
+        """Test the columns are the lists given to create_path."""
+        boxes, angles, motor_1, motor_2, modes, speeds = self.store.columns()
+        self.assertEqual(len(boxes), 5)
+        self.assertEqual(angles, [0, 1, 2, 3, 4])
+        self.assertEqual(modes, ["S"] * 5)
+        self.assertIsInstance(angles[0], int)
+
+
+if __name__ == "__main__":
+    unittest.main()